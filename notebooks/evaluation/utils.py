@@ -9,6 +9,7 @@ import plotly.graph_objects as go
 import joblib
 from plotly.subplots import make_subplots
 
+from src.data.slots import format_slots
 from src.features.build_features import FEATURE_MATRIX_COLUMNS
 from src.training.utils import *
 
@@ -29,7 +30,7 @@ def load_predict_model(path, data):
     test_df = pd.DataFrame(
         {
             "date": data.X_test.date,
-            "time": data.X_test.half_hour_time,
+            "time": format_slots(data.X_test.half_hour_slot),
             "attraction": data.X_test.attraction,
             "y_true": data.y_test.to_numpy().flatten(),
             "y_pred": y_pred_test.flatten(),
@@ -39,7 +40,7 @@ def load_predict_model(path, data):
     train_df = pd.DataFrame(
         {
             "date": data.X_train.date,
-            "time": data.X_train.half_hour_time,
+            "time": format_slots(data.X_train.half_hour_slot),
             "attraction": data.X_train.attraction,
             "y_true": data.y_train.to_numpy().flatten(),
             "y_pred": y_pred_train.flatten(),
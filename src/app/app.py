@@ -14,6 +14,7 @@ import plotly.express as px
 
 from src.models.model_estimator import ModelEstimator, BEST_MODEL_PATH
 from src.data.constants import WARTEZEITEN_APP_ATTRACTIONS
+from src.data.slots import format_slots
 from src.models.weather_bins import Bin
 
 st.set_page_config(
@@ -50,8 +51,13 @@ with col2:
 
 by_time_df, summary_df = model.predict(date, attraction)
 
-by_time_df.index = pd.to_datetime(by_time_df.index)
-summary_df.best_time = pd.to_datetime(summary_df.best_time).dt.strftime("%H:%M")
+# the models work on half-hour slots, the times are only formatted for display
+by_time_df.index = pd.DatetimeIndex(
+    pd.to_datetime(format_slots(by_time_df.index)), name="half_hour_time"
+)
+summary_df.best_time = summary_df.best_time.map(
+    lambda slot: slot if pd.isna(slot) else format_slots(int(slot), seconds=False)
+)
 
 st.markdown(
     """
@@ -0,0 +1,164 @@
+"""
+Project: Phantasialand
+State: 10/2026
+
+Benchmark the sequential and the asynchronous waiting time download against a local stub
+of the wartezeiten.app API.
+
+The stub answers every query with DATAPOINTS fake datapoints after waiting LATENCY
+seconds, which simulates the round trip to the real server. For each concurrency level
+the whole attraction x month x year product is downloaded and the throughput in
+documents per second is reported.
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Tuple, List
+from urllib.parse import urlparse, parse_qs
+import asyncio
+import json
+import logging
+import threading
+import time
+
+import click
+
+from src.data.constants import LOGGING_FORMAT_STR
+from src.data.download_waiting_times import (
+    download_all_waiting_times,
+    download_all_waiting_times_async,
+)
+
+
+class StubWartezeitenHandler(BaseHTTPRequestHandler):
+    """request handler imitating `linechart.php` of wartezeiten.app.
+
+    The behaviour is configured via attributes of the server: `latency` (seconds to
+    wait before answering), `datapoints` (number of datapoints per document) and
+    `failures` (number of times each distinct query fails with status 503 before it
+    succeeds).
+    """
+
+    # HTTP/1.1 is needed for keep-alive connections. Without disabling Nagle's algorithm
+    # every response on a reused connection is delayed by the client's delayed ACK.
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        params = parse_qs(urlparse(self.path).query)
+        key = (params["code"][0], params["monat"][0], params["jahr"][0])
+
+        time.sleep(self.server.latency)
+
+        with self.server.lock:
+            self.server.request_count += 1
+            failed = self.server.failed.get(key, 0)
+            if failed < self.server.failures:
+                self.server.failed[key] = failed + 1
+
+        if failed < self.server.failures:
+            self._send(503, b"")
+            return
+
+        body = json.dumps(
+            [
+                {
+                    "datum": f"2021-08-01 {9 + i // 12:02d}:{i % 12 * 5:02d}:12",
+                    "wartezeit": str(i % 40),
+                    "status": "opened",
+                }
+                for i in range(self.server.datapoints)
+            ]
+        ).encode()
+
+        self._send(200, body)
+
+    def _send(self, status: int, body: bytes):
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_stub(
+    latency: float = 0.0, datapoints: int = 100, failures: int = 0
+) -> Tuple[ThreadingHTTPServer, str]:
+    """start a stub wartezeiten.app server in a background thread.
+
+    Args:
+        latency (float): seconds to wait before answering each request. Defaults to 0.
+        datapoints (int): datapoints per document. Defaults to 100.
+        failures (int): how often each query fails with 503 first. Defaults to 0.
+
+    Returns:
+        ThreadingHTTPServer: the running server, call `shutdown()` when done
+        str: url to pass to the download functions
+    """
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubWartezeitenHandler)
+    server.daemon_threads = True
+    server.latency = latency
+    server.datapoints = datapoints
+    server.failures = failures
+    server.failed = {}
+    server.request_count = 0
+    server.lock = threading.Lock()
+
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    return server, f"http://127.0.0.1:{server.server_address[1]}/linechart.php"
+
+
+@click.command(help=__doc__)
+@click.option(
+    "-l", "--latency", default=0.02, type=float, help="simulated latency in seconds"
+)
+@click.option(
+    "-d", "--datapoints", default=150, type=int, help="datapoints per document"
+)
+@click.option(
+    "-c",
+    "--concurrency",
+    "concurrency_levels",
+    default="1,4,16,64",
+    help="comma separated concurrency levels for the asynchronous download",
+)
+@click.option(
+    "--skip-sequential", is_flag=True, help="do not benchmark the sequential download"
+)
+def main(
+    latency: float, datapoints: int, concurrency_levels: str, skip_sequential: bool
+):
+    logging.basicConfig(format=LOGGING_FORMAT_STR, level=logging.INFO)
+
+    server, url = serve_stub(latency, datapoints)
+
+    results: List[Tuple[str, int, float]] = []
+
+    try:
+        if not skip_sequential:
+            start = time.perf_counter()
+            documents = download_all_waiting_times(url)
+            results.append(("sequential", len(documents), time.perf_counter() - start))
+
+        for concurrency in map(int, concurrency_levels.split(",")):
+            start = time.perf_counter()
+            documents = asyncio.run(download_all_waiting_times_async(concurrency, url))
+            results.append(
+                (f"async, {concurrency=}", len(documents), time.perf_counter() - start)
+            )
+    finally:
+        server.shutdown()
+
+    print(f"\nstub latency: {latency * 1000:.0f} ms, {datapoints} datapoints/document")
+    print(f"{'mode':<25}{'documents':>10}{'seconds':>10}{'docs/s':>10}")
+    for mode, n_documents, seconds in results:
+        throughput = n_documents / seconds
+        print(f"{mode:<25}{n_documents:>10}{seconds:>10.2f}{throughput:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Project: Phantasialand
+State: 10/2026
+
+Benchmark every stage of the pipeline, from the raw data up to `train_lightgbm.py` and
+`test_e2e.py`, on synthetic data of several scales (see
+`src/data/generate_synthetic_data.py`).
+
+Scale 1 is the volume of the original data: three years of all attractions with a
+datapoint every five minutes. Up to scale 10, the number of years grows with the scale,
+beyond that the datapoints get denser (e.g. scale 100 is 30 years with a datapoint every
+30 seconds), so the raw data grows linearly with the scale.
+
+The data of each scale is generated in WORK_DIR/scale_<SCALE> and each stage runs as its
+own process with the environment variable PHANTASIALAND_DATA_PATH pointing there, so
+the original data is not touched. The models are tracked in an MLflow database in the
+same directory. The runtime of each stage (including the start of the process) and the
+size of the raw data are reported for each scale.
+"""
+
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import logging
+import os
+import subprocess
+import sys
+import time
+
+import click
+
+from src.data.constants import LOGGING_FORMAT_STR
+from src.data.generate_synthetic_data import generate_raw_data
+from src.data.pipeline import NODES, ROOT_PATH, sort_nodes
+
+# scripts run after the data pipeline, relative to ROOT_PATH. "{scale_dir}" is replaced
+# by the directory of the scale.
+TRAINING_STAGES = {
+    "train_lightgbm": ["src/training/train_lightgbm.py"],
+    "test_e2e": ["src/evaluation/test_e2e.py", "{scale_dir}/mean_estimator_e2e.csv"],
+}
+
+
+def scale_parameters(scale: float) -> Tuple[int, int]:
+    """number of years and seconds between two datapoints of an attraction for a
+    scale, see this module's docstring.
+
+    Args:
+        scale (float): volume of the raw data relative to the original data
+
+    Returns:
+        int: number of years
+        int: seconds between two datapoints
+    """
+
+    n_years = max(1, round(3 * min(scale, 10)))
+    interval = max(1, round(300 * n_years / 3 / scale))
+
+    return n_years, interval
+
+
+def run_stages(scale_dir: Path, training: bool = True) -> Dict[str, Optional[float]]:
+    """run the pipeline nodes (and the training stages) on the data in `scale_dir`.
+
+    The stages after a failed stage (e.g. killed for lack of memory) are skipped, as
+    they need its outputs.
+
+    Args:
+        scale_dir (Path): data directory with the raw data
+        training (bool): also run TRAINING_STAGES. Defaults to True.
+
+    Returns:
+        Dict[str, Optional[float]]: runtime in seconds of each stage that was run, None
+            if it failed
+    """
+
+    env = dict(
+        os.environ,
+        PHANTASIALAND_DATA_PATH=str(scale_dir),
+        MLFLOW_TRACKING_URI=f"sqlite:///{scale_dir / 'mlflow.db'}",
+    )
+
+    commands = {
+        node.name: ["src/data/pipeline.py", node.name] for node in sort_nodes(NODES)
+    }
+    if training:
+        for name, args in TRAINING_STAGES.items():
+            commands[name] = [arg.format(scale_dir=scale_dir) for arg in args]
+
+    timings = {}
+    for name, args in commands.items():
+        logging.info(f"Running {name}")
+        start = time.perf_counter()
+        try:
+            subprocess.run([sys.executable, *args], cwd=ROOT_PATH, env=env, check=True)
+        except subprocess.CalledProcessError as e:
+            logging.error(f"{name} failed: {e}")
+            timings[name] = None
+            break
+        timings[name] = time.perf_counter() - start
+
+    return timings
+
+
+def _format_seconds(timings: Dict[str, Optional[float]], stage: str) -> str:
+    if stage not in timings:
+        return f"{'skipped':>12}"
+    if timings[stage] is None:
+        return f"{'failed':>12}"
+    return f"{timings[stage]:>11.1f}s"
+
+
+@click.command(help=__doc__)
+@click.argument("work_dir", type=click.Path(file_okay=False))
+@click.option(
+    "-s",
+    "--scales",
+    default="1,10,100",
+    help="comma separated scales of the data relative to the original data",
+)
+@click.option(
+    "--data-only",
+    is_flag=True,
+    help="only run the data pipeline, not the training and E2E evaluation",
+)
+@click.option("--seed", default=42, type=int, help="seed of the synthetic data")
+def main(work_dir: str, scales: str, data_only: bool, seed: int):
+    logging.basicConfig(format=LOGGING_FORMAT_STR, level=logging.INFO)
+
+    results: List[Tuple[str, Dict[str, Optional[float]], float]] = []
+
+    for scale in scales.split(","):
+        n_years, interval = scale_parameters(float(scale))
+        scale_dir = (Path(work_dir) / f"scale_{scale}").resolve()
+        logging.info(f"Scale {scale}: {n_years} years, datapoints every {interval}s")
+
+        start = time.perf_counter()
+        paths = generate_raw_data(
+            scale_dir, n_years=n_years, interval=interval, seed=seed
+        )
+        timings = {"generate": time.perf_counter() - start}
+
+        timings.update(run_stages(scale_dir, training=not data_only))
+
+        raw_size = paths["waiting_times"].stat().st_size / 2**20
+        results.append((f"{scale}x", timings, raw_size))
+
+    print(f"\n{'stage':<18}" + "".join(f"{label:>12}" for label, _, _ in results))
+    print(
+        f"{'raw data (MB)':<18}" + "".join(f"{size:>12.0f}" for _, _, size in results)
+    )
+    stages = ["generate", *(node.name for node in sort_nodes(NODES))]
+    if not data_only:
+        stages += TRAINING_STAGES
+    for stage in stages:
+        print(
+            f"{stage:<18}"
+            + "".join(_format_seconds(timings, stage) for _, timings, _ in results)
+        )
+
+
+if __name__ == "__main__":
+    main()
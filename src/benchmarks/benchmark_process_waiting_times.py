@@ -0,0 +1,153 @@
+"""
+Project: Phantasialand
+State: 10/2026
+
+Benchmark the vectorized waiting time processing against the original row-wise
+implementation (`round_time`/`round_half_hour` applied per row) on a raw waiting time
+csv file as written by `download_waiting_times.py`.
+
+Both implementations are run on the same data, their outputs are compared and the
+runtime of each step is reported. Afterwards, the scaling of `process_in_parallel` with
+the number of worker processes is reported for both ways of sharding.
+"""
+
+import logging
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import click
+
+from src.data.constants import LOGGING_FORMAT_STR
+from src.data.process_waiting_times import (
+    round_time,
+    round_half_hour,
+    parse_waiting_times,
+    exploration_from_parsed,
+    training_from_parsed,
+    process_in_parallel,
+)
+from src.data.slots import slots_from_times
+
+
+def legacy_transform_dataframe_exploration(df: pd.DataFrame) -> pd.DataFrame:
+    """row-wise implementation of `transform_dataframe_exploration` as it was before
+    vectorization, kept as reference.
+    """
+
+    df = df.copy()
+    df[["date", "time"]] = df.datum.str.split(" ", expand=True)
+    df["rounded_time"] = df.time.apply(round_time)
+
+    df.rename(columns={"datum": "timestamp", "wartezeit": "waiting_time"}, inplace=True)
+    df.drop(columns=["month", "year", "timestamp", "status"], inplace=True)
+
+    return df
+
+
+def legacy_transform_dataframe_training(waiting_time_df: pd.DataFrame) -> pd.DataFrame:
+    """row-wise implementation of `transform_dataframe_training` as it was before
+    vectorization, kept as reference.
+    """
+
+    waiting_time_df = waiting_time_df[
+        ~waiting_time_df.time.str.startswith("00:")
+    ].copy()
+    waiting_time_df.waiting_time = waiting_time_df.waiting_time.map(
+        lambda x: x if x >= 0 else np.nan
+    )
+
+    waiting_time_df["half_hour_time"] = waiting_time_df.time.apply(round_half_hour)
+    waiting_time_half_hour_df = waiting_time_df.groupby(
+        by=["attraction", "date", "half_hour_time"]
+    )[["waiting_time"]].agg("mean")
+    waiting_time_half_hour_df.reset_index(inplace=True)
+    waiting_time_half_hour_df.index.name = "id"
+
+    waiting_time_half_hour_df.dropna(
+        axis="index", how="any", subset=["waiting_time"], inplace=True
+    )
+
+    # the training data stores the half hours as slots instead of strings
+    waiting_time_half_hour_df.insert(
+        2,
+        "half_hour_slot",
+        slots_from_times(waiting_time_half_hour_df.pop("half_hour_time")),
+    )
+
+    return waiting_time_half_hour_df
+
+
+def _timed(label: str, timings: dict, func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    timings[label] = time.perf_counter() - start
+    logging.info(f"{label}: {timings[label]:.2f}s")
+    return result
+
+
+@click.command(help=__doc__)
+@click.argument("input_path", type=click.Path(exists=True))
+@click.option(
+    "-w",
+    "--workers",
+    "worker_counts",
+    default="1,2,4",
+    help="comma separated worker counts for the parallel processing",
+)
+def main(input_path: str, worker_counts: str):
+    logging.basicConfig(format=LOGGING_FORMAT_STR, level=logging.INFO)
+
+    df = pd.read_csv(input_path, index_col="id")
+    logging.info(f"{len(df)} datapoints")
+
+    legacy, vectorized = {}, {}
+
+    legacy_exploration_df = _timed(
+        "exploration", legacy, legacy_transform_dataframe_exploration, df
+    )
+    legacy_training_df = _timed(
+        "training", legacy, legacy_transform_dataframe_training, legacy_exploration_df
+    )
+
+    parsed_df = _timed("parse", vectorized, parse_waiting_times, df)
+    exploration_df = _timed(
+        "exploration", vectorized, exploration_from_parsed, parsed_df
+    )
+    training_df = _timed("training", vectorized, training_from_parsed, parsed_df)
+
+    pd.testing.assert_frame_equal(legacy_exploration_df, exploration_df)
+    pd.testing.assert_frame_equal(legacy_training_df, training_df)
+    logging.info("outputs are identical")
+
+    legacy_total = sum(legacy.values())
+    vectorized_total = sum(vectorized.values())
+
+    print(f"\n{len(df)} datapoints")
+    print(f"{'step':<15}{'row-wise':>10}{'vectorized':>12}")
+    print(f"{'parse':<15}{'-':>10}{vectorized['parse']:>11.2f}s")
+    for step in ["exploration", "training"]:
+        print(f"{step:<15}{legacy[step]:>9.2f}s{vectorized[step]:>11.2f}s")
+    print(f"{'total':<15}{legacy_total:>9.2f}s{vectorized_total:>11.2f}s")
+    print(f"speedup: {legacy_total / vectorized_total:.1f}x")
+
+    scaling = []
+    for shard_by in ["attraction", "attraction-year"]:
+        for workers in map(int, worker_counts.split(",")):
+            start = time.perf_counter()
+            parallel_dfs = process_in_parallel(df, workers, shard_by)
+            scaling.append((shard_by, workers, time.perf_counter() - start))
+
+            pd.testing.assert_frame_equal(exploration_df, parallel_dfs[0])
+            pd.testing.assert_frame_equal(training_df, parallel_dfs[1])
+
+    print(f"\nparallel processing, {os.cpu_count()} cores")
+    print(f"{'shard by':<18}{'workers':>8}{'seconds':>10}{'vs serial':>11}")
+    for shard_by, workers, seconds in scaling:
+        speedup = vectorized_total / seconds
+        print(f"{shard_by:<18}{workers:>8}{seconds:>10.2f}{speedup:>10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
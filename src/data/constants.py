@@ -5,12 +5,22 @@ State: 10/2021
 Various constants that are needed by data scripts.
 """
 
+import os
 from pathlib import Path
 
-DATA_PATH = (Path(__file__).parent.parent.parent / "data").resolve()
+# the data directory can be moved with the environment variable PHANTASIALAND_DATA_PATH,
+# e.g. to process synthetic data (see `generate_synthetic_data.py`)
+DATA_PATH = Path(
+    os.environ.get(
+        "PHANTASIALAND_DATA_PATH", Path(__file__).parent.parent.parent / "data"
+    )
+).resolve()
 
 LOGGING_FORMAT_STR = "[%(asctime)s] %(message)s"
 
+# libraries that can run the data transformations, see `polars_backend.py`
+BACKENDS = ["pandas", "polars"]
+
 # mapping names of Phantasialand attractions to the internal ids used by wartezeiten.app
 WARTEZEITEN_APP_ATTRACTIONS = {
     "Taron": "636a733d",
@@ -88,6 +98,34 @@ STATE_FULL2ISO = {
     "Thüringen": "TH",
 }
 
+# daily climate data of the Deutscher Wetterdienst, current and historical
+DWD_RECENT_URL = (
+    "https://opendata.dwd.de/climate_environment/CDC/observations_germany/climate/"
+    "daily/kl/recent/"
+)
+DWD_HISTORICAL_URL = (
+    "https://opendata.dwd.de/climate_environment/CDC/observations_germany/climate/"
+    "daily/kl/historical/"
+)
+
+# directory of the downloaded DWD archives
+DWD_ARCHIVE_PATH = DATA_PATH / "raw/dwd_weather"
+
+# mapping ids of the DWD weather stations we use to their names
+DWD_STATIONS = {
+    "01327": "Lommersum",
+    "02667": "Koeln-Bonn",
+}
+
+# wide table with the prepared weather data of all weather stations, indexed by date
+WEATHER_TABLE_PATH = DATA_PATH / "interim/weather.csv"
+
+# file name of the train test split manifest next to the processed datapoints
+SPLIT_MANIFEST = "split_manifest.json"
+
+# weather data before this date is not needed
+DWD_MIN_DATE = "2019-01-01"
+
 # mapping the original column names of the Deutscher Wetterdienst to more descriptive
 # names
 DWD_COLUMN_NAMES2DESCRIPTION = {
@@ -4,37 +4,58 @@ State: 11/2021
 
 Take the processed waiting time and weather data and produce a train test split
 
-This script joins the waiting time data with the weather data of both weather stations. 
-The resulting datapoints are splitted into test and train set while ensuring that all 
-datapoints from one day are part of the same set.
+This script joins the waiting time data with the weather data of all weather stations. 
+Only the weather columns used by the featurization (see `src/features/columns.py`) are
+kept, unless `--all-weather-columns` is given. The resulting datapoints are splitted
+into test and train set while ensuring that all datapoints from one day are part of the
+same set.
 
 This script reads the waiting time and weather data from 
-"data/interim/waiting_times_training.csv", 
-"data/interim/weather_station01327_Lommersum.csv" and 
-"data/interim/weather_station02667_Koeln-Bonn.csv" and writes the processed data to 
-"data/processed/X_train.csv", "X_test.csv", "y_train.csv", "y_test.csv".
+"data/interim/waiting_times_training.csv" and "data/interim/weather.csv" (see
+`process_weather_stations.py`) and writes the processed data to 
+"data/processed/all_datapoints.csv", with all train rows followed by all test rows. The
+split itself is stored in "data/processed/split_manifest.json": the dates and the row
+ranges of both sets, from which `src.training.utils.load_data` takes the train and test
+data without copying it. With `--split-files`, the sets are also written to
+"X_train.csv", "X_test.csv", "y_train.csv" and "y_test.csv". The inputs are also read
+as parquet files if they exist in that format, and with `--format parquet` the outputs
+are written as typed parquet files (see `src/data/storage.py`). With `--backend polars`,
+the join runs on Polars (see `src/data/polars_backend.py`).
 """
 
-from typing import Dict
+from typing import Dict, Tuple
+import json
 
+import numpy as np
 import pandas as pd
 from sklearn.model_selection import train_test_split
 import click
 
-from src.data.constants import DATA_PATH
+from src.data.constants import BACKENDS, DATA_PATH, SPLIT_MANIFEST
+from src.data.process_weather_stations import load_weather_table
+from src.data.storage import FORMATS, find_dataset, read_dataset, write_dataset
+from src.features.columns import SELECTED_WEATHER_COLUMNS
 
 
-def prepare_weather(weather_df: pd.DataFrame, prefix: str) -> pd.DataFrame:
-    """remove columns where all values are NaN and add a prefix to each column name
+def split_dates(df: pd.DataFrame, test_size: float) -> Tuple[np.ndarray, np.ndarray]:
+    """randomly assign the days of the waiting time data to train or test set.
 
     Args:
-        weather_df (pd.DataFrame): DataFrame to modify
-        prefix (str): prefix string
+        df (pd.DataFrame): DataFrame with waiting time information
+        test_size (float): test set proportion
 
     Returns:
-        pd.DataFrame: modified DataFrame
+        Tuple[np.ndarray, np.ndarray]: dates of the train and the test set
     """
-    return weather_df.dropna(axis="columns", how="all").add_prefix(prefix)
+
+    date_train, date_test = train_test_split(
+        df.date.unique(),
+        test_size=test_size,
+        random_state=42,
+        shuffle=True,
+    )
+
+    return date_train, date_test
 
 
 def train_test_split_date_based(
@@ -52,15 +73,11 @@ def train_test_split_date_based(
         'y_test' to the respective DataFrames.
     """
 
-    date_train, date_test = train_test_split(
-        df.date.unique(),
-        test_size=test_size,
-        random_state=42,
-        shuffle=True,
-    )
+    date_train, _ = split_dates(df, test_size)
 
-    train_df = df.query("date in @date_train")
-    test_df = df.query("date in @date_test")
+    is_train = df.date.isin(date_train).to_numpy()
+    train_df = df[is_train]
+    test_df = df[~is_train]
 
     output_dfs = {
         "X_train": train_df.drop(columns=["waiting_time"]),
@@ -72,49 +89,119 @@ def train_test_split_date_based(
     return output_dfs
 
 
+def order_by_split(
+    df: pd.DataFrame, test_size: float, datapoints_file: str
+) -> Tuple[pd.DataFrame, Dict]:
+    """split the datapoints by date like `train_test_split_date_based`, but return a
+    single DataFrame with all train rows followed by all test rows and a manifest
+    describing the split.
+
+    The manifest contains the name of the datapoints file, the feature and target
+    columns, the dates of both sets and the row ranges `[start, stop)` of the train and
+    test rows in the datapoints file. See `src.training.utils.load_data`.
+
+    Args:
+        df (pd.DataFrame): DataFrame with waiting time information
+        test_size (float): test set proportion
+        datapoints_file (str): file name of the datapoints, relative to the manifest
+
+    Returns:
+        Tuple[pd.DataFrame, Dict]: ordered datapoints and split manifest
+    """
+
+    date_train, date_test = split_dates(df, test_size)
+
+    is_train = df.date.isin(date_train).to_numpy()
+    # stable, so the rows within each set keep their order
+    ordered_df = df.take(np.argsort(~is_train, kind="stable"))
+    n_train = int(is_train.sum())
+
+    manifest = {
+        "datapoints": datapoints_file,
+        "columns": [column for column in df.columns if column != "waiting_time"],
+        "target": "waiting_time",
+        "test_size": test_size,
+        "train": [0, n_train],
+        "test": [n_train, len(df)],
+        "train_dates": sorted(pd.DatetimeIndex(date_train).strftime("%Y-%m-%d")),
+        "test_dates": sorted(pd.DatetimeIndex(date_test).strftime("%Y-%m-%d")),
+    }
+
+    return ordered_df, manifest
+
+
 @click.command(help=__doc__)
 @click.argument("output_dir", type=click.Path())
-def main(output_dir):
+@click.option(
+    "--format",
+    "fmt",
+    default="csv",
+    type=click.Choice(FORMATS),
+    help="storage format of the output files",
+)
+@click.option(
+    "--split-files",
+    is_flag=True,
+    help="also write the train and test set to X_train, X_test, y_train and y_test",
+)
+@click.option(
+    "--all-weather-columns",
+    is_flag=True,
+    help="keep all columns of the weather table instead of only those used by the "
+    "featurization (see --all-columns of process_weather_stations.py)",
+)
+@click.option(
+    "--backend",
+    default="pandas",
+    type=click.Choice(BACKENDS),
+    help="library that joins the waiting time and weather data",
+)
+def main(output_dir, fmt, split_files, all_weather_columns, backend):
     """read and process waiting time and weather data. Afterwards, join the data,
-    perform a train test split and save it as CSV files.
+    perform a train test split and save the datapoints and the split manifest.
     """
 
-    waiting_time_df = pd.read_csv(
-        DATA_PATH / "interim/waiting_times_training.csv",
-        index_col="id",
-        parse_dates=["date"],
+    waiting_time_df = read_dataset(
+        find_dataset(DATA_PATH / "interim/waiting_times_training.csv"),
+        "waiting_times_training",
     )
-    lommersum_df = pd.read_csv(
-        DATA_PATH / "interim/weather_station01327_Lommersum.csv",
-        index_col="date",
-        parse_dates=["date"],
-    )
-    koelnbonn_df = pd.read_csv(
-        DATA_PATH / "interim/weather_station02667_Koeln-Bonn.csv",
-        index_col="date",
-        parse_dates=["date"],
+    weather_df = load_weather_table(
+        columns=None if all_weather_columns else SELECTED_WEATHER_COLUMNS
     )
 
-    lommersum_df = prepare_weather(lommersum_df, "lommersum_")
-    koelnbonn_df = prepare_weather(koelnbonn_df, "koelnbonn_")
+    if backend == "polars":
+        from src.data.polars_backend import join_weather
 
-    ext_datapoints_df = waiting_time_df.join(other=lommersum_df, on="date").join(
-        other=koelnbonn_df, on="date"
-    )
+        ext_datapoints_df = join_weather(waiting_time_df, weather_df)
+    else:
+        ext_datapoints_df = waiting_time_df.join(other=weather_df, on="date")
 
-    split_dfs = train_test_split_date_based(ext_datapoints_df, 0.2)
+    datapoints_file = f"all_datapoints.{fmt}"
+    ordered_df, manifest = order_by_split(ext_datapoints_df, 0.2, datapoints_file)
 
-    print(
-        f"{len(split_dfs['X_train'])} train samples, {len(split_dfs['X_test'])} test samples"
-    )
-    print(
-        f"proportion of test samples: {len(split_dfs['X_test'])/(len(split_dfs['X_test'])+len(split_dfs['X_train'])):.2%}"
-    )
+    n_train = manifest["train"][1]
+    n_test = len(ordered_df) - n_train
+
+    print(f"{n_train} train samples, {n_test} test samples")
+    print(f"proportion of test samples: {n_test/len(ordered_df):.2%}")
+
+    write_dataset(ordered_df, f"{output_dir}/{datapoints_file}", "datapoints")
 
-    ext_datapoints_df.to_csv(f"{output_dir}/all_datapoints.csv", index=False)
+    with open(f"{output_dir}/{SPLIT_MANIFEST}", "w") as manifest_file:
+        json.dump(manifest, manifest_file, indent=2)
 
-    for name, data in split_dfs.items():
-        data.to_csv(f"{output_dir}/{name}.csv", index=False)
+    if split_files:
+        for name in ["train", "test"]:
+            start, stop = manifest[name]
+            split_df = ordered_df.iloc[start:stop]
+            write_dataset(
+                split_df.drop(columns=["waiting_time"]),
+                f"{output_dir}/X_{name}.{fmt}",
+                "datapoints",
+            )
+            write_dataset(
+                split_df[["waiting_time"]], f"{output_dir}/y_{name}.{fmt}", "target"
+            )
 
 
 if __name__ == "__main__":
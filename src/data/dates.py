@@ -0,0 +1,56 @@
+"""
+Project: Phantasialand
+State: 10/2026
+
+Vectorized formatting of dates and times of day as strings, shared by the processing
+scripts of `src/data`.
+
+This module only depends on NumPy, so the scripts using it (and their pipeline nodes,
+see `src/data/pipeline.py`) do not depend on each other.
+"""
+
+import functools
+
+import numpy as np
+
+# seconds per day, the number of distinct times of day in HH:MM:SS format
+DAY_SECONDS = 24 * 60 * 60
+
+
+@functools.lru_cache(maxsize=None)
+def _time_strings() -> np.ndarray:
+    """lookup table mapping seconds since midnight to HH:MM:SS strings."""
+    return np.array(
+        [
+            f"{s // 3600:02d}:{s // 60 % 60:02d}:{s % 60:02d}"
+            for s in range(DAY_SECONDS)
+        ],
+        dtype=object,
+    )
+
+
+def format_times(seconds: np.ndarray) -> np.ndarray:
+    """format seconds since midnight as HH:MM:SS strings.
+
+    Args:
+        seconds (np.ndarray): integer seconds since midnight
+
+    Returns:
+        np.ndarray: object array of time strings
+    """
+    return _time_strings()[np.asarray(seconds) % DAY_SECONDS]
+
+
+def format_dates(dates: np.ndarray) -> np.ndarray:
+    """format dates as YYYY-MM-DD strings, formatting each distinct date only once.
+
+    Args:
+        dates (np.ndarray): datetime64 dates
+
+    Returns:
+        np.ndarray: object array of date strings
+    """
+    unique_dates, inverse = np.unique(
+        np.asarray(dates, dtype="datetime64[D]"), return_inverse=True
+    )
+    return np.datetime_as_string(unique_dates, unit="D").astype(object)[inverse]
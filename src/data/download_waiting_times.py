@@ -13,17 +13,39 @@ MONTHS and YEARS. This script then queries all possible combinations of ATTRACTI
 MONTHS and YEARS. Querying non-existing documents is no problem.
 
 The queried data ist stored in one csv-file with the following columns (all entries are
-strings): attraction, month, year, datum, wartezeit, status 
+strings): attraction, month, year, datum, wartezeit, status. The documents are
+flattened into typed, dictionary-encoded column buffers and written in chunks of
+CHUNK_SIZE datapoints.
 
 The output should be further processed with `process_wartezeiten_app.py`
+
+With `--concurrency N` (N > 1), the documents are downloaded asynchronously over a pool
+of at most N keep-alive connections. Failed requests (connection errors, 429 and 5xx)
+are retried with exponential backoff.
+
+With `--cache-dir`, every downloaded document is stored on disk (together with the time
+of the download and a content hash) as soon as it arrives. Later runs serve documents of
+months that were already over when they were downloaded from the cache and only query
+the current and still open months again. An interrupted run can therefore simply be
+restarted and continues where it stopped.
 """
 
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Iterable, Iterator, Tuple, Union
+from array import array
+from os import PathLike
+from pathlib import Path
+import asyncio
+import datetime
+import hashlib
 import itertools
+import json
 import logging
+import os
 
+import aiohttp
 import requests
 from tqdm import tqdm
+import numpy as np
 import pandas as pd
 import click
 
@@ -34,9 +56,220 @@ from src.data.constants import (
     LOGGING_FORMAT_STR,
 )
 
+LINECHART_URL = "https://www.wartezeiten.app/charts/linechart.php"
+
+# internal id of Phantasialand used by wartezeiten.app
+PARK_ID = "4d3256754a354f354d503567464d316a7a773d3d"
+
+# cached documents of months that were not over yet when downloading them are queried
+# again if they are older than this
+DEFAULT_MAX_AGE = datetime.timedelta(hours=1)
+
+# failed requests are retried this often, waiting DEFAULT_BACKOFF seconds (doubled after
+# each attempt) in between
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.5
+
+# placeholder for downloaded datapoints that are not kept in memory but read from the
+# cache when needed
+_CACHED = object()
+
+
+def _iter_queries() -> Iterator[Tuple[Tuple[str, str], ...]]:
+    """iterate over all combinations of attractions, months and years.
+
+    Returns:
+    Iterator: ((attr_name, attr_id), (month_name, month_id), (year_name, year_id)) for
+        each combination, always in the same order.
+    """
+    return itertools.product(
+        WARTEZEITEN_APP_ATTRACTIONS.items(),
+        WARTEZEITEN_APP_MONTHS.items(),
+        WARTEZEITEN_APP_YEARS.items(),
+    )
+
+
+def _query_params(attraction: str, month: str, year: str) -> Dict[str, str]:
+    return {"park": PARK_ID, "code": attraction, "monat": month, "jahr": year}
+
+
+def _month_end(month_name: str, year_name: str) -> datetime.datetime:
+    """return the first moment after the end of the given month."""
+    month = datetime.datetime.strptime(month_name, "%B").month
+    year = int(year_name)
+
+    if month == 12:
+        return datetime.datetime(year + 1, 1, 1)
+    else:
+        return datetime.datetime(year, month + 1, 1)
+
+
+def _content_hash(datapoints: Optional[List[Dict[str, str]]]) -> str:
+    return hashlib.sha256(json.dumps(datapoints, sort_keys=True).encode()).hexdigest()
+
+
+def _cache_path(
+    cache_dir: Union[str, PathLike], attraction: str, month: str, year: str
+) -> Path:
+    """path of the cached document for the given internal attraction, month and year
+    ids.
+    """
+    return Path(cache_dir) / f"{attraction}_{month}_{year}.json"
+
+
+def read_cached_document(path: Union[str, PathLike]) -> Optional[dict]:
+    """read a document stored by `write_cached_document`.
+
+    Args:
+    path (str | PathLike): path of the cached document
+
+    Returns:
+    dict: {"fetched_at": <ISO timestamp>, "sha256": <hash of data>, "data": <list of
+        datapoints>} or None if the file does not exist or its content does not match
+        the stored hash (e.g. because it was only partially written).
+    """
+    try:
+        with open(path) as fp:
+            cached = json.load(fp)
+    except (OSError, ValueError):
+        return None
+
+    if _content_hash(cached.get("data")) != cached.get("sha256"):
+        logging.warning(f"Ignoring corrupt cache file {path}")
+        return None
+
+    return cached
+
+
+def write_cached_document(
+    path: Union[str, PathLike],
+    datapoints: Optional[List[Dict[str, str]]],
+    fetched_at: datetime.datetime,
+):
+    """atomically store a downloaded document with its download time and content hash.
+
+    Args:
+    path (str | PathLike): path of the cached document
+    datapoints (list[dict[str, str]]): result of `query_waiting_times`
+    fetched_at (datetime.datetime): time of the download
+    """
+    cached = {
+        "fetched_at": fetched_at.isoformat(),
+        "sha256": _content_hash(datapoints),
+        "data": datapoints,
+    }
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as fp:
+        json.dump(cached, fp)
+    os.replace(tmp_path, path)
+
+
+def _read_cache(
+    queries: List[tuple],
+    cache_dir: Optional[Union[str, PathLike]],
+    max_age: datetime.timedelta,
+) -> Tuple[list, List[int]]:
+    """look up all queries in the cache.
+
+    A cached document is used if it was downloaded after the end of its month (plus one
+    day of safety margin, as we do not know when wartezeiten.app closes a month) or if
+    it is younger than `max_age`.
+
+    Returns:
+    list: `_CACHED` for each query that can be served from the cache, None otherwise
+    list[int]: indices of the queries that must be downloaded
+    """
+
+    results = [None] * len(queries)
+
+    if cache_dir is None:
+        return results, list(range(len(queries)))
+
+    Path(cache_dir).mkdir(parents=True, exist_ok=True)
+
+    now = datetime.datetime.now()
+    pending = []
+
+    for i, ((_, attr_id), (month_name, month_id), (year_name, year_id)) in enumerate(
+        queries
+    ):
+        path = _cache_path(cache_dir, attr_id, month_id, year_id)
+        cached = read_cached_document(path)
+
+        if cached is not None:
+            fetched_at = datetime.datetime.fromisoformat(cached["fetched_at"])
+            closed_at = _month_end(month_name, year_name) + datetime.timedelta(days=1)
+            if fetched_at >= closed_at or now - fetched_at < max_age:
+                results[i] = _CACHED
+                continue
+
+        pending.append(i)
+
+    logging.info(
+        f"{len(queries) - len(pending)} documents served from cache, "
+        f"{len(pending)} documents to download"
+    )
+
+    return results, pending
+
+
+def _store_result(
+    cache_dir: Optional[Union[str, PathLike]],
+    query: tuple,
+    datapoints: Optional[List[Dict[str, str]]],
+):
+    """store a downloaded document in the cache (if any).
+
+    Returns:
+    `_CACHED` if the document was cached, else `datapoints`
+    """
+    if cache_dir is None:
+        return datapoints
+
+    (attr_name, attr_id), (month_name, month_id), (year_name, year_id) = query
+    path = _cache_path(cache_dir, attr_id, month_id, year_id)
+
+    previous = read_cached_document(path)
+    if previous is not None and previous["sha256"] != _content_hash(datapoints):
+        logging.info(f"Document changed: {attr_name=}, {month_name=}, {year_name=}")
+
+    write_cached_document(path, datapoints, datetime.datetime.now())
+
+    return _CACHED
+
+
+def _iter_documents(
+    queries: List[tuple],
+    results: list,
+    cache_dir: Optional[Union[str, PathLike]] = None,
+) -> Iterator[dict]:
+    """combine queries and downloaded datapoints, skipping empty documents.
+
+    Datapoints marked as `_CACHED` are read from `cache_dir` one document at a time, so
+    only the document currently processed by the consumer is kept in memory.
+    """
+
+    for query, datapoints in zip(queries, results):
+        (attr_name, attr_id), (month_name, month_id), (year_name, year_id) = query
+
+        if datapoints is _CACHED:
+            cached = read_cached_document(
+                _cache_path(cache_dir, attr_id, month_id, year_id)
+            )
+            datapoints = cached["data"] if cached else None
+
+        if datapoints:
+            yield {
+                "attraction": attr_name,
+                "month": month_name,
+                "year": year_name,
+                "data": datapoints,
+            }
+
 
 def query_waiting_times(
-    attraction: str, month: str, year: str
+    attraction: str, month: str, year: str, url: str = LINECHART_URL
 ) -> List[Dict[str, str]]:
     """query the waiting times for a single attraction and a given month and year.
 
@@ -48,6 +281,7 @@ def query_waiting_times(
     attraction (str): internal attraction id, e.g. "636a733d"
     month (str): internal month id, e.g. "63673d3d"
     year (str): internal year id, e.g. "6354303965413d3d"
+    url (str): endpoint to query. Defaults to `LINECHART_URL`.
 
     Returns:
     list[dict[str, str]]: a list of data points in the form of
@@ -55,15 +289,7 @@ def query_waiting_times(
         None if no information is returned, e.g. when querying a month for which
         no data is present.
     """
-    r = requests.get(
-        "https://www.wartezeiten.app/charts/linechart.php",
-        params={
-            "park": "4d3256754a354f354d503567464d316a7a773d3d",
-            "code": attraction,
-            "monat": month,
-            "jahr": year,
-        },
-    )
+    r = requests.get(url, params=_query_params(attraction, month, year))
 
     # when querying a month/year combination that does not exists, wartezeiten still
     # returns status code 200 and 'null' as content. Even when sending completely wrong
@@ -78,88 +304,371 @@ def query_waiting_times(
 
 
 
-def download_all_waiting_times() -> List[dict]:
+def download_all_waiting_times(
+    url: str = LINECHART_URL,
+    cache_dir: Optional[Union[str, PathLike]] = None,
+    max_age: datetime.timedelta = DEFAULT_MAX_AGE,
+) -> List[dict]:
     """download the waitings times for all attractions, months and years.
 
+    Args:
+    url (str): endpoint to query. Defaults to `LINECHART_URL`.
+    cache_dir (str | PathLike): directory of the document cache. Optional.
+    max_age (datetime.timedelta): maximum age of cached documents of months that were
+        not over yet when they were downloaded. Defaults to `DEFAULT_MAX_AGE`.
+
     Returns:
     List[dict]: one entry for each queried document
     """
 
-    requested_data = []
-    errors = []
+    queries = list(_iter_queries())
+    results = _download(queries, url, cache_dir, max_age)
 
-    total_iterations = (
-        len(WARTEZEITEN_APP_ATTRACTIONS)
-        * len(WARTEZEITEN_APP_MONTHS)
-        * len(WARTEZEITEN_APP_YEARS)
-    )
+    return list(_iter_documents(queries, results, cache_dir))
 
-    for ((attr_name, attr_id), (month_name, month_id), (year_name, year_id)) in tqdm(
-        itertools.product(
-            WARTEZEITEN_APP_ATTRACTIONS.items(),
-            WARTEZEITEN_APP_MONTHS.items(),
-            WARTEZEITEN_APP_YEARS.items(),
-        ),
-        total=total_iterations,
-    ):
+
+def _download(
+    queries: List[tuple],
+    url: str,
+    cache_dir: Optional[Union[str, PathLike]],
+    max_age: datetime.timedelta,
+) -> list:
+    """sequentially download all `queries` that are not cached.
+
+    Returns:
+    list: datapoints (or `_CACHED`) for each query
+    """
+
+    results, pending = _read_cache(queries, cache_dir, max_age)
+
+    for i in tqdm(pending):
+        (attr_name, attr_id), (month_name, month_id), (year_name, year_id) = queries[i]
         try:
-            datapoints = query_waiting_times(attr_id, month_id, year_id)
-            if datapoints:
-                data = {
-                    "attraction": attr_name,
-                    "month": month_name,
-                    "year": year_name,
-                    "data": datapoints,
-                }
-                requested_data.append(data)
+            datapoints = query_waiting_times(attr_id, month_id, year_id, url)
+            results[i] = _store_result(cache_dir, queries[i], datapoints)
         except Exception as e:
             logging.error(f"Download exception (This is not necessarily a problem): "
                             f"{attr_name=}, {month_name=}, {year_name=}, {e=}")
 
-    return requested_data
+    return results
 
 
-def convert_to_dataframe(raw_data: List[dict]) -> pd.DataFrame:
-    """convert the list returned by `download_all_waiting_times` to a flat DataFrame.
+async def query_waiting_times_async(
+    session: aiohttp.ClientSession,
+    attraction: str,
+    month: str,
+    year: str,
+    url: str = LINECHART_URL,
+    retries: int = DEFAULT_RETRIES,
+    backoff: float = DEFAULT_BACKOFF,
+) -> Optional[List[Dict[str, str]]]:
+    """asynchronous version of `query_waiting_times` using a shared session.
+
+    Connection errors, timeouts and responses with status 429 or 5xx are retried up to
+    `retries` times, waiting `backoff * 2**attempt` seconds before each new attempt. All
+    other errors are raised immediately.
 
     Args:
-    raw_data (List[dict]): list of queried documents
+    session (aiohttp.ClientSession): session holding the connection pool
+    attraction (str): internal attraction id, e.g. "636a733d"
+    month (str): internal month id, e.g. "63673d3d"
+    year (str): internal year id, e.g. "6354303965413d3d"
+    url (str): endpoint to query. Defaults to `LINECHART_URL`.
+    retries (int): number of retries after the first attempt. Defaults to 3.
+    backoff (float): initial backoff in seconds. Defaults to 0.5.
 
     Returns:
-    pd.DataFrame: DataFrame containing one row per datapoints
+    list[dict[str, str]]: the same as `query_waiting_times`
+    """
+
+    for attempt in range(retries + 1):
+        try:
+            async with session.get(
+                url, params=_query_params(attraction, month, year)
+            ) as r:
+                r.raise_for_status()
+                text = await r.text()
+            break
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            retryable = not isinstance(e, aiohttp.ClientResponseError) or (
+                e.status == 429 or e.status >= 500
+            )
+            if not retryable or attempt == retries:
+                raise
+            await asyncio.sleep(backoff * 2 ** attempt)
+
+    # see `query_waiting_times`, wartezeiten.app answers with 'null' or '' if there is
+    # no data
+    if text:
+        return json.loads(text)
+    else:
+        return []
+
+
+async def download_all_waiting_times_async(
+    concurrency: int = 16,
+    url: str = LINECHART_URL,
+    retries: int = DEFAULT_RETRIES,
+    backoff: float = DEFAULT_BACKOFF,
+    cache_dir: Optional[Union[str, PathLike]] = None,
+    max_age: datetime.timedelta = DEFAULT_MAX_AGE,
+) -> List[dict]:
+    """download the waitings times for all attractions, months and years concurrently.
+
+    At most `concurrency` requests are in flight at the same time and the underlying
+    connections are kept alive and reused. The result is the same as the result of
+    `download_all_waiting_times`, including the order of the documents.
+
+    Args:
+    concurrency (int): maximum number of parallel requests/connections. Defaults to 16.
+    url (str): endpoint to query. Defaults to `LINECHART_URL`.
+    retries (int): see `query_waiting_times_async`. Defaults to 3.
+    backoff (float): see `query_waiting_times_async`. Defaults to 0.5.
+    cache_dir (str | PathLike): see `download_all_waiting_times`. Optional.
+    max_age (datetime.timedelta): see `download_all_waiting_times`.
+
+    Returns:
+    List[dict]: one entry for each queried document
+    """
+
+    queries = list(_iter_queries())
+    results = await _download_async(
+        queries, concurrency, url, retries, backoff, cache_dir, max_age
+    )
+
+    return list(_iter_documents(queries, results, cache_dir))
+
+
+async def _download_async(
+    queries: List[tuple],
+    concurrency: int,
+    url: str,
+    retries: int,
+    backoff: float,
+    cache_dir: Optional[Union[str, PathLike]],
+    max_age: datetime.timedelta,
+) -> list:
+    """concurrently download all `queries` that are not cached.
+
+    Returns:
+    list: datapoints (or `_CACHED`) for each query
     """
 
-    flat_datapoints = []
-    for document in tqdm(raw_data):
-        for entry in document["data"]:
-            flat_datapoints.append(
-                {
-                    "attraction": document["attraction"],
-                    "month": document["month"],
-                    "year": document["year"],
-                    **entry,
-                }
+    results, pending = _read_cache(queries, cache_dir, max_age)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    timeout = aiohttp.ClientTimeout(total=60)
+
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+
+        async def fetch(i: int) -> int:
+            (attr_name, attr_id), (month_name, month_id), (year_name, year_id) = (
+                queries[i]
             )
+            async with semaphore:
+                try:
+                    datapoints = await query_waiting_times_async(
+                        session, attr_id, month_id, year_id, url, retries, backoff
+                    )
+                    results[i] = _store_result(cache_dir, queries[i], datapoints)
+                except Exception as e:
+                    logging.error(
+                        f"Download exception (This is not necessarily a problem): "
+                        f"{attr_name=}, {month_name=}, {year_name=}, {e=}"
+                    )
+            return i
+
+        tasks = [fetch(i) for i in pending]
+        for task in tqdm(asyncio.as_completed(tasks), total=len(tasks)):
+            await task
+
+    return results
+
+
+class _ColumnBuffers:
+    """typed column buffers for the flat waiting time table.
+
+    Attraction, month, year and status are dictionary-encoded, i.e. only an int8 code is
+    stored per datapoint (attraction, month and year even only once per document) and
+    the distinct values are kept in dictionaries that are shared by all chunks. The
+    waiting time is parsed into an int16 buffer, only `datum` remains a string.
+    """
+
+    def __init__(self):
+        self.dictionaries = {
+            col: {} for col in ["attraction", "month", "year", "status"]
+        }
+        self.start = 0
+        self._reset()
+
+    def _reset(self):
+        # run-length encoded codes of attraction, month and year: one entry per document
+        self.document_codes = {col: [] for col in ["attraction", "month", "year"]}
+        self.document_lengths = []
+        self.datum = []
+        self.wartezeit = array("h")
+        self.status = array("b")
+
+    def __len__(self):
+        return len(self.datum)
+
+    def _encode(self, col: str, value: str) -> int:
+        return self.dictionaries[col].setdefault(value, len(self.dictionaries[col]))
+
+    def append(self, document: dict):
+        for col, codes in self.document_codes.items():
+            codes.append(self._encode(col, document[col]))
+        self.document_lengths.append(len(document["data"]))
+
+        self.datum.extend(entry["datum"] for entry in document["data"])
+        self.wartezeit.extend(int(entry["wartezeit"]) for entry in document["data"])
+        self.status.extend(
+            self._encode("status", entry["status"]) for entry in document["data"]
+        )
+
+    def _categorical(self, col: str, codes: np.ndarray) -> pd.Categorical:
+        return pd.Categorical.from_codes(codes, categories=list(self.dictionaries[col]))
+
+    def flush(self) -> pd.DataFrame:
+        """turn the buffered datapoints into a DataFrame and empty the buffers."""
+
+        columns = {
+            col: self._categorical(col, np.repeat(codes, self.document_lengths))
+            for col, codes in self.document_codes.items()
+        }
+        columns["datum"] = self.datum
+        columns["wartezeit"] = np.frombuffer(self.wartezeit, dtype=np.int16).copy()
+        columns["status"] = self._categorical(
+            "status", np.frombuffer(self.status, dtype=np.int8)
+        )
+
+        df = pd.DataFrame(
+            columns,
+            index=pd.RangeIndex(self.start, self.start + len(self), name="id"),
+        )
+
+        self.start += len(self)
+        self._reset()
+
+        return df
+
+
+def iter_flat_chunks(
+    documents: Iterable[dict], chunk_size: Optional[int] = 1_000_000
+) -> Iterator[pd.DataFrame]:
+    """flatten queried documents into DataFrames with one row per datapoint.
+
+    Datapoints are appended straight into typed column buffers (see `_ColumnBuffers`)
+    and handed out in chunks, so the memory needed does not depend on the number of
+    documents (as long as `documents` is an iterator, e.g. from the document cache).
+    Documents are never split, so a chunk may be larger than `chunk_size` by less than
+    one document.
+
+    Args:
+    documents (Iterable[dict]): queried documents
+    chunk_size (int): minimum number of rows per chunk. None returns a single chunk.
+        Defaults to 1,000,000.
+
+    Returns:
+    Iterator[pd.DataFrame]: chunks with the columns attraction, month, year, datum,
+        wartezeit and status. The index "id" is consecutive across all chunks.
+    """
 
-    df = pd.DataFrame(flat_datapoints)
-    df.index.name = "id"
+    buffers = _ColumnBuffers()
+
+    for document in tqdm(documents):
+        buffers.append(document)
+
+        if chunk_size is not None and len(buffers) >= chunk_size:
+            yield buffers.flush()
+
+    if len(buffers) or buffers.start == 0:
+        yield buffers.flush()
+
+
+def convert_to_dataframe(raw_data: Iterable[dict]) -> pd.DataFrame:
+    """convert the list returned by `download_all_waiting_times` to a flat DataFrame.
+
+    Args:
+    raw_data (Iterable[dict]): queried documents
+
+    Returns:
+    pd.DataFrame: DataFrame containing one row per datapoints
+    """
+
+    (df,) = iter_flat_chunks(raw_data, chunk_size=None)
 
     return df
 
 
+def write_flat_csv(
+    documents: Iterable[dict],
+    output_path: Union[str, PathLike],
+    chunk_size: int = 1_000_000,
+):
+    """flatten queried documents and write them to a csv file chunk by chunk.
+
+    The output is the same as `convert_to_dataframe(documents).to_csv(output_path)`.
+
+    Args:
+    documents (Iterable[dict]): queried documents
+    output_path (str | PathLike): csv file to write
+    chunk_size (int): see `iter_flat_chunks`. Defaults to 1,000,000.
+    """
+
+    for i, chunk in enumerate(iter_flat_chunks(documents, chunk_size)):
+        chunk.to_csv(output_path, mode="w" if i == 0 else "a", header=i == 0)
+
+
 @click.command(help=__doc__)
 @click.argument("output_path", type=click.Path())
-def main(output_path):
+@click.option(
+    "-c",
+    "--concurrency",
+    default=1,
+    type=int,
+    help="number of parallel requests, values > 1 enable asynchronous downloading",
+)
+@click.option(
+    "--cache-dir",
+    default=None,
+    type=click.Path(file_okay=False),
+    help="directory to cache downloaded documents in, enables incremental downloads",
+)
+@click.option(
+    "--chunk-size",
+    default=1_000_000,
+    type=int,
+    help="number of datapoints converted and written at once",
+)
+def main(output_path, concurrency, cache_dir, chunk_size):
     logging.basicConfig(format=LOGGING_FORMAT_STR)
 
     logging.info("Download all combinations of attractions, month and year...")
-    raw_data = download_all_waiting_times()
-
-    logging.info("Convert to DataFrame...")
-    df = convert_to_dataframe(raw_data)
-
-    logging.info(f"Store data at {output_path} (csv-file)...")
-    df.to_csv(output_path)
+    queries = list(_iter_queries())
+    if concurrency > 1:
+        results = asyncio.run(
+            _download_async(
+                queries,
+                concurrency,
+                LINECHART_URL,
+                retries=DEFAULT_RETRIES,
+                backoff=DEFAULT_BACKOFF,
+                cache_dir=cache_dir,
+                max_age=DEFAULT_MAX_AGE,
+            )
+        )
+    else:
+        results = _download(
+            queries, LINECHART_URL, cache_dir=cache_dir, max_age=DEFAULT_MAX_AGE
+        )
+
+    # with a cache, `results` only holds placeholders and the documents are read from
+    # disk one by one while they are converted
+    logging.info(f"Convert and store data at {output_path} (csv-file)...")
+    documents = _iter_documents(queries, results, cache_dir)
+    write_flat_csv(documents, output_path, chunk_size)
 
 
 if __name__ == "__main__":
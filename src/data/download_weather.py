@@ -0,0 +1,234 @@
+"""
+Project: Phantasialand
+State: 10/2026
+
+Download the daily weather archives of the Deutscher Wetterdienst into CACHE_DIR and
+keep them up to date.
+
+For each weather station, the current archive `tageswerte_KL_<STATION_ID>_akt.zip` and
+the newest historical archive `tageswerte_KL_<STATION_ID>_<START>_<END>_hist.zip` are
+downloaded. Archives that are already cached are revalidated with conditional requests
+(ETag/Last-Modified), so unchanged archives are not downloaded again. The validators and
+a sha256 of each archive are stored next to it in `<ARCHIVE>.meta.json`.
+
+The archives are processed into the weather table by the `weather` node of the data
+pipeline (see `pipeline.py`), which picks up the newest historical archive of each
+station. `make weather` runs both steps.
+
+CACHE_DIR defaults to `data/raw/dwd_weather`. The base urls of the archives can be
+changed with `--recent-url` and `--historical-url` (or the environment variables
+DWD_RECENT_URL and DWD_HISTORICAL_URL).
+"""
+
+from os import PathLike
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+import hashlib
+import json
+import logging
+import os
+import re
+
+import requests
+import click
+
+from src.data.constants import (
+    DWD_ARCHIVE_PATH,
+    DWD_HISTORICAL_URL,
+    DWD_RECENT_URL,
+    DWD_STATIONS,
+    LOGGING_FORMAT_STR,
+)
+
+
+def _meta_path(path: Union[str, PathLike]) -> Path:
+    return Path(f"{path}.meta.json")
+
+
+def fetch_file(
+    url: str, path: Union[str, PathLike], session: Optional[requests.Session] = None
+) -> bool:
+    """download `url` to `path` unless the cached copy at `path` is still up to date.
+
+    If `path` was downloaded by this function before, the request is sent with
+    If-None-Match/If-Modified-Since and a 304 response leaves the file untouched.
+
+    Args:
+        url (str): url of the file
+        path (str | PathLike): where to store the file
+        session (requests.Session): session to use. Optional.
+
+    Returns:
+        bool: True if the content of `path` changed
+    """
+
+    session = session or requests.Session()
+    meta_path = _meta_path(path)
+
+    meta = {}
+    if Path(path).exists() and meta_path.exists():
+        meta = json.loads(meta_path.read_text())
+
+    headers = {}
+    if meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+
+    with session.get(url, headers=headers, stream=True, timeout=60) as r:
+
+        if r.status_code == 304:
+            logging.info(f"{url} not modified")
+            return False
+
+        r.raise_for_status()
+
+        sha256 = hashlib.sha256()
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as fp:
+            for block in r.iter_content(chunk_size=1 << 16):
+                sha256.update(block)
+                fp.write(block)
+        os.replace(tmp_path, path)
+
+        new_meta = {
+            "url": url,
+            "etag": r.headers.get("ETag"),
+            "last_modified": r.headers.get("Last-Modified"),
+            "sha256": sha256.hexdigest(),
+        }
+
+    meta_path.write_text(json.dumps(new_meta, indent=2))
+
+    changed = new_meta["sha256"] != meta.get("sha256")
+    logging.info(f"{url} {'changed' if changed else 'downloaded, but not changed'}")
+
+    return changed
+
+
+def find_historical_archive(
+    station_id: str,
+    historical_url: str = DWD_HISTORICAL_URL,
+    session: Optional[requests.Session] = None,
+) -> str:
+    """find the name of the newest historical archive of a station in the directory
+    listing at `historical_url`.
+
+    Args:
+        station_id (str): DWD station id, e.g. "01327"
+        historical_url (str): url of the directory listing
+        session (requests.Session): session to use. Optional.
+
+    Raises:
+        ValueError: there is no historical archive for this station
+
+    Returns:
+        str: file name, e.g. "tageswerte_KL_01327_19370101_20201231_hist.zip"
+    """
+
+    session = session or requests.Session()
+
+    r = session.get(historical_url, timeout=60)
+    r.raise_for_status()
+
+    # the end date is part of the file name, so the newest file sorts last
+    pattern = rf"tageswerte_KL_{station_id}_\d{{8}}_\d{{8}}_hist\.zip"
+    names = sorted(set(re.findall(pattern, r.text)))
+
+    if not names:
+        raise ValueError(f"no historical archive for {station_id=} at {historical_url}")
+
+    return names[-1]
+
+
+def fetch_station_archives(
+    station_id: str,
+    cache_dir: Union[str, PathLike],
+    recent_url: str = DWD_RECENT_URL,
+    historical_url: str = DWD_HISTORICAL_URL,
+    session: Optional[requests.Session] = None,
+) -> Tuple[Path, Path, bool]:
+    """bring the cached current and historical archive of a station up to date.
+
+    Historical archives of the station that were superseded by a newer one are removed
+    from the cache.
+
+    Args:
+        station_id (str): DWD station id, e.g. "01327"
+        cache_dir (str | PathLike): directory containing the cached archives
+        recent_url (str): base url of the current archives. Defaults to DWD_RECENT_URL.
+        historical_url (str): base url of the historical archives. Defaults to
+            DWD_HISTORICAL_URL.
+        session (requests.Session): session to use. Optional.
+
+    Returns:
+        Path: path of the current archive
+        Path: path of the historical archive
+        bool: True if any of the two archives changed
+    """
+
+    session = session or requests.Session()
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    current_name = f"tageswerte_KL_{station_id}_akt.zip"
+    historical_name = find_historical_archive(station_id, historical_url, session)
+
+    current_changed = fetch_file(
+        recent_url + current_name, cache_dir / current_name, session
+    )
+    historical_changed = fetch_file(
+        historical_url + historical_name, cache_dir / historical_name, session
+    )
+
+    for stale_path in cache_dir.glob(f"tageswerte_KL_{station_id}_*_hist.zip"):
+        if stale_path.name != historical_name:
+            logging.info(f"Removing superseded archive {stale_path}")
+            stale_path.unlink()
+            _meta_path(stale_path).unlink(missing_ok=True)
+
+    return (
+        cache_dir / current_name,
+        cache_dir / historical_name,
+        current_changed or historical_changed,
+    )
+
+
+@click.command(help=__doc__)
+@click.argument(
+    "cache_dir", default=str(DWD_ARCHIVE_PATH), type=click.Path(file_okay=False)
+)
+@click.option(
+    "-s",
+    "--station",
+    "stations",
+    multiple=True,
+    default=list(DWD_STATIONS),
+    help="DWD station id, can be given multiple times. Defaults to all DWD_STATIONS",
+)
+@click.option(
+    "--recent-url",
+    default=DWD_RECENT_URL,
+    envvar="DWD_RECENT_URL",
+    help="base url of the current archives",
+)
+@click.option(
+    "--historical-url",
+    default=DWD_HISTORICAL_URL,
+    envvar="DWD_HISTORICAL_URL",
+    help="base url (and directory listing) of the historical archives",
+)
+def main(cache_dir: str, stations: List[str], recent_url: str, historical_url: str):
+    logging.basicConfig(format=LOGGING_FORMAT_STR, level=logging.INFO)
+
+    session = requests.Session()
+
+    for station_id in stations:
+        fetch_station_archives(
+            station_id, cache_dir, recent_url, historical_url, session=session
+        )
+
+
+if __name__ == "__main__":
+
+    main()
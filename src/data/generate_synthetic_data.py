@@ -0,0 +1,619 @@
+"""
+Project: Phantasialand
+State: 10/2026
+
+Generate synthetic raw data in the formats of the original data sources, so the whole
+pipeline can be run (and benchmarked) at any scale without downloading anything.
+
+The following files are written to OUTPUT_DIR/raw, with the names used by
+`pipeline.py`:
+- wartezeiten_app.csv: waiting times in the format of `download_waiting_times.py`, one
+  datapoint of each attraction every `--interval` seconds (with a few seconds of
+  jitter) from half an hour before opening (9:00) to half an hour after closing
+  (18:00), for all days of the months listed in WARTEZEITEN_APP_MONTHS. Some
+  attractions are closed for whole days.
+- dwd_weather/tageswerte_KL_<STATION_ID>_akt.zip and
+  dwd_weather/tageswerte_KL_<STATION_ID>_<START>_<END>_hist.zip: daily weather in the
+  format of the DWD OpenData archives for each station in DWD_STATIONS, with a seasonal
+  cycle and autocorrelated noise. The current and the historical archive overlap.
+- Feiertage Deutschland.ics: the fixed and Easter based public holidays (and two days
+  off that are no public holidays) of each year as single events.
+- schulferien.txt: six kinds of school holidays of each state and year in the format
+  of schulferien.org (see `process_school_holidays.py`).
+
+The waiting times depend on the attraction, the time of the day, weekends, public
+and school holidays in NRW and the weather of Lommersum, so the trained models have
+something to learn. All random numbers are drawn from a generator seeded with `--seed`,
+so the same arguments always produce the same files.
+
+Only the first `--attractions` attractions of WARTEZEITEN_APP_ATTRACTIONS are used, as
+the featurization only knows these attractions. Weather data before DWD_MIN_DATE is
+dropped by the pipeline, so the data starts with `--first-year` 2019 or later.
+
+To run the pipeline on the generated data, set the environment variable
+PHANTASIALAND_DATA_PATH to OUTPUT_DIR (see `constants.py`):
+
+    python src/data/generate_synthetic_data.py /tmp/synthetic --years 30
+    PHANTASIALAND_DATA_PATH=/tmp/synthetic python src/data/pipeline.py
+"""
+
+from os import PathLike
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple, Union
+import calendar
+import datetime
+import logging
+import zipfile
+
+from dateutil.easter import easter
+from icalendar import Calendar, Event
+import numpy as np
+import pandas as pd
+import click
+
+from src.data.constants import (
+    DWD_MIN_DATE,
+    DWD_STATIONS,
+    LOGGING_FORMAT_STR,
+    STATE_FULL2ISO,
+    WARTEZEITEN_APP_ATTRACTIONS,
+    WARTEZEITEN_APP_MONTHS,
+)
+from src.data.dates import format_dates, format_times
+
+OPENING_HOURS = (9, 18)
+
+# period in the names of the historical DWD archives of each station
+DWD_HISTORICAL_PERIODS = {
+    "01327": "19370101_20201231",
+    "02667": "19570701_20201231",
+}
+
+# DWD columns without values at each station, written as -999
+DWD_MISSING_COLUMNS = {
+    "01327": ["QN_3", "FX", "FM", "NM", "PM"],
+    "02667": [],
+}
+
+SCHOOL_HOLIDAY_NAMES = [
+    "Winterferien",
+    "Osterferien",
+    "Pfingstferien",
+    "Sommerferien",
+    "Herbstferien",
+    "Weihnachtsferien",
+]
+
+# states listing each public holiday that is not a holiday in all states
+_CORPUS_CHRISTI_STATES = "BW,BY,HE,NW,RP,SL"
+_ALL_STATES = "Alle Bundesländer"
+
+_MONTH_NUMBERS = {name: i for i, name in enumerate(calendar.month_name) if name}
+
+
+def public_holidays(year: int) -> List[Tuple[datetime.date, str, str]]:
+    """the public holidays of one year, see `write_public_holidays`.
+
+    Args:
+        year (int): year of the holidays
+
+    Returns:
+        List[Tuple[datetime.date, str, str]]: date, summary (ending with " (§)" for
+            public holidays) and location of each holiday, with unique dates
+    """
+
+    easter_sunday = easter(year)
+
+    def days_after_easter(days: int) -> datetime.date:
+        return easter_sunday + datetime.timedelta(days=days)
+
+    holidays = [
+        (datetime.date(year, 1, 1), "Neujahr (§)", _ALL_STATES),
+        (datetime.date(year, 1, 6), "Heilige Drei Könige (§)", "BW,BY,ST"),
+        (days_after_easter(-2), "Karfreitag (§)", _ALL_STATES),
+        (days_after_easter(1), "Ostermontag (§)", _ALL_STATES),
+        (datetime.date(year, 5, 1), "Tag der Arbeit (§)", _ALL_STATES),
+        (days_after_easter(39), "Christi Himmelfahrt (§)", _ALL_STATES),
+        (days_after_easter(50), "Pfingstmontag (§)", _ALL_STATES),
+        (days_after_easter(60), "Fronleichnam (§)", _CORPUS_CHRISTI_STATES),
+        (datetime.date(year, 10, 3), "Tag der Deutschen Einheit (§)", _ALL_STATES),
+        (
+            datetime.date(year, 10, 31),
+            "Reformationstag (§)",
+            "BB,HB,HH,MV,NI,SN,ST,SH,TH",
+        ),
+        (datetime.date(year, 11, 1), "Allerheiligen (§)", "BW,BY,NW,RP,SL"),
+        (datetime.date(year, 12, 24), "Heiligabend", _ALL_STATES),
+        (datetime.date(year, 12, 25), "1. Weihnachtstag (§)", _ALL_STATES),
+        (datetime.date(year, 12, 26), "2. Weihnachtstag (§)", _ALL_STATES),
+        (datetime.date(year, 12, 31), "Silvester", _ALL_STATES),
+    ]
+
+    # e.g. Christi Himmelfahrt falls on Tag der Arbeit in some years
+    unique_holidays = {}
+    for date, summary, location in holidays:
+        unique_holidays.setdefault(date, (date, summary, location))
+
+    return sorted(unique_holidays.values())
+
+
+def school_holidays(
+    year: int, state_index: int
+) -> List[List[Tuple[datetime.date, datetime.date]]]:
+    """the school holidays of one state and year, see `write_school_holidays`.
+
+    The holidays of the different states are shifted against each other, but the
+    intervals of one state never overlap.
+
+    Args:
+        year (int): year of the holidays
+        state_index (int): position of the state in STATE_FULL2ISO
+
+    Returns:
+        List[List[Tuple[datetime.date, datetime.date]]]: first and last date of the
+            intervals of each holiday in SCHOOL_HOLIDAY_NAMES
+    """
+
+    def interval(start: datetime.date, days: int):
+        return start, start + datetime.timedelta(days=days - 1)
+
+    easter_sunday = easter(year)
+    pentecost_tuesday = easter_sunday + datetime.timedelta(days=51)
+    # the summer holidays start on a Monday between late June and early August
+    first_summer_start = datetime.date(year, 6, 22)
+    summer_start = first_summer_start + datetime.timedelta(
+        days=-first_summer_start.weekday() % 7 + 7 * ((state_index + year) % 6)
+    )
+    autumn_start = datetime.date.fromisocalendar(year, 40 + state_index % 3, 1)
+
+    winter = []
+    if state_index % 2 == 0:
+        winter.append(interval(datetime.date.fromisocalendar(year, 7, 1), 5))
+    pentecost = [
+        [],
+        [interval(pentecost_tuesday, 1)],
+        [interval(pentecost_tuesday, 4)],
+    ][state_index % 3]
+
+    return [
+        winter,
+        [interval(easter_sunday - datetime.timedelta(days=6), 14)],
+        pentecost,
+        [interval(summer_start, 44)],
+        [interval(autumn_start, 12)],
+        [(datetime.date(year, 12, 23), datetime.date(year + 1, 1, 6))],
+    ]
+
+
+def _format_intervals(intervals: List[Tuple[datetime.date, datetime.date]]) -> str:
+    if not intervals:
+        return "-"
+
+    return "+".join(
+        f"{start:%d.%m.}" if start == end else f"{start:%d.%m.} - {end:%d.%m.}"
+        for start, end in intervals
+    )
+
+
+def write_school_holidays(path: Union[str, PathLike], years: List[int]):
+    """write the school holidays of all states in the format of schulferien.org.
+
+    Args:
+        path (str | PathLike): text file to write
+        years (List[int]): years of the holidays
+    """
+
+    lines = ["# Header", *SCHOOL_HOLIDAY_NAMES]
+
+    for year in years:
+        lines.append(f"# {year}")
+        for state_index, state in enumerate(STATE_FULL2ISO):
+            lines.append(state)
+            lines += map(_format_intervals, school_holidays(year, state_index))
+
+    Path(path).write_text("\n".join(lines) + "\n")
+
+
+def write_public_holidays(path: Union[str, PathLike], years: List[int]):
+    """write the public holidays of all years as ical calendar with one all-day event
+    per holiday, like the calendar read by `process_public_holidays.py`.
+
+    Args:
+        path (str | PathLike): ics file to write
+        years (List[int]): years of the holidays
+    """
+
+    cal = Calendar()
+    cal.add("prodid", "-//Phantasialand//synthetic holidays//DE")
+    cal.add("version", "2.0")
+
+    for year in years:
+        for date, summary, location in public_holidays(year):
+            event = Event()
+            event.add("uid", f"{date:%Y%m%d}@synthetic")
+            event.add("dtstart", date)
+            event.add("summary", summary)
+            event.add("location", location)
+            cal.add_component(event)
+
+    Path(path).write_bytes(cal.to_ical())
+
+
+def _autocorrelated_noise(
+    rng: np.random.Generator, n: int, scale: float, correlation: float = 0.7
+) -> np.ndarray:
+    # AR(1) process with a stationary standard deviation of `scale`
+    innovations = rng.normal(0, scale * np.sqrt(1 - correlation ** 2), n)
+    noise = np.empty(n)
+    noise[0] = rng.normal(0, scale)
+    for i in range(1, n):
+        noise[i] = correlation * noise[i - 1] + innovations[i]
+    return noise
+
+
+def daily_weather(dates: pd.DatetimeIndex, rng: np.random.Generator) -> pd.DataFrame:
+    """generate daily weather with the columns of the DWD archives.
+
+    Args:
+        dates (pd.DatetimeIndex): days to generate
+        rng (np.random.Generator): random number generator
+
+    Returns:
+        pd.DataFrame: one row per day with the columns of DWD_COLUMN_NAMES2DESCRIPTION
+            (except for STATIONS_ID), MESS_DATUM as YYYYMMDD integers
+    """
+
+    n = len(dates)
+    # -1 in mid January, 1 in mid July
+    season = -np.cos(2 * np.pi * (dates.dayofyear.to_numpy() - 15) / 365.25)
+
+    mean_temperature = 10.5 + 8.5 * season + _autocorrelated_noise(rng, n, 3)
+    rainy = rng.random(n) < 0.5 - 0.1 * season
+    snowy = rainy & (mean_temperature < -1)
+    precipitation = np.where(rainy, rng.exponential(4, n), 0)
+    cloud_cover = np.clip(5 - 1.5 * season + 2 * rainy + rng.normal(0, 1.5, n), 0, 8)
+    day_length = 12.3 + 4.1 * season
+    sunshine = day_length * (1 - cloud_cover / 8) * rng.uniform(0.6, 1, n)
+    humidity = np.clip(78 - 8 * season + 8 * rainy + rng.normal(0, 6, n), 30, 100)
+    mean_wind_speed = rng.gamma(4, 0.9, n)
+
+    return pd.DataFrame(
+        {
+            "MESS_DATUM": dates.strftime("%Y%m%d").astype(int),
+            "QN_3": 10,
+            "FX": mean_wind_speed * rng.uniform(2, 3, n),
+            "FM": mean_wind_speed,
+            "QN_4": 3,
+            "RSK": precipitation,
+            "RSKF": np.where(rainy, np.where(mean_temperature < 0, 7, 6), 0),
+            "SDK": sunshine,
+            "SHK_TAG": np.where(snowy, rng.integers(1, 8, n), 0),
+            "NM": cloud_cover,
+            "VPM": humidity
+            / 100
+            * 6.1
+            * np.exp(17.6 * mean_temperature / (mean_temperature + 243)),
+            "PM": 1003 + _autocorrelated_noise(rng, n, 8),
+            "TMK": mean_temperature,
+            "UPM": humidity,
+            "TXK": mean_temperature + rng.uniform(3, 7, n),
+            "TNK": mean_temperature - rng.uniform(3, 7, n),
+            "TGK": mean_temperature - rng.uniform(4, 9, n),
+        }
+    ).round(1)
+
+
+def _station_weather(
+    weather_df: pd.DataFrame, station_id: str, rng: np.random.Generator
+) -> pd.DataFrame:
+    # the stations are close to each other, so their weather differs only a little
+    n = len(weather_df)
+    df = weather_df.copy()
+    df["TMK"] += rng.normal(0, 0.5, n)
+    df["RSK"] *= rng.uniform(0.7, 1.3, n)
+    df["SDK"] = (df.SDK + rng.normal(0, 0.5, n)).clip(lower=0)
+
+    for column in DWD_MISSING_COLUMNS[station_id]:
+        df[column] = -999
+    df.insert(0, "STATIONS_ID", int(station_id))
+
+    return df.round(1)
+
+
+def write_dwd_archive(path: Union[str, PathLike], station_df: pd.DataFrame):
+    """write the weather data of one station as DWD OpenData zip archive.
+
+    Args:
+        path (str | PathLike): zip file to write
+        station_df (pd.DataFrame): weather data with the original DWD column names
+    """
+
+    station_id = f"{station_df.STATIONS_ID.iloc[0]:05d}"
+    period = f"{station_df.MESS_DATUM.iloc[0]}_{station_df.MESS_DATUM.iloc[-1]}"
+
+    # the column names are padded with whitespace like in the original files and each
+    # row ends with an end of record marker
+    header = [name if len(name) > 3 else f"{name:>4}" for name in station_df.columns]
+    data = station_df.assign(eor="eor").to_csv(
+        sep=";", header=header + ["eor"], index=False
+    )
+
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr(
+            f"Metadaten_Geographie_{station_id}.txt",
+            f"Stations_id;Stationsname\n{int(station_id)};{DWD_STATIONS[station_id]}\n",
+        )
+        archive.writestr(f"produkt_klima_tag_{period}_{station_id}.txt", data)
+
+
+def write_weather(dwd_dir: Union[str, PathLike], weather_df: pd.DataFrame, seed: int):
+    """write the current and historical DWD archive of each station in DWD_STATIONS.
+
+    The historical archive ends half a year before the last date, the current archive
+    covers the last one and a half years (or all data, if there is less).
+
+    Args:
+        dwd_dir (str | PathLike): directory of the archives
+        weather_df (pd.DataFrame): weather data, see `daily_weather`
+        seed (int): seed of the station specific noise
+    """
+
+    dwd_dir = Path(dwd_dir)
+    dwd_dir.mkdir(parents=True, exist_ok=True)
+
+    for i, station_id in enumerate(DWD_STATIONS):
+        station_df = _station_weather(
+            weather_df, station_id, np.random.default_rng([seed, i])
+        )
+        historical_df = station_df.iloc[: max(len(station_df) - 183, 1)]
+        current_df = station_df.iloc[-548:]
+
+        period = DWD_HISTORICAL_PERIODS[station_id]
+        write_dwd_archive(dwd_dir / f"tageswerte_KL_{station_id}_akt.zip", current_df)
+        write_dwd_archive(
+            dwd_dir / f"tageswerte_KL_{station_id}_{period}_hist.zip", historical_df
+        )
+
+
+def day_factors(
+    dates: pd.DatetimeIndex, weather_df: pd.DataFrame, holiday_dates: pd.DatetimeIndex
+) -> np.ndarray:
+    """how busy the park is on each day, relative to a dry and mild working day.
+
+    Args:
+        dates (pd.DatetimeIndex): days
+        weather_df (pd.DataFrame): weather of the days, see `daily_weather`
+        holiday_dates (pd.DatetimeIndex): days that are public or school holidays in
+            NRW
+
+    Returns:
+        np.ndarray: factor of the waiting times of each day
+    """
+
+    weather = weather_df.set_index(
+        pd.to_datetime(weather_df.MESS_DATUM.astype(str), format="%Y%m%d")
+    ).reindex(dates)
+
+    factors = np.where(dates.dayofweek >= 5, 1.5, 1.0)
+    factors *= np.where(dates.isin(holiday_dates), 1.4, 1.0)
+    factors *= np.clip(1 + 0.02 * (weather.TMK.to_numpy() - 15), 0.7, 1.2)
+    factors *= np.where(weather.RSK.to_numpy() > 5, 0.7, 1.0)
+    factors *= 1 + 0.02 * weather.SDK.to_numpy()
+
+    return factors
+
+
+def waiting_time_chunks(
+    attractions: List[str],
+    years: List[int],
+    interval: int,
+    weather_df: pd.DataFrame,
+    holiday_dates: pd.DatetimeIndex,
+    rng: np.random.Generator,
+) -> Iterator[pd.DataFrame]:
+    """generate the raw waiting times, one chunk per month.
+
+    Args:
+        attractions (List[str]): names of the attractions
+        years (List[int]): years to generate
+        interval (int): seconds between two datapoints of an attraction
+        weather_df (pd.DataFrame): weather of all days, see `daily_weather`
+        holiday_dates (pd.DatetimeIndex): days that are public or school holidays in
+            NRW
+        rng (np.random.Generator): random number generator
+
+    Yields:
+        pd.DataFrame: datapoints of one month in the format of
+            `download_waiting_times.iter_flat_chunks` (ids consecutive across chunks),
+            ordered by attraction and time
+    """
+
+    opening, closing = (hour * 3600 for hour in OPENING_HOURS)
+    sample_seconds = np.arange(opening - 1800, closing + 1800, interval)
+    opened = (sample_seconds >= opening) & (sample_seconds < closing)
+    # busiest in the early afternoon
+    hours = sample_seconds / 3600
+    day_profile = 0.4 + 0.6 * np.exp(-(((hours - 14) / 3) ** 2))
+
+    # each attraction has its own popularity
+    popularity = np.clip(rng.lognormal(np.log(20), 0.6, len(attractions)), 5, 90)
+
+    start = 0
+    for year in years:
+        for month in WARTEZEITEN_APP_MONTHS:
+            month_number = _MONTH_NUMBERS[month]
+            dates = pd.date_range(
+                f"{year}-{month_number:02d}-01",
+                periods=calendar.monthrange(year, month_number)[1],
+            )
+            factors = day_factors(dates, weather_df, holiday_dates)
+
+            # shape (attraction, day, sample)
+            shape = (len(attractions), len(dates), len(sample_seconds))
+            mean_waiting_time = (
+                popularity[:, None, None]
+                * factors[None, :, None]
+                * day_profile[None, None, :]
+            )
+            waiting_time = 5 * np.round(
+                mean_waiting_time * rng.lognormal(0, 0.25, shape) / 5
+            )
+            # attractions are sometimes closed for a whole day
+            is_open = opened[None, None, :] & (
+                rng.random(shape[:2]) >= 0.03
+            )[:, :, None]
+            waiting_time = np.where(is_open, waiting_time, -3).astype(np.int16)
+
+            jitter = rng.integers(0, min(interval, 60), shape)
+            seconds = (sample_seconds[None, None, :] + jitter).ravel()
+            day_dates = np.broadcast_to(
+                dates.to_numpy().astype("datetime64[D]")[None, :, None], shape
+            ).ravel()
+
+            n = waiting_time.size
+            yield pd.DataFrame(
+                {
+                    "attraction": pd.Categorical(
+                        np.repeat(attractions, n // len(attractions))
+                    ),
+                    "month": month,
+                    "year": str(year),
+                    "datum": format_dates(day_dates) + " " + format_times(seconds),
+                    "wartezeit": waiting_time.ravel(),
+                    "status": pd.Categorical.from_codes(
+                        is_open.ravel().astype(np.int8), ["closed", "opened"]
+                    ),
+                },
+                index=pd.RangeIndex(start, start + n, name="id"),
+            )
+            start += n
+
+
+def generate_raw_data(
+    output_dir: Union[str, PathLike],
+    n_attractions: int = len(WARTEZEITEN_APP_ATTRACTIONS),
+    first_year: int = 2019,
+    n_years: int = 3,
+    interval: int = 300,
+    seed: int = 42,
+) -> Dict[str, Path]:
+    """generate all raw data files in `output_dir`/raw, see this module's docstring.
+
+    Args:
+        output_dir (str | PathLike): data directory
+        n_attractions (int): number of attractions. Defaults to all attractions of
+            WARTEZEITEN_APP_ATTRACTIONS.
+        first_year (int): first year of the data. Defaults to 2019.
+        n_years (int): number of years. Defaults to 3.
+        interval (int): seconds between two waiting time datapoints of an attraction.
+            Defaults to 300.
+        seed (int): seed of the random number generator. Defaults to 42.
+
+    Raises:
+        ValueError: unknown number of attractions or data before DWD_MIN_DATE
+
+    Returns:
+        Dict[str, Path]: paths of the written files
+    """
+
+    if not 1 <= n_attractions <= len(WARTEZEITEN_APP_ATTRACTIONS):
+        raise ValueError(
+            f"{n_attractions=} must be between 1 and {len(WARTEZEITEN_APP_ATTRACTIONS)}"
+        )
+    if datetime.date(first_year, 1, 1).isoformat() < DWD_MIN_DATE:
+        raise ValueError(f"{first_year=} must not be before {DWD_MIN_DATE}")
+
+    raw_dir = Path(output_dir) / "raw"
+    raw_dir.mkdir(parents=True, exist_ok=True)
+    # the processed data is written next to the raw data
+    for directory in ["interim", "processed"]:
+        (Path(output_dir) / directory).mkdir(exist_ok=True)
+
+    paths = {
+        "waiting_times": raw_dir / "wartezeiten_app.csv",
+        "public_holidays": raw_dir / "Feiertage Deutschland.ics",
+        "school_holidays": raw_dir / "schulferien.txt",
+        "weather": raw_dir / "dwd_weather",
+    }
+
+    years = list(range(first_year, first_year + n_years))
+    rng = np.random.default_rng(seed)
+
+    write_public_holidays(paths["public_holidays"], years)
+    write_school_holidays(paths["school_holidays"], years)
+    logging.info("Generated holidays")
+
+    weather_df = daily_weather(
+        pd.date_range(f"{years[0]}-01-01", f"{years[-1]}-12-31"), rng
+    )
+    write_weather(paths["weather"], weather_df, seed)
+    logging.info("Generated weather data")
+
+    nrw_index = list(STATE_FULL2ISO.values()).index("NW")
+    holiday_dates = pd.DatetimeIndex(
+        [
+            date
+            for year in years
+            for date, _, location in public_holidays(year)
+            if location == _ALL_STATES or "NW" in location
+        ]
+    )
+    for year in years:
+        for intervals in school_holidays(year, nrw_index):
+            for start, end in intervals:
+                holiday_dates = holiday_dates.union(pd.date_range(start, end))
+
+    attractions = list(WARTEZEITEN_APP_ATTRACTIONS)[:n_attractions]
+    chunks = waiting_time_chunks(
+        attractions, years, interval, weather_df, holiday_dates, rng
+    )
+    for i, chunk in enumerate(chunks):
+        chunk.to_csv(
+            paths["waiting_times"], mode="w" if i == 0 else "a", header=i == 0
+        )
+    logging.info(f"Generated {chunk.index[-1] + 1} waiting time datapoints")
+
+    return paths
+
+
+@click.command(help=__doc__)
+@click.argument("output_dir", type=click.Path(file_okay=False))
+@click.option(
+    "--attractions",
+    "n_attractions",
+    default=len(WARTEZEITEN_APP_ATTRACTIONS),
+    type=click.IntRange(1, len(WARTEZEITEN_APP_ATTRACTIONS)),
+    help="number of attractions, defaults to all",
+)
+@click.option(
+    "--first-year",
+    default=2019,
+    type=click.IntRange(min=int(DWD_MIN_DATE[:4])),
+    help="first year of the data",
+)
+@click.option(
+    "--years", "n_years", default=3, type=click.IntRange(min=1), help="number of years"
+)
+@click.option(
+    "--interval",
+    default=300,
+    type=click.IntRange(min=1),
+    help="seconds between two waiting time datapoints of an attraction",
+)
+@click.option("--seed", default=42, type=int, help="seed of the random numbers")
+def main(
+    output_dir: str,
+    n_attractions: int,
+    first_year: int,
+    n_years: int,
+    interval: int,
+    seed: int,
+):
+    logging.basicConfig(format=LOGGING_FORMAT_STR, level=logging.INFO)
+
+    generate_raw_data(output_dir, n_attractions, first_year, n_years, interval, seed)
+
+
+if __name__ == "__main__":
+
+    main()
@@ -0,0 +1,664 @@
+"""
+Project: Phantasialand
+State: 10/2026
+
+Run the data processing scripts of `src/data` that are out of date.
+
+Each script is a node of the pipeline (see NODES) with its command line arguments, input
+files and output files. A node is stale if one of its outputs is missing or if the
+fingerprint of its inputs, code and arguments changed since its last successful run.
+The code of a node is its script and all modules of `src` it imports (directly or
+indirectly). Nodes run in the order of their dependencies, only the stale ones (and
+those given with `--force`) are run. If a node produces the same outputs as before, the
+nodes depending on it stay up to date.
+
+Independent nodes run in parallel, each in its own process, limited by `--jobs`
+(defaults to the number of cores) and by the estimated memory of the nodes, which must
+fit into `--max-memory` (defaults to the available memory).
+
+The fingerprints are stored in STATE_PATH after each node. The sha256 of each hashed
+file is stored as well, together with its modification time and size, so unchanged
+files are not hashed again.
+
+NODES can be given to only run these nodes and the nodes they depend on. At the end, a
+summary with the status and runtime of each node is printed.
+"""
+
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from pathlib import Path
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
+import ast
+import functools
+import hashlib
+import json
+import logging
+import os
+import subprocess
+import sys
+import time
+
+import click
+import psutil
+
+from src.data.constants import DATA_PATH, DWD_ARCHIVE_PATH, LOGGING_FORMAT_STR
+
+# directory containing the `src` package
+ROOT_PATH = Path(__file__).resolve().parent.parent.parent
+
+STATE_PATH = DATA_PATH / "interim/pipeline.state.json"
+
+# DATA_PATH relative to ROOT_PATH, "data" unless it is moved (see `constants.py`)
+_DATA = Path(os.path.relpath(DATA_PATH, ROOT_PATH)).as_posix()
+
+_DWD_PATH = Path(os.path.relpath(DWD_ARCHIVE_PATH, ROOT_PATH)).as_posix()
+
+# DWD ids of the weather stations and the prefix of their columns in the weather table
+_WEATHER_STATIONS = {"01327": "lommersum_", "02667": "koelnbonn_"}
+
+
+def _station_archives(station_id: str) -> List[str]:
+    """current and historical DWD archive of a weather station, relative to ROOT_PATH.
+
+    The name of the historical archive contains the period it covers and changes when
+    the DWD publishes a new one (see `download_weather.py`), so the newest archive in
+    the directory is used. If there is none, the returned pattern is reported as missing
+    input.
+    """
+
+    pattern = f"tageswerte_KL_{station_id}_*_hist.zip"
+    names = sorted(path.name for path in DWD_ARCHIVE_PATH.glob(pattern))
+    # the end date is part of the file name, so the newest file sorts last
+    historical_name = names[-1] if names else pattern
+
+    return [
+        f"{_DWD_PATH}/tageswerte_KL_{station_id}_akt.zip",
+        f"{_DWD_PATH}/{historical_name}",
+    ]
+
+
+class Node(NamedTuple):
+    name: str
+    # path of the script, relative to ROOT_PATH
+    script: str
+    args: List[str]
+    # paths relative to ROOT_PATH
+    inputs: List[str]
+    outputs: List[str]
+    # estimated peak memory of the script in MB
+    memory: float = 500
+
+
+NODES = [
+    Node(
+        name="weather",
+        script="src/data/process_weather_stations.py",
+        args=[
+            f"{_DATA}/interim/weather.csv",
+            *(
+                arg
+                for station_id, prefix in _WEATHER_STATIONS.items()
+                for arg in ["-s", prefix, *_station_archives(station_id)]
+            ),
+            "--cache-dir",
+            f"{_DATA}/interim/dwd_parsed",
+        ],
+        inputs=[
+            path
+            for station_id in _WEATHER_STATIONS
+            for path in _station_archives(station_id)
+        ],
+        outputs=[f"{_DATA}/interim/weather.csv"],
+    ),
+    Node(
+        name="public_holidays",
+        script="src/data/process_public_holidays.py",
+        args=[
+            f"{_DATA}/raw/Feiertage Deutschland.ics",
+            f"{_DATA}/processed/public_holidays.csv",
+            "--first-year",
+            "2019",
+        ],
+        inputs=[f"{_DATA}/raw/Feiertage Deutschland.ics"],
+        outputs=[f"{_DATA}/processed/public_holidays.csv"],
+    ),
+    Node(
+        name="school_holidays",
+        script="src/data/process_school_holidays.py",
+        args=[f"{_DATA}/raw/schulferien.txt", f"{_DATA}/processed/school_holidays.csv"],
+        inputs=[f"{_DATA}/raw/schulferien.txt"],
+        outputs=[f"{_DATA}/processed/school_holidays.csv"],
+    ),
+    Node(
+        name="waiting_times",
+        script="src/data/process_waiting_times.py",
+        args=[
+            f"{_DATA}/raw/wartezeiten_app.csv",
+            f"{_DATA}/interim/waiting_times_training.csv",
+            "--exploration",
+            f"{_DATA}/interim/waiting_times_exploration.parquet",
+            "--compact-exploration",
+            "--incremental",
+        ],
+        inputs=[f"{_DATA}/raw/wartezeiten_app.csv"],
+        outputs=[
+            f"{_DATA}/interim/waiting_times_training.csv",
+            f"{_DATA}/interim/waiting_times_exploration.parquet",
+        ],
+        memory=2000,
+    ),
+    Node(
+        name="training_data",
+        script="src/data/create_training_data.py",
+        args=[f"{_DATA}/processed/"],
+        inputs=[
+            f"{_DATA}/interim/waiting_times_training.csv",
+            f"{_DATA}/interim/weather.csv",
+        ],
+        outputs=[
+            f"{_DATA}/processed/all_datapoints.csv",
+            f"{_DATA}/processed/split_manifest.json",
+        ],
+        memory=1000,
+    ),
+]
+
+
+def code_files(script: Path, root: Path = ROOT_PATH) -> List[Path]:
+    """find the script and all modules of the `src` package it imports, directly or
+    indirectly.
+
+    Args:
+        script (Path): path of the script
+        root (Path): directory containing the `src` package. Defaults to ROOT_PATH.
+
+    Returns:
+        List[Path]: sorted paths of the script and the imported modules
+    """
+
+    found: Set[Path] = set()
+    pending = [Path(script)]
+
+    while pending:
+        path = pending.pop()
+        if path in found:
+            continue
+        found.add(path)
+
+        for node in ast.walk(ast.parse(path.read_text(), filename=str(path))):
+            if isinstance(node, ast.Import):
+                modules = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+                modules = [node.module]
+            else:
+                continue
+
+            for module in modules:
+                if module.split(".")[0] != "src":
+                    continue
+                module_path = root.joinpath(*module.split("."))
+                for candidate in [
+                    module_path.with_suffix(".py"),
+                    module_path / "__init__.py",
+                ]:
+                    if candidate.exists():
+                        pending.append(candidate)
+
+    return sorted(found)
+
+
+class FileHasher:
+    """sha256 of files, memoized by path, modification time and size.
+
+    Args:
+        memo (Dict[str, list]): memo of a previous run, path -> [mtime_ns, size,
+            sha256]. Optional.
+    """
+
+    def __init__(self, memo: Optional[Dict[str, list]] = None):
+        self.memo = dict(memo or {})
+
+    def __call__(self, path: Path) -> str:
+        stat = path.stat()
+        key = str(path)
+
+        memoized = self.memo.get(key)
+        if memoized and memoized[:2] == [stat.st_mtime_ns, stat.st_size]:
+            return memoized[2]
+
+        sha256 = hashlib.sha256()
+        with open(path, "rb") as fp:
+            for block in iter(lambda: fp.read(2**20), b""):
+                sha256.update(block)
+
+        self.memo[key] = [stat.st_mtime_ns, stat.st_size, sha256.hexdigest()]
+        return self.memo[key][2]
+
+
+def fingerprint(node: Node, hasher: FileHasher, root: Path = ROOT_PATH) -> str:
+    """fingerprint of the inputs, code and arguments of a node.
+
+    Args:
+        node (Node): pipeline node
+        hasher (FileHasher): hashes the files
+        root (Path): directory the paths of the node are relative to. Defaults to
+            ROOT_PATH.
+
+    Raises:
+        FileNotFoundError: an input of the node does not exist
+
+    Returns:
+        str: sha256 hex digest
+    """
+
+    parts = {
+        "args": node.args,
+        "inputs": {path: hasher(root / path) for path in node.inputs},
+        "code": {
+            str(path.relative_to(root)): hasher(path)
+            for path in code_files(root / node.script, root)
+        },
+    }
+
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode()).hexdigest()
+
+
+def sort_nodes(nodes: Iterable[Node]) -> List[Node]:
+    """order the nodes so that each node comes after the nodes producing its inputs.
+
+    Raises:
+        ValueError: duplicate node names or outputs, or cyclic dependencies
+
+    Returns:
+        List[Node]: nodes in a valid execution order (stable for independent nodes)
+    """
+
+    nodes = list(nodes)
+    producers = {}
+    for node in nodes:
+        for output in node.outputs:
+            if output in producers:
+                raise ValueError(f"{output} is produced by several nodes")
+            producers[output] = node.name
+
+    if len({node.name for node in nodes}) != len(nodes):
+        raise ValueError("node names must be unique")
+
+    done: List[Node] = []
+    remaining = nodes
+    while remaining:
+        done_names = {node.name for node in done}
+        ready = [
+            node
+            for node in remaining
+            if all(
+                producers.get(path, node.name) in done_names | {node.name}
+                for path in node.inputs
+            )
+        ]
+        if not ready:
+            raise ValueError(
+                f"cyclic dependencies between {[node.name for node in remaining]}"
+            )
+        done += ready
+        remaining = [node for node in remaining if node not in ready]
+
+    return done
+
+
+def upstream_nodes(nodes: List[Node], targets: Iterable[str]) -> List[Node]:
+    """select the target nodes and all nodes they depend on.
+
+    Raises:
+        ValueError: unknown target
+
+    Returns:
+        List[Node]: selected nodes, in the order of `nodes`
+    """
+
+    by_name = {node.name: node for node in nodes}
+    producers = {output: node.name for node in nodes for output in node.outputs}
+
+    unknown = set(targets) - by_name.keys()
+    if unknown:
+        raise ValueError(f"unknown nodes {sorted(unknown)}, use {list(by_name)}")
+
+    selected: Set[str] = set()
+    pending = list(targets)
+    while pending:
+        name = pending.pop()
+        if name in selected:
+            continue
+        selected.add(name)
+        pending += [
+            producers[path] for path in by_name[name].inputs if path in producers
+        ]
+
+    return [node for node in nodes if node.name in selected]
+
+
+def _load_state(state_path: Path) -> dict:
+    if state_path.exists():
+        return json.loads(state_path.read_text())
+    return {"nodes": {}, "files": {}}
+
+
+def _write_state(state_path: Path, state: dict):
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = f"{state_path}.tmp"
+    Path(tmp_path).write_text(json.dumps(state, indent=2, sort_keys=True))
+    os.replace(tmp_path, state_path)
+
+
+def _run_script(node: Node, root: Path):
+    subprocess.run([sys.executable, node.script, *node.args], cwd=root, check=True)
+
+
+def default_memory_budget() -> float:
+    """memory available for the nodes in MB: the currently available system memory."""
+
+    return psutil.virtual_memory().available / 2**20
+
+
+def _check_node(
+    node: Node,
+    state: dict,
+    hasher: FileHasher,
+    stale_outputs: Set[str],
+    force: bool,
+    dry_run: bool,
+    root: Path,
+) -> Tuple[Optional[str], Optional[str]]:
+    """check whether a node needs to run.
+
+    Args:
+        node (Node): node to check, all nodes it depends on must be finished
+        state (dict): fingerprints of the last successful runs
+        hasher (FileHasher): hashes the files of the fingerprint
+        stale_outputs (Set[str]): outputs of the nodes found stale (or missing inputs)
+            in a dry run, updated with the outputs of `node`
+        force (bool): the node is stale even if it is up to date
+        dry_run (bool): the node is not going to run
+        root (Path): directory the paths of the node are relative to
+
+    Raises:
+        FileNotFoundError: an input of the node does not exist (except in a dry run)
+
+    Returns:
+        Optional[str]: status if the node does not need to run, None otherwise
+        Optional[str]: fingerprint of the node, None if it could not be computed
+    """
+
+    missing = [
+        path
+        for path in node.inputs
+        if path not in stale_outputs and not (root / path).exists()
+    ]
+    if missing and not dry_run:
+        raise FileNotFoundError(f"missing inputs of {node.name}: {missing}")
+
+    node_fingerprint = None
+    if not (missing or stale_outputs.intersection(node.inputs)):
+        node_fingerprint = fingerprint(node, hasher, root)
+
+    stale = (
+        force
+        or node_fingerprint is None
+        or state["nodes"].get(node.name) != node_fingerprint
+        or not all((root / path).exists() for path in node.outputs)
+    )
+
+    if missing:
+        stale_outputs.update(node.outputs)
+        return "missing input", None
+    if not stale:
+        return "up to date", node_fingerprint
+    if dry_run:
+        stale_outputs.update(node.outputs)
+        return "stale", None
+    return None, node_fingerprint
+
+
+def _next_node(
+    pending: List[Node],
+    dependencies: Dict[str, Set[str]],
+    finished: Set[str],
+    running: Dict[Future, Node],
+    jobs: int,
+    max_memory: float,
+) -> Optional[Node]:
+    # first pending node that can start now, see `run_pipeline` for the limits
+    if len(running) >= jobs:
+        return None
+
+    used_memory = sum(node.memory for node in running.values())
+    for node in pending:
+        if dependencies[node.name] <= finished and (
+            not running or used_memory + node.memory <= max_memory
+        ):
+            return node
+
+    return None
+
+
+def _schedule(
+    executor: Executor,
+    pending: List[Node],
+    dependencies: Dict[str, Set[str]],
+    jobs: int,
+    max_memory: float,
+    start: Callable[[Node], Optional[Callable[[], None]]],
+) -> Iterator[Tuple[Node, Future]]:
+    """start the pending nodes on `executor` once the nodes they depend on finished,
+    with at most `jobs` nodes and `max_memory` MB of estimated memory at once.
+
+    Args:
+        executor (Executor): runs the jobs of the nodes
+        pending (List[Node]): nodes in the order of their dependencies, removed once
+            they are started
+        dependencies (Dict[str, Set[str]]): names of the nodes each node depends on
+        jobs (int): maximum number of nodes running at once
+        max_memory (float): memory budget in MB
+        start (Callable[[Node], Optional[Callable[[], None]]]): called when a node can
+            start, returns its job or None if the node does not need to run
+
+    Yields:
+        Tuple[Node, Future]: each node that ran and the future of its job, once it is
+            completed. No further nodes are started after a job failed.
+    """
+
+    finished: Set[str] = set()
+    running: Dict[Future, Node] = {}
+    failed = False
+
+    while pending or running:
+        while not failed:
+            node = _next_node(
+                pending, dependencies, finished, running, jobs, max_memory
+            )
+            if node is None:
+                break
+            pending.remove(node)
+            job = start(node)
+            if job is None:
+                finished.add(node.name)
+            else:
+                running[executor.submit(job)] = node
+
+        if not running:
+            break
+
+        done, _ = wait(running, return_when=FIRST_COMPLETED)
+        for future in done:
+            node = running.pop(future)
+            if future.exception() is None:
+                finished.add(node.name)
+            else:
+                failed = True
+            yield node, future
+
+
+def run_pipeline(
+    nodes: List[Node] = NODES,
+    targets: Optional[Iterable[str]] = None,
+    force: bool = False,
+    dry_run: bool = False,
+    jobs: Optional[int] = None,
+    max_memory: Optional[float] = None,
+    state_path: Path = STATE_PATH,
+    root: Path = ROOT_PATH,
+    run_script=_run_script,
+) -> List[Tuple[str, str, float]]:
+    """run the stale nodes of the pipeline in the order of their dependencies.
+
+    Independent nodes run in parallel, each script in its own process. A node is
+    started once all nodes producing its inputs finished, at most `jobs` nodes run at
+    once and the estimated memory (`Node.memory`) of the running nodes stays below
+    `max_memory`. A node exceeding `max_memory` on its own only runs alone.
+
+    Args:
+        nodes (List[Node]): pipeline nodes. Defaults to NODES.
+        targets (Iterable[str]): only run these nodes and the nodes they depend on.
+            Defaults to all nodes.
+        force (bool): run the selected nodes even if they are up to date. Defaults to
+            False.
+        dry_run (bool): only report which nodes are stale. Defaults to False.
+        jobs (int): maximum number of nodes running at once. Defaults to the number of
+            cores.
+        max_memory (float): memory budget in MB. Defaults to the available memory
+            (see `default_memory_budget`).
+        state_path (Path): where to store the fingerprints. Defaults to STATE_PATH.
+        root (Path): directory the paths of the nodes are relative to. Defaults to
+            ROOT_PATH.
+        run_script (Callable[[Node, Path], None]): runs the script of a node. Defaults
+            to running it in a python subprocess.
+
+    Raises:
+        FileNotFoundError: an input of a node does not exist (except in a dry run)
+        subprocess.CalledProcessError: a script failed. No further nodes are started,
+            the running ones are completed and all finished nodes are recorded in the
+            state.
+
+    Returns:
+        List[Tuple[str, str, float]]: name, status ("ran", "up to date", or "stale" and
+        "missing input" in a dry run) and runtime in seconds of each selected node
+    """
+
+    nodes = sort_nodes(nodes)
+    if targets:
+        nodes = upstream_nodes(nodes, targets)
+
+    jobs = jobs or os.cpu_count() or 1
+    max_memory = max_memory if max_memory is not None else default_memory_budget()
+
+    producers = {output: node.name for node in nodes for output in node.outputs}
+    dependencies = {
+        node.name: {producers[path] for path in node.inputs if path in producers}
+        for node in nodes
+    }
+
+    state = _load_state(state_path)
+    hasher = FileHasher(state["files"])
+    results: Dict[str, Tuple[str, float]] = {}
+    # outputs of the nodes found stale in a dry run
+    stale_outputs: Set[str] = set()
+    # start time and fingerprint of the nodes that run
+    started: Dict[str, Tuple[float, Optional[str]]] = {}
+
+    def start(node: Node) -> Optional[Callable[[], None]]:
+        start_time = time.perf_counter()
+        status, node_fingerprint = _check_node(
+            node, state, hasher, stale_outputs, force, dry_run, root
+        )
+        if status is not None:
+            results[node.name] = (status, time.perf_counter() - start_time)
+            return None
+
+        logging.info(f"Running {node.name}: {node.script}")
+        started[node.name] = (start_time, node_fingerprint)
+        return functools.partial(run_script, node, root)
+
+    error: Optional[BaseException] = None
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        for node, future in _schedule(
+            executor, list(nodes), dependencies, jobs, max_memory, start
+        ):
+            if future.exception() is not None:
+                logging.error(f"{node.name} failed: {future.exception()}")
+                error = error or future.exception()
+                continue
+
+            start_time, node_fingerprint = started[node.name]
+            logging.info(f"Finished {node.name}")
+            results[node.name] = ("ran", time.perf_counter() - start_time)
+            state["nodes"][node.name] = node_fingerprint
+            state["files"] = hasher.memo
+            _write_state(state_path, state)
+
+    if not dry_run:
+        state["files"] = hasher.memo
+        _write_state(state_path, state)
+
+    if error is not None:
+        raise error
+
+    return [(node.name, *results[node.name]) for node in nodes]
+
+
+@click.command(help=__doc__)
+@click.argument("targets", nargs=-1)
+@click.option(
+    "--force", is_flag=True, help="run the selected nodes even if they are up to date"
+)
+@click.option("--dry-run", is_flag=True, help="only list the stale nodes")
+@click.option(
+    "-j",
+    "--jobs",
+    default=None,
+    type=click.IntRange(min=1),
+    help="maximum number of nodes running at once, defaults to the number of cores",
+)
+@click.option(
+    "--max-memory",
+    default=None,
+    type=click.FloatRange(min=0),
+    help="memory budget of the running nodes in MB, defaults to the available memory",
+)
+def main(
+    targets: Tuple[str],
+    force: bool,
+    dry_run: bool,
+    jobs: Optional[int],
+    max_memory: Optional[float],
+):
+    logging.basicConfig(format=LOGGING_FORMAT_STR, level=logging.INFO)
+
+    start = time.perf_counter()
+    summary = run_pipeline(NODES, targets, force, dry_run, jobs, max_memory)
+
+    print(f"\n{'node':<18}{'status':<15}{'seconds':>8}")
+    for name, status, seconds in summary:
+        print(f"{name:<18}{status:<15}{seconds:>8.2f}")
+    print(f"{'sum':<33}{sum(seconds for _, _, seconds in summary):>8.2f}")
+    print(f"{'wall clock':<33}{time.perf_counter() - start:>8.2f}")
+
+
+if __name__ == "__main__":
+
+    main()
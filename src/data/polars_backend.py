@@ -0,0 +1,272 @@
+"""
+Project: Phantasialand
+State: 10/2026
+
+Polars implementation of the transformations of `process_waiting_times.py` and the
+weather join of `create_training_data.py`, used with `--backend polars`.
+
+The transformations are built as lazy query plans, so Polars reads only the needed
+columns, runs the parsing, the half-hour group-by and the joins on all cores and shares
+the parsing between the exploration and the training output. The results are
+converted to pandas and written with `src/data/storage.py`, so the output files are
+identical to those of the pandas implementation.
+
+Polars is an optional dependency (see `requirements_dev.txt`), this module is only
+imported when the backend is selected.
+"""
+
+from os import PathLike
+from typing import Optional, Union
+
+import pandas as pd
+import polars as pl
+
+from src.data.process_waiting_times import assert_waiting_time_state_consistency
+from src.data.slots import SLOT_SECONDS
+from src.data.storage import write_dataset
+
+_DAY_SECONDS = 24 * 60 * 60
+
+
+def scan_waiting_times(input_path: Union[str, PathLike]) -> pl.LazyFrame:
+    """lazily parse the raw waiting time csv into the form of
+    `process_waiting_times.parse_waiting_times`.
+
+    The following columns are present in the output:
+    - id (int): unique id for each datapoint
+    - attraction (str): name of the attraction
+    - waiting_time (int): waiting time in minutes (or negative if closed)
+    - date (date): day of the datapoint
+    - second (int32): seconds since midnight
+
+    Args:
+        input_path (str | PathLike): raw waiting time csv
+
+    Returns:
+        pl.LazyFrame: query plan of the parsed waiting time data
+    """
+
+    timestamp = pl.col("datum").str.strptime(pl.Datetime, "%Y-%m-%d %H:%M:%S")
+
+    return pl.scan_csv(input_path).select(
+        [
+            pl.col("id"),
+            pl.col("attraction"),
+            pl.col("wartezeit").alias("waiting_time"),
+            timestamp.dt.date().alias("date"),
+            (
+                timestamp.dt.hour().cast(pl.Int32) * 3600
+                + timestamp.dt.minute().cast(pl.Int32) * 60
+                + timestamp.dt.second().cast(pl.Int32)
+            ).alias("second"),
+        ]
+    )
+
+
+def count_state_violations(input_path: Union[str, PathLike]) -> int:
+    """count the datapoints of the raw waiting time csv that violate the rules checked
+    by `assert_waiting_time_state_consistency`.
+
+    Args:
+        input_path (str | PathLike): raw waiting time csv
+
+    Returns:
+        int: number of violating datapoints
+    """
+
+    nonnegative = pl.col("wartezeit") >= 0
+
+    return (
+        pl.scan_csv(input_path)
+        .filter(
+            (nonnegative & (pl.col("status") != "opened"))
+            | (~nonnegative & (pl.col("status") != "closed"))
+        )
+        .select(pl.len())
+        .collect()
+        .item()
+    )
+
+
+def round_seconds(seconds: pl.Expr, interval: int) -> pl.Expr:
+    """`process_waiting_times.round_seconds` as Polars expression."""
+
+    quotient = seconds // interval
+    remainder = seconds % interval
+    round_up = (2 * remainder > interval) | (
+        (2 * remainder == interval) & (quotient % 2 == 1)
+    )
+
+    return (quotient + round_up.cast(pl.Int32)) * interval
+
+
+def format_times(seconds: pl.Expr) -> pl.Expr:
+    """`dates.format_times` as Polars expression."""
+
+    nanoseconds = (seconds % _DAY_SECONDS).cast(pl.Int64) * 1_000_000_000
+
+    return nanoseconds.cast(pl.Time).dt.strftime("%H:%M:%S")
+
+
+def exploration_plan(parsed: pl.LazyFrame, compact: bool = False) -> pl.LazyFrame:
+    """`process_waiting_times.exploration_from_parsed` (or, if `compact`,
+    `compact_exploration_from_parsed`) as query plan on the output of
+    `scan_waiting_times`.
+    """
+
+    second = pl.col("second")
+    rounded = round_seconds(second, 5 * 60)
+
+    if compact:
+        times = [
+            (second // 60).alias("minute"),
+            (second % 60).alias("second"),
+            (rounded % _DAY_SECONDS // 60).alias("rounded_minute"),
+        ]
+        date = pl.col("date")
+    else:
+        times = [
+            format_times(second).alias("time"),
+            format_times(rounded).alias("rounded_time"),
+        ]
+        date = pl.col("date").dt.strftime("%Y-%m-%d")
+
+    return parsed.select(
+        [pl.col("id"), pl.col("attraction"), pl.col("waiting_time"), date, *times]
+    )
+
+
+def training_plan(parsed: pl.LazyFrame) -> pl.LazyFrame:
+    """`process_waiting_times.training_from_parsed` as query plan on the output of
+    `scan_waiting_times`.
+
+    The means are computed from the exact integer sums like
+    `mean_from_partial_half_hours`, and the ids are numbered before half hours without
+    nonnegative waiting time are dropped, just like in `finish_half_hours`.
+    """
+
+    nonnegative = pl.col("waiting_time") >= 0
+
+    return (
+        parsed.filter(pl.col("second") >= 3600)
+        .with_columns(
+            (pl.col("second") // SLOT_SECONDS).cast(pl.Int8).alias("half_hour_slot")
+        )
+        .group_by(["attraction", "date", "half_hour_slot"])
+        .agg(
+            [
+                pl.col("waiting_time").filter(nonnegative).sum().alias("sum"),
+                nonnegative.sum().alias("count"),
+            ]
+        )
+        .sort(["attraction", "date", "half_hour_slot"])
+        .with_row_index("id")
+        .filter(pl.col("count") > 0)
+        .select(
+            [
+                pl.col("id").cast(pl.Int64),
+                pl.col("attraction"),
+                pl.col("date").dt.strftime("%Y-%m-%d"),
+                pl.col("half_hour_slot"),
+                (pl.col("sum") / pl.col("count")).alias("waiting_time"),
+            ]
+        )
+    )
+
+
+def _to_pandas(df: pl.DataFrame, index: Optional[str] = "id") -> pd.DataFrame:
+
+    pandas_df = df.to_pandas()
+
+    if index is not None:
+        pandas_df.set_index(index, inplace=True)
+
+    return pandas_df
+
+
+def process_waiting_times(
+    input_path: Union[str, PathLike],
+    output_path: Union[str, PathLike],
+    exploration_path: Optional[Union[str, PathLike]] = None,
+    compact_exploration: bool = False,
+):
+    """process the raw waiting time csv at `input_path` with Polars, writing the same
+    files as `process_waiting_times.py` with the pandas backend.
+
+    Args:
+        input_path (str | PathLike): raw waiting time csv
+        output_path (str | PathLike): where to store the training data
+        exploration_path (str | PathLike): where to store the exploration data.
+            Optional.
+        compact_exploration (bool): store the exploration data in the compact encoding
+            (see `compact_exploration_from_parsed`). Defaults to False.
+
+    Raises:
+        ValueError: the waiting times violate the rules of
+            `assert_waiting_time_state_consistency`
+    """
+
+    if count_state_violations(input_path):
+        # let the pandas validation build the report of the violating rows
+        assert_waiting_time_state_consistency(
+            pd.read_csv(input_path, index_col="id")
+        )
+
+    parsed = scan_waiting_times(input_path)
+    plans = [training_plan(parsed)]
+
+    if exploration_path:
+        plans.append(exploration_plan(parsed, compact_exploration))
+
+    # collecting both plans at once parses the input a single time
+    results = pl.collect_all(plans)
+
+    write_dataset(_to_pandas(results[0]), output_path, "waiting_times_training")
+
+    if exploration_path:
+        exploration_schema = (
+            "waiting_times_exploration_compact"
+            if compact_exploration
+            else "waiting_times_exploration"
+        )
+        write_dataset(_to_pandas(results[1]), exploration_path, exploration_schema)
+
+
+def join_weather(
+    waiting_time_df: pd.DataFrame, weather_df: pd.DataFrame
+) -> pd.DataFrame:
+    """`waiting_time_df.join(other=weather_df, on="date")` with Polars.
+
+    Args:
+        waiting_time_df (pd.DataFrame): training data, see
+            `process_waiting_times.transform_dataframe_training`
+        weather_df (pd.DataFrame): weather table indexed by date, see
+            `process_weather_stations.load_weather_table`
+
+    Returns:
+        pd.DataFrame: joined datapoints in the order and with the index of
+            `waiting_time_df`
+    """
+
+    index_name = waiting_time_df.index.name or "index"
+
+    waiting_times = pl.from_pandas(waiting_time_df.reset_index()).lazy()
+    weather = pl.from_pandas(weather_df.reset_index()).lazy()
+
+    joined = (
+        waiting_times.with_row_index("_row")
+        .join(weather, on="date", how="left")
+        .sort("_row")
+        .drop("_row")
+        .collect()
+    )
+
+    joined_df = _to_pandas(joined, index_name)
+    joined_df.index.name = waiting_time_df.index.name
+
+    # Polars orders the categories by their first occurrence
+    for column, dtype in waiting_time_df.dtypes.items():
+        if isinstance(dtype, pd.CategoricalDtype):
+            joined_df[column] = joined_df[column].cat.set_categories(dtype.categories)
+
+    return joined_df
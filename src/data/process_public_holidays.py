@@ -12,19 +12,35 @@ The output file contains the following columns:
 - name (str): German name of the holiday
 - is_public_holiday (bool): if the day is a real public holiday (the data source contains a few 
     days that are off school but no public holidays).
+- state_mask (int): the 16 state flags below packed into one integer, bit i is set if
+    the day is a holiday in the i-th state of STATE_FULL2ISO
 - <iso state code> (bool): for each of the 16 German states this indicates whether the day is a 
     holiday in this state 
+
+Recurring events are expanded over the whole range of the calendar, unless it is limited
+with `--first-year` and `--last-year`.
+
+If OUTPUT_PATH ends with ".parquet", the table is stored as typed parquet file instead
+(see `src/data/storage.py`).
 """
 
 import datetime
+import re
 from pathlib import Path
+from typing import Dict, Optional
 
 from icalendar import Calendar, Event
 import recurring_ical_events
+import numpy as np
 import pandas as pd
 import click
 
 from src.data.constants import STATE_FULL2ISO
+from src.data.storage import write_dataset
+
+# bit of each state in the state mask
+STATE_BITS = {state: 1 << i for i, state in enumerate(STATE_FULL2ISO.values())}
+_STATE_PATTERN = re.compile("|".join(STATE_BITS))
 
 
 def _event2dict(event: Event) -> dict:
@@ -45,11 +61,17 @@ def _event2dict(event: Event) -> dict:
     }
 
 
-def ical_to_dataframe(cal: Calendar) -> pd.DataFrame:
+def ical_to_dataframe(
+    cal: Calendar, first_year: Optional[int] = None, last_year: Optional[int] = None
+) -> pd.DataFrame:
     """extract the relevant attributes from each event and store them in a dataframe.
 
     Args:
         cal (Calendar): ical calendar of holidays
+        first_year (int): only expand events from this year on. Defaults to the year
+            of the first event.
+        last_year (int): only expand events up to this year (inclusive). Defaults to
+            the year of the last event.
 
     Returns:
         pd.DataFrame: relevant attributes of each calendar entry
@@ -59,6 +81,12 @@ def ical_to_dataframe(cal: Calendar) -> pd.DataFrame:
     start_date = min(dates)
     end_date = max(dates)
 
+    if first_year is not None:
+        start_date = datetime.date(first_year, 1, 1)
+    if last_year is not None:
+        # the end of the range is exclusive
+        end_date = datetime.date(last_year + 1, 1, 1)
+
     events = recurring_ical_events.of(cal).between(start_date, end_date)
 
     row_list = [_event2dict(e) for e in events]
@@ -69,6 +97,46 @@ def ical_to_dataframe(cal: Calendar) -> pd.DataFrame:
     return df
 
 
+def state_mask(locations: pd.Series) -> np.ndarray:
+    """pack the states contained in each location string into a bitmask (see
+    STATE_BITS).
+
+    The calendar uses only a few distinct location strings, so each of them is scanned
+    once with a single regex for all states and the masks are broadcast to all rows.
+
+    Args:
+        locations (pd.Series): location strings containing iso state codes, e.g. "BW,BY"
+
+    Returns:
+        np.ndarray: state mask of each location (int32)
+    """
+
+    codes, unique_locations = pd.factorize(locations)
+
+    unique_masks = np.fromiter(
+        (
+            sum({STATE_BITS[state] for state in _STATE_PATTERN.findall(location)})
+            for location in unique_locations
+        ),
+        dtype=np.int32,
+        count=len(unique_locations),
+    )
+
+    return unique_masks[codes]
+
+
+def unpack_state_mask(mask: np.ndarray) -> Dict[str, np.ndarray]:
+    """unpack state masks into a boolean array for each state.
+
+    Args:
+        mask (np.ndarray): state masks, see `state_mask`
+
+    Returns:
+        Dict[str, np.ndarray]: iso state code -> whether its bit is set in each mask
+    """
+    return {state: (mask & bit) != 0 for state, bit in STATE_BITS.items()}
+
+
 def transform_dataframe(df: pd.DataFrame) -> pd.DataFrame:
     """transform the raw calendar data in the structure described in this modules docstring
 
@@ -82,14 +150,16 @@ def transform_dataframe(df: pd.DataFrame) -> pd.DataFrame:
         pd.DataFrame: table containing the relevant information for each holiday
     """
 
-    df["is_public_holiday"] = df.name.apply(lambda name: "§" in name)
+    df["is_public_holiday"] = df.name.str.contains("§", regex=False)
     df.name = df.name.str.replace(" (§)", "", regex=False)
 
     df.location.replace(
         {"Alle Bundesländer": ",".join(STATE_FULL2ISO.values())}, inplace=True
     )
-    for state in STATE_FULL2ISO.values():
-        df[state] = df.location.apply(lambda location_str: state in location_str)
+
+    df["state_mask"] = state_mask(df.location)
+    for state, flags in unpack_state_mask(df.state_mask.to_numpy()).items():
+        df[state] = flags
 
     df["begin_date"] = df.begin.apply(datetime.date.isoformat)
 
@@ -110,15 +180,26 @@ def transform_dataframe(df: pd.DataFrame) -> pd.DataFrame:
 @click.command(help=__doc__)
 @click.argument("input_path", type=click.Path(exists=True))
 @click.argument("output_path", type=click.Path())
-def main(input_path: Path, output_path: Path):
+@click.option(
+    "--first-year", default=None, type=int, help="first year to expand events for"
+)
+@click.option(
+    "--last-year", default=None, type=int, help="last year to expand events for"
+)
+def main(
+    input_path: Path,
+    output_path: Path,
+    first_year: Optional[int],
+    last_year: Optional[int],
+):
 
     with open(input_path) as fp:
         cal = Calendar.from_ical(fp.read())
 
-    df = ical_to_dataframe(cal)
+    df = ical_to_dataframe(cal, first_year, last_year)
     df = transform_dataframe(df)
 
-    df.to_csv(output_path)
+    write_dataset(df, output_path, "public_holidays")
 
 
 if __name__ == "__main__":
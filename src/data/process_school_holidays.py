@@ -8,15 +8,23 @@ a holiday at a given date in a given state, the cell contains the holiday name (
 Otherwise the cell is empty. The csv file contains only dates that are a holiday in at least one 
 state. It is also possible to output the data in long form, i.e. with the columns date, federal
 state and holiday type.
+
+Output paths ending with ".parquet" are stored as typed parquet files instead (see
+`src/data/storage.py`).
 """
 
 import datetime
-from typing import List, Optional
+from typing import Iterator, List, Optional, Sequence, Tuple
 
+import numpy as np
 import pandas as pd
 import click
 
 from src.data.constants import STATE_FULL2ISO
+from src.data.dates import format_dates
+from src.data.storage import write_dataset
+
+_EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
 
 
 def parse_relative_date(date_str: str, year: int) -> datetime.date:
@@ -39,8 +47,10 @@ def parse_relative_date(date_str: str, year: int) -> datetime.date:
     return datetime.date(year=year, month=int(part_list[1]), day=int(part_list[0]))
 
 
-def parse_date_string(date_str: str, year: int) -> List[str]:
-    """parse date intervals into a list of ISO dates
+def parse_date_intervals(
+    date_str: str, year: int
+) -> List[Tuple[datetime.date, datetime.date]]:
+    """parse date intervals into a list of (first date, last date) tuples
 
     types of date intervals:
     - "-" (empty list)
@@ -49,21 +59,21 @@ def parse_date_string(date_str: str, year: int) -> List[str]:
     - "04.10.+07.10. - 19.10." (single date and interval)
     - "04.10.+07.10. - 12.10.+01.11." (interval and two single dates)
 
-    Parsing is done by the following steps:
-    1. split the line at "+" and treat each part individually
-    2a. If a part contains "-": Split, parse both parts with `parse_relative_date` and
-        iteratively add all dates between the first and the last (inclusive) to the
-        output list.
-    2b. Else: Parse the date with `parse_relative_date` and add it to the output list as
-        well
+    The line is split at "+" and each part is parsed with `parse_relative_date`. Parts
+    containing "-" are intervals, single dates become intervals of one day. Intervals
+    containing a New Years Eve (e.g. 23.12.-6.1.) end in the following year.
 
     Args:
         date_str (str): date string containing at most one interval and at most two
             single dates
         year (int): the year of the given dates
 
+    Raises:
+        ValueError: `date_str` is ill-formed
+
     Returns:
-        List[str]: list of all dates that are described by `date_str` in ISO form.
+        List[Tuple[datetime.date, datetime.date]]: first and last date (inclusive) of
+            each interval
     """
 
     date_str = date_str.strip()
@@ -71,13 +81,13 @@ def parse_date_string(date_str: str, year: int) -> List[str]:
     if date_str == "-":
         return []
 
-    date_list = []
-
     date_parts = date_str.split("+")
 
     if len(date_parts) > 3:
         raise ValueError(f"illegal date string '{date_str}', too many '+'")
 
+    interval_list = []
+
     for part in date_parts:
 
         if "-" in part:
@@ -90,66 +100,158 @@ def parse_date_string(date_str: str, year: int) -> List[str]:
 
             start_date = parse_relative_date(interval_parts[0], year)
             end_date = parse_relative_date(interval_parts[1], year)
-            delta = datetime.timedelta(days=1)
 
             if end_date < start_date:
                 # deal with holidays that contain a New Years Eve, e.g. 23.12.-6.1.
-                end_date = datetime.date(
-                    day=end_date.day, month=end_date.month, year=end_date.year + 1
-                )
+                end_date = end_date.replace(year=end_date.year + 1)
 
-            while start_date <= end_date:
-
-                date_list.append(start_date.isoformat())
-
-                start_date += delta
+            interval_list.append((start_date, end_date))
 
         else:
             # this part is a single date
 
             date = parse_relative_date(part, year)
 
-            date_list.append(date.isoformat())
+            interval_list.append((date, date))
 
-    return date_list
+    return interval_list
 
 
-def process_sections(line_list: List[str], holiday_names: List[str]) -> pd.DataFrame:
-    """process the different sections of the input file, i.e. everything except for the header
+def _to_datetime64(dates: Sequence[datetime.date]) -> np.ndarray:
+    # much faster than letting numpy convert the date objects
+    ordinals = np.fromiter((date.toordinal() for date in dates), np.int64, len(dates))
+    return (ordinals - _EPOCH_ORDINAL).astype("datetime64[D]")
+
+
+def expand_intervals(
+    starts: np.ndarray, ends: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """expand date intervals into all of their dates without looping over the days.
+
+    Args:
+        starts (np.ndarray): first date of each interval (datetime64[D])
+        ends (np.ndarray): last date of each interval, inclusive (datetime64[D])
+
+    Returns:
+        np.ndarray: all dates of all intervals in order (datetime64[D])
+        np.ndarray: index of the interval of each date
+    """
+
+    lengths = (ends - starts).astype(np.int64) + 1
+    interval_index = np.repeat(np.arange(len(starts)), lengths)
+
+    # position of each date within its interval
+    offsets = np.arange(len(interval_index)) - np.repeat(
+        np.cumsum(lengths) - lengths, lengths
+    )
+
+    return starts[interval_index] + offsets, interval_index
+
+
+def parse_date_string(date_str: str, year: int) -> List[str]:
+    """parse date intervals into a list of ISO dates, see `parse_date_intervals`.
+
+    Args:
+        date_str (str): date string containing at most one interval and at most two
+            single dates
+        year (int): the year of the given dates
+
+    Returns:
+        List[str]: list of all dates that are described by `date_str` in ISO form.
+    """
+
+    interval_list = parse_date_intervals(date_str, year)
+
+    dates, _ = expand_intervals(
+        _to_datetime64([start for start, _ in interval_list]),
+        _to_datetime64([end for _, end in interval_list]),
+    )
+
+    return format_dates(dates).tolist()
+
+
+def iter_interval_records(
+    line_list: List[str], holiday_names: List[str]
+) -> Iterator[Tuple[datetime.date, datetime.date, str, str]]:
+    """tokenize the sections of the input file in a single pass over the lines.
+
+    Each section starts with a "# <YEAR>" line, followed by blocks consisting of the
+    name of a state and one line of date intervals per holiday.
 
     Args:
         line_list (List[str]): list of stripped lines, empty lines are removed
         holiday_names (List[str]): list of all holiday names
 
-    Returns:
-        pd.DataFrame: long-form dataframe containing date, federal state and holiday type as columns
+    Raises:
+        ValueError: the lines are ill-formed
+
+    Yields:
+        Tuple[datetime.date, datetime.date, str, str]: first date, last date, state and
+            holiday type of each interval
     """
 
-    date_state_holiday_list = []
+    year = None
+    i = 0
+
+    while i < len(line_list):
+
+        line = line_list[i]
+        i += 1
 
-    while line_list:
+        if line.startswith("#"):
+            # start new year
+            year = int(line[1:].strip())
+            continue
 
-        # start new year
-        year_line = line_list.pop(0)
-        assert year_line.startswith("#"), year_line
-        year = int(year_line[1:].strip())
+        if year is None:
+            raise ValueError(f"expected a year line like '# 2019', got '{line}'")
 
-        # iterate over states within that year
-        while line_list and not line_list[0].startswith("#"):
+        state = line.strip()
 
-            state = line_list.pop(0).strip()
+        end = i + len(holiday_names)
+        holiday_lines = line_list[i:end]
+        i = end
 
-            for holiday in holiday_names:
-                curr_line = line_list.pop(0)
+        if len(holiday_lines) != len(holiday_names):
+            raise ValueError(f"incomplete holidays of {state} in {year}")
 
-                assert curr_line[0].isdigit() or curr_line[0] == "-", curr_line
+        for holiday, holiday_line in zip(holiday_names, holiday_lines):
+
+            if not (holiday_line[0].isdigit() or holiday_line[0] == "-"):
+                raise ValueError(f"illegal date string '{holiday_line}' for {state}")
+
+            for start_date, end_date in parse_date_intervals(holiday_line, year):
+                yield start_date, end_date, state, holiday
+
+
+def process_sections(line_list: List[str], holiday_names: List[str]) -> pd.DataFrame:
+    """process the different sections of the input file, i.e. everything except for the header
+
+    The intervals emitted by `iter_interval_records` are expanded into single dates
+    with `expand_intervals`.
+
+    Args:
+        line_list (List[str]): list of stripped lines, empty lines are removed
+        holiday_names (List[str]): list of all holiday names
+
+    Returns:
+        pd.DataFrame: long-form dataframe containing date, federal state and holiday type as columns
+    """
 
-                date_list = parse_date_string(curr_line, year)
+    records = list(iter_interval_records(line_list, holiday_names))
+    starts, ends, states, holidays = zip(*records) if records else ([], [], [], [])
 
-                for date in date_list:
-                    date_state_holiday_list.append((date, state, holiday))
+    dates, interval_index = expand_intervals(
+        _to_datetime64(starts), _to_datetime64(ends)
+    )
 
-    raw_df = pd.DataFrame(date_state_holiday_list, columns=["date", "state", "type"])
+    raw_df = pd.DataFrame(
+        {
+            "date": format_dates(dates),
+            "state": np.array(states, dtype=object)[interval_index],
+            "type": np.array(holidays, dtype=object)[interval_index],
+        }
+    )
 
     return raw_df
 
@@ -206,14 +308,14 @@ def process_file(input_path: str, output_path: str, long_form: Optional[str]):
     raw_df.index.name = "id"
 
     if long_form:
-        raw_df.to_csv(long_form)
+        write_dataset(raw_df, long_form, "school_holidays_long")
 
     # pivotize the table. This ensures that each date appears at most once as row in the
     # output data and all information regarding this data is part of that row.
     pivot_df = raw_df.pivot(index="date", columns="state")
     pivot_df.columns = pivot_df.columns.droplevel(0)
 
-    pivot_df.to_csv(output_path)
+    write_dataset(pivot_df, output_path, "school_holidays")
 
 
 if __name__ == "__main__":
@@ -14,7 +14,8 @@ The following columns are present in OUTPUT_PATH:
 - id (int): unique id for each datapoint
 - attraction (str): name of the attraction
 - date (str): day in YYYY-MM-DD format
-- half_hour_time (str): time rounded down to the nearest half hour
+- half_hour_slot (int8): half hour of the day, i.e. the time rounded down to the
+  nearest half hour, as slot index (see `src/data/slots.py`)
 - waiting_time (int): waiting time in minutes (or negative if closed)
 
 It is also possible to store an intermediate table that is neither aggregated nor 
@@ -26,18 +27,69 @@ filtered at EXPLORATION. It has the following columns:
 - date (str): day in YYYY-MM-DD format
 - time (str): time in HH:MM:SS format
 - rounded_time (str): time rounded to the nearest five minutes.
+
+The `datum` column is parsed only once and all rounding, filtering and aggregation is
+done with vectorized array operations on dates and seconds since midnight.
+
+With `--chunk-size` (or `--max-memory`), INPUT_PATH is streamed in chunks instead of
+being loaded at once. The output files are the same.
+
+With `--workers N`, the data is sharded by attraction (or by attraction and year with
+`--shard-by attraction-year`) and the shards are processed on N processes.
+
+With `--incremental`, only the days of each attraction that are new or changed since
+the last run are processed and merged into the existing output files. INPUT_PATH is
+streamed in chunks (of `--chunk-size` datapoints, see `--max-memory`) as well.
+
+OUTPUT_PATH and EXPLORATION are written as csv or, if their suffix is ".parquet" or
+".feather", as typed parquet or feather files (see `src/data/storage.py`).
+
+With `--backend polars`, the transformations run as multi-threaded Polars query plans
+(see `src/data/polars_backend.py`). The output files are the same.
+
+With `--compact-exploration`, EXPLORATION stores the times as minute of the day (int16)
+and second (int8) instead of strings, the waiting time as int16 and the attraction as
+category (see `compact_exploration_from_parsed`). Use `load_exploration` to load it and
+`expand_exploration` to get the string columns.
 """
 
 
+import bisect
+from concurrent.futures import ProcessPoolExecutor
 import datetime
+import functools
+import json
 import logging
-from typing import Optional
+import os
+from os import PathLike
+from pathlib import Path
+import shutil
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple, Union
 import numpy as np
 
 import pandas as pd
 import click
+import psutil
+
+from src.data.constants import BACKENDS, LOGGING_FORMAT_STR
+from src.data.dates import DAY_SECONDS, format_dates, format_times
+from src.data.slots import SLOT_DTYPE, slots_from_seconds
+from src.data.storage import (
+    DatasetWriter,
+    apply_schema,
+    dataset_format,
+    iter_dataset,
+    read_dataset,
+    write_dataset,
+)
+from src.data.validation import validate
 
-from src.data.constants import LOGGING_FORMAT_STR
+DEFAULT_CHUNK_SIZE = 1_000_000
+MIN_CHUNK_SIZE = 10_000
+
+# version of the output format in the state of `process_incrementally`, the outputs of
+# a state with another version are processed again (2: half hours as slot index)
+_STATE_VERSION = 2
 
 
 def round_time(time_str: str) -> str:
@@ -75,25 +127,309 @@ def round_half_hour(time: str) -> str:
         return f"{hours}:30:00"
 
 
-def assert_waiting_time_state_consistency(df: pd.DataFrame):
+def assert_waiting_time_state_consistency(
+    df: pd.DataFrame, sample: Optional[int] = None
+):
     """ensure that negative waiting times occur if and only if the attraction is closed.
 
     Args:
         df (pd.DataFrame): dataframe to check
+        sample (int): only check this many random rows. Optional.
 
     Raises:
-        ValueError: raised if condition not fulfilled
+        ValueError: raised if condition not fulfilled, contains a report of the
+            violating rows
     """
 
-    if any((df.wartezeit >= 0) & ~(df.status == "opened")):
-        raise ValueError(
-            "cannot have nonnegative waiting time if the attraction is not opened"
-        )
+    validate(df, "raw_waiting_times", sample=sample).raise_if_failed()
 
-    if any((df.wartezeit < 0) & ~(df.status == "closed")):
-        raise ValueError(
-            "cannot have negative waiting time if the attraction is not closed"
-        )
+
+def parse_timestamps(timestamps: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """parse timestamps in the "YYYY-MM-DD HH:MM:SS" format in one vectorized pass.
+
+    Args:
+        timestamps (pd.Series): timestamp strings, e.g. the `datum` column
+
+    Returns:
+        np.ndarray: dates as datetime64[D]
+        np.ndarray: seconds since midnight as int32
+    """
+    parsed = pd.to_datetime(timestamps, format="%Y-%m-%d %H:%M:%S").to_numpy()
+    dates = parsed.astype("datetime64[D]")
+    seconds = (parsed - dates).astype("timedelta64[s]").astype(np.int32)
+
+    return dates, seconds
+
+
+def round_seconds(seconds: np.ndarray, interval: int) -> np.ndarray:
+    """vectorized `round_time`: round seconds since midnight to the nearest multiple of
+    `interval`, rounding ties to even like Python's `round`.
+
+    Unlike `round_time`, times that are rounded up to the next full hour (e.g. 09:58:00)
+    do not raise an error but become HH+1:00:00.
+
+    Args:
+        seconds (np.ndarray): integer seconds since midnight
+        interval (int): interval in seconds, e.g. 300 for five minutes
+
+    Returns:
+        np.ndarray: rounded seconds since midnight
+    """
+    quotient, remainder = np.divmod(seconds, interval)
+    round_up = (2 * remainder > interval) | (
+        (2 * remainder == interval) & (quotient % 2 == 1)
+    )
+
+    return (quotient + round_up) * interval
+
+
+def parse_waiting_times(df: pd.DataFrame) -> pd.DataFrame:
+    """parse the raw waiting time data into the intermediate form that both
+    `exploration_from_parsed` and `training_from_parsed` work on.
+
+    The following columns are present in the output (the index is kept):
+    - attraction (str): name of the attraction
+    - waiting_time (int): waiting time in minutes (or negative if closed)
+    - date (datetime64[D]): day of the datapoint
+    - second (int32): seconds since midnight
+
+    Args:
+        df (pd.DataFrame): raw waiting time data
+
+    Returns:
+        pd.DataFrame: parsed waiting time data
+    """
+
+    dates, seconds = parse_timestamps(df.datum)
+
+    return pd.DataFrame(
+        {
+            "attraction": df.attraction,
+            "waiting_time": df.wartezeit,
+            "date": dates,
+            "second": seconds,
+        },
+        index=df.index,
+    )
+
+
+def exploration_from_parsed(parsed_df: pd.DataFrame) -> pd.DataFrame:
+    """see `transform_dataframe_exploration`, but working on the output of
+    `parse_waiting_times`.
+    """
+
+    seconds = parsed_df.second.to_numpy()
+
+    return pd.DataFrame(
+        {
+            "attraction": parsed_df.attraction,
+            "waiting_time": parsed_df.waiting_time,
+            "date": format_dates(parsed_df.date.to_numpy()),
+            "time": format_times(seconds),
+            "rounded_time": format_times(round_seconds(seconds, 5 * 60)),
+        },
+        index=parsed_df.index,
+    )
+
+
+def compact_exploration_from_parsed(parsed_df: pd.DataFrame) -> pd.DataFrame:
+    """compact encoding of the exploration data (see `exploration_from_parsed`),
+    working on the output of `parse_waiting_times`.
+
+    Times are stored as small integers instead of strings and the attraction names as
+    categorical, which makes the data several times smaller in memory and on disk.
+
+    The following columns are present in the output (the index is kept):
+    - attraction (category): name of the attraction
+    - waiting_time (int16): waiting time in minutes (or negative if closed)
+    - date (datetime64): day of the datapoint (stored as date32 in parquet and feather)
+    - minute (int16): minute of the day of `time`
+    - second (int8): second within the minute of `time`
+    - rounded_minute (int16): minute of the day of `rounded_time`
+
+    Args:
+        parsed_df (pd.DataFrame): output of `parse_waiting_times`
+
+    Returns:
+        pd.DataFrame: compact exploration data, see `expand_exploration`
+    """
+
+    seconds = parsed_df.second.to_numpy()
+    rounded_seconds = round_seconds(seconds, 5 * 60) % DAY_SECONDS
+
+    return pd.DataFrame(
+        {
+            "attraction": parsed_df.attraction.astype("category"),
+            "waiting_time": parsed_df.waiting_time.to_numpy().astype(np.int16),
+            "date": parsed_df.date.to_numpy().astype("datetime64[ns]"),
+            "minute": (seconds // 60).astype(np.int16),
+            "second": (seconds % 60).astype(np.int8),
+            "rounded_minute": (rounded_seconds // 60).astype(np.int16),
+        },
+        index=parsed_df.index,
+    )
+
+
+def expand_exploration(compact_df: pd.DataFrame) -> pd.DataFrame:
+    """convert compact exploration data (see `compact_exploration_from_parsed`) into the
+    exploration format with date and time strings.
+
+    Args:
+        compact_df (pd.DataFrame): compact exploration data
+
+    Returns:
+        pd.DataFrame: exploration data as written by `exploration_from_parsed`
+    """
+
+    minutes = compact_df.minute.to_numpy().astype(np.int32)
+
+    return pd.DataFrame(
+        {
+            "attraction": compact_df.attraction.astype(str).to_numpy(dtype=object),
+            "waiting_time": compact_df.waiting_time.to_numpy().astype(np.int64),
+            "date": format_dates(compact_df.date.to_numpy()),
+            "time": format_times(minutes * 60 + compact_df.second.to_numpy()),
+            "rounded_time": format_times(
+                compact_df.rounded_minute.to_numpy().astype(np.int32) * 60
+            ),
+        },
+        index=compact_df.index,
+    )
+
+
+def _exploration_dataset(compact: bool) -> Tuple[Callable, str]:
+    # function computing the exploration data from the parsed data and its schema
+    if compact:
+        return compact_exploration_from_parsed, "waiting_times_exploration_compact"
+    return exploration_from_parsed, "waiting_times_exploration"
+
+
+def load_exploration(
+    path: Union[str, PathLike],
+    compact: bool = True,
+    columns: Optional[List[str]] = None,
+) -> pd.DataFrame:
+    """load exploration data in any storage format (see `src/data/storage.py`).
+
+    Args:
+        path (str | PathLike): exploration data
+        compact (bool): whether the data was stored in the compact encoding (see
+            `compact_exploration_from_parsed`). Defaults to True.
+        columns (List[str]): only load these columns. Optional.
+
+    Returns:
+        pd.DataFrame: exploration data, indexed by id
+    """
+    return read_dataset(path, _exploration_dataset(compact)[1], columns)
+
+
+def _half_hour_frame(parsed_df: pd.DataFrame) -> pd.DataFrame:
+    # remove all entries past midnight. They are always -3 anyway (as the park closes
+    # much earlier), so they just add more complexity without benefits
+    parsed_df = parsed_df[parsed_df.second.to_numpy() >= 3600]
+
+    waiting_time = parsed_df.waiting_time.to_numpy()
+
+    return pd.DataFrame(
+        {
+            "attraction": parsed_df.attraction.to_numpy(),
+            "date": parsed_df.date.to_numpy(),
+            "half_hour_slot": slots_from_seconds(parsed_df.second.to_numpy()),
+            "waiting_time": np.where(waiting_time >= 0, waiting_time, np.nan),
+        }
+    )
+
+
+def aggregate_half_hours(parsed_df: pd.DataFrame) -> pd.Series:
+    """compute the mean waiting time of every attraction, day and half hour.
+
+    Datapoints before 1 AM are removed and negative waiting times are ignored.
+    Half hours without any nonnegative waiting time are kept with NaN.
+
+    Args:
+        parsed_df (pd.DataFrame): output of `parse_waiting_times`
+
+    Returns:
+        pd.Series: mean waiting time, indexed by attraction, date (datetime64) and
+            half_hour_slot (int8), sorted by the index
+    """
+
+    return (
+        _half_hour_frame(parsed_df)
+        .groupby(by=["attraction", "date", "half_hour_slot"])
+        .waiting_time.mean()
+    )
+
+
+def partial_half_hours(parsed_df: pd.DataFrame) -> pd.DataFrame:
+    """like `aggregate_half_hours`, but return the sum and the number of nonnegative
+    waiting times instead of their mean, so that the results for several parts of the
+    data can be added up with `pd.DataFrame.add(..., fill_value=0)`.
+
+    Args:
+        parsed_df (pd.DataFrame): output of `parse_waiting_times`
+
+    Returns:
+        pd.DataFrame: columns `sum` and `count`, indexed like the output of
+            `aggregate_half_hours`
+    """
+
+    return (
+        _half_hour_frame(parsed_df)
+        .groupby(by=["attraction", "date", "half_hour_slot"])
+        .waiting_time.agg(["sum", "count"])
+    )
+
+
+def mean_from_partial_half_hours(partials: pd.DataFrame) -> pd.Series:
+    """turn the (combined) output of `partial_half_hours` into the output of
+    `aggregate_half_hours`.
+
+    The waiting times are integers, so their sums are exact and the means are identical
+    to those computed on all datapoints at once.
+    """
+
+    partials = partials.sort_index()
+
+    # sum / count is NaN for half hours without nonnegative waiting time, just like
+    # the mean
+    waiting_time = partials["sum"] / partials["count"].where(partials["count"] > 0)
+    waiting_time.name = "waiting_time"
+
+    return waiting_time
+
+
+def finish_half_hours(half_hour_means: pd.Series) -> pd.DataFrame:
+    """turn the output of `aggregate_half_hours` into the training format (see
+    `transform_dataframe_training`).
+    """
+
+    df = half_hour_means.reset_index()
+
+    waiting_time_half_hour_df = pd.DataFrame(
+        {
+            "attraction": df.attraction,
+            "date": format_dates(df.date.to_numpy()),
+            # the index levels of pandas are at least 64 bit wide
+            "half_hour_slot": df.half_hour_slot.to_numpy().astype(SLOT_DTYPE),
+            "waiting_time": df.waiting_time,
+        }
+    )
+    waiting_time_half_hour_df.index.name = "id"
+
+    # Drop datapoints where the park was closed
+    waiting_time_half_hour_df.dropna(
+        axis="index", how="any", subset=["waiting_time"], inplace=True
+    )
+
+    return waiting_time_half_hour_df
+
+
+def training_from_parsed(parsed_df: pd.DataFrame) -> pd.DataFrame:
+    """see `transform_dataframe_training`, but working on the output of
+    `parse_waiting_times`.
+    """
+    return finish_half_hours(aggregate_half_hours(parsed_df))
 
 
 def transform_dataframe_exploration(df: pd.DataFrame) -> pd.DataFrame:
@@ -117,16 +453,7 @@ def transform_dataframe_exploration(df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         pd.DataFrame: waiting time data for exploration
     """
-
-    df[["date", "time"]] = df.datum.str.split(" ", expand=True)
-    df["rounded_time"] = df.time.apply(round_time)
-
-    df.rename(columns={"datum": "timestamp", "wartezeit": "waiting_time"}, inplace=True)
-
-    # drop as much columns as possible without loss of information
-    df.drop(columns=["month", "year", "timestamp", "status"], inplace=True)
-
-    return df
+    return exploration_from_parsed(parse_waiting_times(df))
 
 
 def transform_dataframe_training(waiting_time_df: pd.DataFrame) -> pd.DataFrame:
@@ -141,7 +468,7 @@ def transform_dataframe_training(waiting_time_df: pd.DataFrame) -> pd.DataFrame:
     - id (int): unique id for each datapoint
     - attraction (str): name of the attraction
     - date (str): day in YYYY-MM-DD format
-    - half_hour_time (str): time rounded down to the nearest half hour
+    - half_hour_slot (int8): time rounded down to the nearest half hour, as slot index
     - waiting_time (int): waiting time in minutes (or negative if closed)
 
     Args:
@@ -152,28 +479,730 @@ def transform_dataframe_training(waiting_time_df: pd.DataFrame) -> pd.DataFrame:
         pd.DataFrame: aggregated waiting time data for training
     """
 
-    # remove all entries past midnight. They are always -3 anyway (as the park closes
-    # much earlier), so they just add more complexity without benefits
-    waiting_time_df = waiting_time_df[
-        ~waiting_time_df.time.str.startswith("00:")
-    ].copy()
-    waiting_time_df.waiting_time = waiting_time_df.waiting_time.map(
-        lambda x: x if x >= 0 else np.nan
-    )
-
-    waiting_time_df["half_hour_time"] = waiting_time_df.time.apply(round_half_hour)
-    waiting_time_half_hour_df = waiting_time_df.groupby(
-        by=["attraction", "date", "half_hour_time"]
-    ).agg("mean")
-    waiting_time_half_hour_df.reset_index(inplace=True)
-    waiting_time_half_hour_df.index.name = "id"
+    dates, seconds = parse_timestamps(
+        waiting_time_df.date + " " + waiting_time_df.time
+    )
+    parsed_df = pd.DataFrame(
+        {
+            "attraction": waiting_time_df.attraction,
+            "waiting_time": waiting_time_df.waiting_time,
+            "date": dates,
+            "second": seconds,
+        },
+        index=waiting_time_df.index,
+    )
 
-    # Drop datapoints where the park was closed
-    waiting_time_half_hour_df.dropna(
-        axis="index", how="any", subset=["waiting_time"], inplace=True
+    return training_from_parsed(parsed_df)
+
+
+def _rss_megabytes() -> float:
+    return psutil.Process().memory_info().rss / 2**20
+
+
+def _read_chunks(
+    input_path: Union[str, PathLike],
+    chunk_size: int,
+    max_memory: Optional[float] = None,
+) -> Iterator[pd.DataFrame]:
+    # stream the raw waiting time csv. Whenever the resident set size exceeds
+    # `max_memory` after a chunk was processed, the chunk size is halved
+    n_datapoints = 0
+
+    with pd.read_csv(input_path, index_col="id", iterator=True) as reader:
+        while True:
+            try:
+                df = reader.get_chunk(chunk_size)
+            except StopIteration:
+                break
+
+            n_datapoints += len(df)
+            yield df
+            del df
+
+            rss = _rss_megabytes()
+            logging.info(f"{n_datapoints} datapoints processed, RSS {rss:.0f} MB")
+
+            if max_memory is not None and rss > max_memory:
+                if chunk_size > MIN_CHUNK_SIZE:
+                    chunk_size = max(chunk_size // 2, MIN_CHUNK_SIZE)
+                    logging.info(f"Memory cap exceeded, reducing {chunk_size=}")
+                else:
+                    logging.warning(
+                        f"RSS of {rss:.0f} MB exceeds {max_memory=} MB at the "
+                        f"minimal {chunk_size=}"
+                    )
+
+
+def _process_chunks(
+    chunks: Iterator[pd.DataFrame],
+    to_exploration: Callable,
+    exploration_writer: Optional[DatasetWriter] = None,
+    validation_sample: Optional[int] = None,
+) -> Optional[pd.DataFrame]:
+    # parse the chunks, write their exploration rows and add up their partial half
+    # hours (None without chunks)
+    chunk_partials = []
+
+    for df in chunks:
+        assert_waiting_time_state_consistency(df, validation_sample)
+
+        parsed_df = parse_waiting_times(df)
+        del df
+
+        # an empty first chunk (all datapoints filtered out) would leave the columns of
+        # parquet files untyped
+        if exploration_writer and len(parsed_df):
+            exploration_writer.write(to_exploration(parsed_df))
+
+        chunk_partials.append(partial_half_hours(parsed_df))
+        del parsed_df
+
+    if not chunk_partials:
+        return None
+
+    # adding them up once instead of after every chunk keeps the time per chunk
+    # constant, only half hours spanning a chunk boundary appear twice
+    return (
+        pd.concat(chunk_partials)
+        .groupby(level=["attraction", "date", "half_hour_slot"])
+        .sum()
     )
 
-    return waiting_time_half_hour_df
+
+def process_in_chunks(
+    input_path: Union[str, PathLike],
+    output_path: Union[str, PathLike],
+    exploration_path: Optional[Union[str, PathLike]] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_memory: Optional[float] = None,
+    validation_sample: Optional[int] = None,
+    compact_exploration: bool = False,
+):
+    """process the raw waiting time csv at `input_path` chunk by chunk, writing the same
+    files as processing all datapoints at once.
+
+    Exploration rows are appended to `exploration_path` as each chunk is processed. For
+    the training data, the sum and count of waiting times per attraction, day and half
+    hour are kept across chunks, so half hours spanning a chunk boundary are finished
+    correctly. Only these partial sums (one row per half hour) grow with the input.
+
+    Args:
+        input_path (str | PathLike): raw waiting time csv
+        output_path (str | PathLike): where to store the training data
+        exploration_path (str | PathLike): where to store the exploration data.
+            Optional.
+        chunk_size (int): number of datapoints read at once. Defaults to
+            DEFAULT_CHUNK_SIZE.
+        max_memory (float): memory cap in MB. Whenever the resident set size exceeds
+            it after a chunk, the chunk size is halved (down to MIN_CHUNK_SIZE).
+            Optional.
+        validation_sample (int): only validate this many random datapoints of each
+            chunk. Optional.
+        compact_exploration (bool): store the exploration data in the compact encoding
+            (see `compact_exploration_from_parsed`). Defaults to False.
+
+    Raises:
+        ValueError: `input_path` contains no datapoints
+    """
+
+    to_exploration, exploration_schema = _exploration_dataset(compact_exploration)
+
+    exploration_writer = None
+    if exploration_path:
+        exploration_writer = DatasetWriter(exploration_path, exploration_schema)
+
+    partials = _process_chunks(
+        _read_chunks(input_path, chunk_size, max_memory),
+        to_exploration,
+        exploration_writer,
+        validation_sample,
+    )
+
+    if exploration_writer:
+        exploration_writer.close()
+
+    if partials is None:
+        raise ValueError(f"{input_path} contains no datapoints")
+
+    logging.info("Finishing half hour means...")
+    write_dataset(
+        finish_half_hours(mean_from_partial_half_hours(partials)),
+        output_path,
+        "waiting_times_training",
+    )
+
+
+def _process_shard(
+    df: pd.DataFrame,
+    validation_sample: Optional[int] = None,
+    compact_exploration: bool = False,
+) -> Tuple[pd.DataFrame, pd.Series]:
+    assert_waiting_time_state_consistency(df, validation_sample)
+    parsed_df = parse_waiting_times(df)
+    to_exploration, _ = _exploration_dataset(compact_exploration)
+    return to_exploration(parsed_df), aggregate_half_hours(parsed_df)
+
+
+def shard_waiting_times(df: pd.DataFrame, shard_by: str) -> List[pd.DataFrame]:
+    """split the raw waiting time data into shards that can be processed
+    independently, as no half hour spans two shards.
+
+    Args:
+        df (pd.DataFrame): raw waiting time data
+        shard_by (str): "attraction" or "attraction-year" (the year of `datum`)
+
+    Raises:
+        ValueError: unknown `shard_by`
+
+    Returns:
+        List[pd.DataFrame]: shards, ordered by their key
+    """
+
+    if shard_by == "attraction":
+        keys = df.attraction
+    elif shard_by == "attraction-year":
+        keys = [df.attraction, df.datum.str.slice(0, 4)]
+    else:
+        raise ValueError(f"cannot shard by {shard_by!r}")
+
+    return [shard for _, shard in df.groupby(keys, sort=True)]
+
+
+def process_in_parallel(
+    df: pd.DataFrame,
+    workers: int,
+    shard_by: str = "attraction",
+    validation_sample: Optional[int] = None,
+    compact_exploration: bool = False,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """transform the raw waiting time data into the exploration and training format on
+    a pool of `workers` processes, one shard (see `shard_waiting_times`) at a time.
+
+    The results are identical to `transform_dataframe_exploration` and
+    `training_from_parsed`.
+
+    Args:
+        df (pd.DataFrame): raw waiting time data
+        workers (int): number of worker processes
+        shard_by (str): "attraction" or "attraction-year". Defaults to "attraction".
+        validation_sample (int): only validate this many random datapoints of each
+            shard. Optional.
+        compact_exploration (bool): return the exploration data in the compact
+            encoding (see `compact_exploration_from_parsed`). Defaults to False.
+
+    Returns:
+        pd.DataFrame: exploration data, ordered by id
+        pd.DataFrame: training data
+    """
+
+    shards = shard_waiting_times(df, shard_by)
+    logging.info(f"Processing {len(shards)} shards on {workers} workers...")
+
+    process_shard = functools.partial(
+        _process_shard,
+        validation_sample=validation_sample,
+        compact_exploration=compact_exploration,
+    )
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(process_shard, shards))
+
+    exploration_df = pd.concat([exploration for exploration, _ in results])
+    half_hour_means = pd.concat([means for _, means in results])
+
+    if compact_exploration:
+        # the categories of the shards differ
+        exploration_df = apply_schema(
+            exploration_df.astype({"attraction": "category"}),
+            "waiting_times_exploration_compact",
+        )
+
+    return (
+        exploration_df.sort_index(kind="stable"),
+        finish_half_hours(half_hour_means.sort_index()),
+    )
+
+
+def partition_keys(attractions: pd.Series, dates: pd.Series) -> pd.Series:
+    """key of the (attraction, day) partition of each datapoint.
+
+    Args:
+        attractions (pd.Series): name of the attraction of each datapoint
+        dates (pd.Series): timestamp or day of each datapoint as str, starting with
+            YYYY-MM-DD
+
+    Returns:
+        pd.Series: "<attraction>|<YYYY-MM-DD>" for each datapoint
+    """
+    return attractions.astype(str) + "|" + dates.astype(str).str.slice(0, 10)
+
+
+def _days(timestamps: pd.Series) -> np.ndarray:
+    # the YYYY-MM-DD prefix of the timestamps. NumPy truncates them faster than
+    # `.str.slice(0, 10)`, whose strings keep the memory of every chunk allocated
+    return timestamps.to_numpy().astype("U10")
+
+
+def _partition_codes(
+    attractions: pd.Series, days: Union[pd.Series, np.ndarray]
+) -> Tuple[np.ndarray, pd.Series]:
+    # the partition of each datapoint as position in the keys of all partitions, only
+    # the keys of the partitions are built as strings, not the key of every datapoint
+    attraction_codes, unique_attractions = pd.factorize(attractions)
+    day_codes, unique_days = pd.factorize(days)
+    partitions, codes = np.unique(
+        attraction_codes * len(unique_days) + day_codes, return_inverse=True
+    )
+
+    keys = partition_keys(
+        pd.Series(unique_attractions[partitions // len(unique_days)]),
+        pd.Series(unique_days[partitions % len(unique_days)]),
+    )
+    return codes, keys
+
+
+def _in_partitions(
+    attractions: pd.Series, days: Union[pd.Series, np.ndarray], keys: Set[str]
+) -> np.ndarray:
+    # whether each datapoint is in one of the partitions with these keys
+    codes, partitions = _partition_codes(attractions, days)
+    return partitions.isin(keys).to_numpy()[codes]
+
+
+def _fingerprint_partitions(
+    df: pd.DataFrame,
+) -> Tuple[np.ndarray, pd.Series, np.ndarray]:
+    # the partition codes and keys of the datapoints (see `_partition_codes`) and the
+    # fingerprints of the partitions
+    codes, keys = _partition_codes(df.attraction, _days(df.datum))
+
+    row_hashes = pd.util.hash_pandas_object(
+        df[["datum", "wartezeit", "status"]], index=False
+    ).to_numpy()
+
+    # uint64 addition wraps around, so the sum does not depend on the row order
+    fingerprints = np.zeros(len(keys), dtype=np.uint64)
+    np.add.at(fingerprints, codes, row_hashes)
+
+    return codes, keys, fingerprints
+
+
+def partition_fingerprints(df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """fingerprint the raw datapoints of each (attraction, day) partition.
+
+    The fingerprint of a partition is the sum of the hashes of its datapoints (`datum`,
+    `wartezeit` and `status`). The `id` is not part of it, as the ids of all later
+    datapoints shift when datapoints are added to the raw data.
+
+    The keys are returned as NumPy str array, so that the fingerprints of many chunks
+    are added up in one vectorized pass by `sum_fingerprints`.
+
+    Args:
+        df (pd.DataFrame): raw waiting time data
+
+    Returns:
+        np.ndarray: key of each partition (see `partition_keys`)
+        np.ndarray: fingerprint (uint64) of each partition
+    """
+
+    _, keys, fingerprints = _fingerprint_partitions(df)
+    return keys.to_numpy(dtype=str), fingerprints
+
+
+def sum_fingerprints(parts: List[Tuple[np.ndarray, np.ndarray]]) -> Dict[str, str]:
+    """add up the outputs of `partition_fingerprints` for several parts (e.g. chunks) of
+    the raw data, as partitions may span several parts.
+
+    Args:
+        parts (List[Tuple[np.ndarray, np.ndarray]]): keys and fingerprints of the
+            partitions of each part
+
+    Returns:
+        Dict[str, str]: fingerprint (a uint64 as str) of each partition key
+    """
+
+    if not parts:
+        return {}
+
+    keys, inverse = np.unique(
+        np.concatenate([keys for keys, _ in parts]), return_inverse=True
+    )
+    fingerprints = np.zeros(len(keys), dtype=np.uint64)
+    np.add.at(fingerprints, inverse, np.concatenate([fps for _, fps in parts]))
+
+    return dict(zip(keys.tolist(), fingerprints.astype(str)))
+
+
+def _write_state(
+    state_path: Path,
+    fingerprints: Dict[str, str],
+    next_training_id: int,
+    next_exploration_id: Optional[int],
+    compact_exploration: bool,
+):
+    state = {
+        "version": _STATE_VERSION,
+        "watermark": max(key.rsplit("|", 1)[1] for key in fingerprints),
+        "next_training_id": next_training_id,
+        "next_exploration_id": next_exploration_id,
+        "compact_exploration": compact_exploration,
+        "partitions": fingerprints,
+    }
+
+    tmp_path = f"{state_path}.tmp"
+    Path(tmp_path).write_text(json.dumps(state))
+    os.replace(tmp_path, state_path)
+
+
+def _iter_exploration(
+    exploration_path: Union[str, PathLike], schema_name: str
+) -> Iterator[pd.DataFrame]:
+    if dataset_format(exploration_path) != "csv":
+        return iter_dataset(exploration_path, schema_name, DEFAULT_CHUNK_SIZE)
+
+    # csv rows are copied as they are
+    return pd.read_csv(
+        exploration_path,
+        index_col="id",
+        dtype=str,
+        keep_default_na=False,
+        chunksize=DEFAULT_CHUNK_SIZE,
+    )
+
+
+def _rewrite_exploration(
+    exploration_path: Union[str, PathLike],
+    schema_name: str,
+    stale_keys: Set[str],
+    new_path: Path,
+):
+    # stream the existing and the new rows (if any were written to `new_path`), so
+    # the exploration data never has to fit into memory
+    exploration_path = Path(exploration_path)
+    tmp_path = exploration_path.with_suffix(f".tmp{exploration_path.suffix}")
+
+    with DatasetWriter(tmp_path, schema_name) as writer:
+        for chunk in _iter_exploration(exploration_path, schema_name):
+            stale = _in_partitions(chunk.attraction, chunk.date, stale_keys)
+            if not stale.all():
+                writer.write(chunk[~stale])
+
+        if new_path.exists():
+            for chunk in _iter_exploration(new_path, schema_name):
+                writer.write(chunk)
+
+    os.replace(tmp_path, exploration_path)
+
+
+def _merge_exploration(
+    exploration_path: Path,
+    schema_name: str,
+    stale_keys: Set[str],
+    new_path: Path,
+):
+    # only csv files can be appended to
+    if stale_keys or dataset_format(exploration_path) != "csv":
+        _rewrite_exploration(exploration_path, schema_name, stale_keys, new_path)
+    elif new_path.exists():
+        with open(new_path) as new_file, open(exploration_path, "a") as file:
+            new_file.readline()  # header
+            shutil.copyfileobj(new_file, file)
+
+    if new_path.exists():
+        new_path.unlink()
+
+
+def _sort_training(df: pd.DataFrame) -> pd.DataFrame:
+    # sort the attractions by name, not by the order of their categories
+    return df.astype({"attraction": str}).sort_values(
+        by=["attraction", "date", "half_hour_slot"], kind="stable"
+    )
+
+
+def _rewrite_training(
+    output_path: Union[str, PathLike], stale_keys: Set[str], new_df: pd.DataFrame
+):
+    # merge the new rows into the existing ones chunk by chunk, both are sorted by
+    # attraction, date and half hour and no half hour is in both
+    output_path = Path(output_path)
+    tmp_path = output_path.with_suffix(f".tmp{output_path.suffix}")
+
+    new_df = _sort_training(new_df)
+    new_keys = list(
+        new_df[["attraction", "date", "half_hour_slot"]].itertuples(
+            index=False, name=None
+        )
+    )
+    start = 0
+    written = False
+
+    with DatasetWriter(tmp_path, "waiting_times_training") as writer:
+        for chunk in iter_dataset(
+            output_path, "waiting_times_training", DEFAULT_CHUNK_SIZE
+        ):
+            chunk = chunk[
+                ~_in_partitions(chunk.attraction, chunk.date, stale_keys)
+            ].astype({"attraction": str})
+            if chunk.empty:
+                continue
+
+            last_key = tuple(chunk.iloc[-1][["attraction", "date", "half_hour_slot"]])
+            stop = bisect.bisect_right(new_keys, last_key, lo=start)
+            writer.write(_sort_training(pd.concat([chunk, new_df.iloc[start:stop]])))
+            start = stop
+            written = True
+
+        if start < len(new_df) or not written:
+            writer.write(new_df.iloc[start:])
+
+    os.replace(tmp_path, output_path)
+
+
+def _load_state(
+    state_path: Path,
+    output_path: Union[str, PathLike],
+    exploration_path: Optional[Union[str, PathLike]],
+    compact_exploration: bool,
+) -> Optional[dict]:
+    # state of the last run, if its outputs can be updated
+    if not (state_path.exists() and Path(output_path).exists()):
+        return None
+
+    state = json.loads(state_path.read_text())
+
+    if state.get("version", 1) != _STATE_VERSION:
+        return None
+    if exploration_path and (
+        state["next_exploration_id"] is None
+        or not Path(exploration_path).exists()
+        or state.get("compact_exploration", False) != compact_exploration
+    ):
+        return None
+
+    return state
+
+
+def _fingerprint_chunks(
+    chunks: Iterator[pd.DataFrame],
+    fingerprint_parts: List[Tuple[np.ndarray, np.ndarray]],
+    skipped_keys: Set[str],
+) -> Iterator[pd.DataFrame]:
+    # fingerprint the partitions of the chunks on the way (see
+    # `partition_fingerprints`) and pass on all datapoints but those of `skipped_keys`
+    for df in chunks:
+        codes, keys, fingerprints = _fingerprint_partitions(df)
+        fingerprint_parts.append((keys.to_numpy(dtype=str), fingerprints))
+
+        yield df[~keys.isin(skipped_keys).to_numpy()[codes]]
+
+
+def _new_exploration_writer(
+    exploration_path: Optional[Union[str, PathLike]], schema_name: str, update: bool
+) -> Tuple[Optional[DatasetWriter], Optional[Path]]:
+    # writer of the exploration rows of the processed partitions and its path. When
+    # updating existing exploration data, the rows are written to a separate file
+    # that is merged into it once all partitions are processed
+    if not exploration_path:
+        return None, None
+
+    path = Path(exploration_path)
+    if update:
+        path = path.with_suffix(f".new{path.suffix}")
+
+    return DatasetWriter(path, schema_name), path
+
+
+def _process_partitions(
+    input_path: Union[str, PathLike],
+    processed: Dict[str, str],
+    to_exploration: Callable,
+    exploration_writer: Optional[DatasetWriter],
+    chunk_size: int,
+    max_memory: Optional[float],
+    validation_sample: Optional[int],
+) -> Tuple[Dict[str, str], Set[str], pd.DataFrame]:
+    # process the partitions that are not in `processed` while fingerprinting all of
+    # them, then those whose fingerprint changed. Returns the fingerprints, the keys
+    # of the changed partitions and the partial half hours of the processed ones
+    fingerprint_parts = []
+    partials = _process_chunks(
+        _fingerprint_chunks(
+            _read_chunks(input_path, chunk_size, max_memory),
+            fingerprint_parts,
+            set(processed),
+        ),
+        to_exploration,
+        exploration_writer,
+        validation_sample,
+    )
+
+    fingerprints = sum_fingerprints(fingerprint_parts)
+    if not fingerprints:
+        raise ValueError(f"{input_path} contains no datapoints")
+
+    changed_keys = {
+        key
+        for key in fingerprints.keys() & processed.keys()
+        if fingerprints[key] != processed[key]
+    }
+
+    # the input is only read again if partitions were changed, all other partitions
+    # at or below the watermark are skipped
+    if changed_keys:
+        logging.info(f"{len(changed_keys)} partitions changed, processing them...")
+        changed_partials = _process_chunks(
+            (
+                df[_in_partitions(df.attraction, _days(df.datum), changed_keys)]
+                for df in _read_chunks(input_path, chunk_size, max_memory)
+            ),
+            to_exploration,
+            exploration_writer,
+            validation_sample,
+        )
+        partials = pd.concat([partials, changed_partials])
+
+    return fingerprints, changed_keys, partials
+
+
+def process_incrementally(
+    input_path: Union[str, PathLike],
+    output_path: Union[str, PathLike],
+    exploration_path: Optional[Union[str, PathLike]] = None,
+    validation_sample: Optional[int] = None,
+    compact_exploration: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_memory: Optional[float] = None,
+):
+    """process only the (attraction, day) partitions of the raw waiting time csv at
+    `input_path` that are new or changed since the last run, and merge them into the
+    existing outputs.
+
+    The state of the last run is stored in `<OUTPUT_PATH>.state.json`: the watermark
+    (the latest day processed), a fingerprint of each processed partition (see
+    `partition_fingerprints`) and the next free ids. Without a valid state, all
+    datapoints are processed.
+
+    The input is streamed in chunks, like in `process_in_chunks`. All partitions are
+    fingerprinted and those that are not in the state (e.g. all partitions after the
+    watermark) are processed on the way. The partitions at or below the watermark are
+    skipped, unless their fingerprint changed: only then the input is streamed a
+    second time to process them. The existing outputs are streamed as well, so neither
+    the input nor the outputs have to fit into memory.
+
+    The outputs contain the same datapoints as when processing all datapoints at once
+    and the training data keeps its order. Datapoints of unchanged partitions keep
+    their ids, reprocessed datapoints get new ids. If only partitions were added and
+    EXPLORATION is a csv file, the new exploration rows are appended, otherwise the
+    exploration data is rewritten without the stale rows.
+
+    Args:
+        input_path (str | PathLike): raw waiting time csv
+        output_path (str | PathLike): where to store the training data
+        exploration_path (str | PathLike): where to store the exploration data.
+            Optional.
+        validation_sample (int): only validate this many random datapoints of each
+            processed chunk. Optional.
+        compact_exploration (bool): store the exploration data in the compact encoding
+            (see `compact_exploration_from_parsed`). If this differs from the last run,
+            all datapoints are processed. Defaults to False.
+        chunk_size (int): number of datapoints read at once. Defaults to
+            DEFAULT_CHUNK_SIZE.
+        max_memory (float): memory cap in MB, see `process_in_chunks`. Optional.
+
+    Raises:
+        ValueError: `input_path` contains no datapoints
+    """
+
+    state_path = Path(f"{output_path}.state.json")
+    state = _load_state(state_path, output_path, exploration_path, compact_exploration)
+
+    if state is None:
+        logging.info("No state of a previous run, processing all datapoints...")
+        if state_path.exists():
+            state_path.unlink()
+
+    to_exploration, exploration_schema = _exploration_dataset(compact_exploration)
+    next_exploration_id = state["next_exploration_id"] if state else 0
+
+    def exploration_rows(parsed_df: pd.DataFrame) -> pd.DataFrame:
+        nonlocal next_exploration_id
+        exploration_df = to_exploration(parsed_df)
+        # processing all datapoints keeps the ids of the raw data
+        if state:
+            exploration_df.index = pd.RangeIndex(
+                next_exploration_id,
+                next_exploration_id + len(exploration_df),
+                name="id",
+            )
+        next_exploration_id = max(
+            next_exploration_id, int(exploration_df.index.max()) + 1
+        )
+        return exploration_df
+
+    exploration_writer, new_exploration_path = _new_exploration_writer(
+        exploration_path, exploration_schema, update=state is not None
+    )
+
+    fingerprints, changed_keys, partials = _process_partitions(
+        input_path,
+        state["partitions"] if state else {},
+        exploration_rows,
+        exploration_writer,
+        chunk_size,
+        max_memory,
+        validation_sample,
+    )
+
+    if exploration_writer:
+        exploration_writer.close()
+
+    # training data: one row per half hour of the processed partitions
+    new_training_df = finish_half_hours(mean_from_partial_half_hours(partials))
+
+    if state is None:
+        write_dataset(new_training_df, output_path, "waiting_times_training")
+        _write_state(
+            state_path,
+            fingerprints,
+            next_training_id=len(partials),
+            next_exploration_id=next_exploration_id if exploration_path else None,
+            compact_exploration=compact_exploration,
+        )
+        return
+
+    processed = state["partitions"]
+    new_keys = fingerprints.keys() - processed.keys()
+    removed_keys = processed.keys() - fingerprints.keys()
+
+    logging.info(
+        f"{len(new_keys)} new, {len(changed_keys)} changed and {len(removed_keys)} "
+        f"removed partitions since watermark {state['watermark']}"
+    )
+
+    if not (new_keys or changed_keys or removed_keys):
+        return
+
+    # invalidate the state until the outputs are consistent again
+    state_path.unlink()
+
+    stale_keys = changed_keys | removed_keys
+
+    new_training_df = apply_schema(new_training_df, "waiting_times_training")
+    new_training_df.index += state["next_training_id"]
+    _rewrite_training(output_path, stale_keys, new_training_df)
+
+    if exploration_path:
+        _merge_exploration(
+            Path(exploration_path), exploration_schema, stale_keys, new_exploration_path
+        )
+
+    _write_state(
+        state_path,
+        fingerprints,
+        next_training_id=state["next_training_id"] + len(partials),
+        next_exploration_id=next_exploration_id if exploration_path else None,
+        compact_exploration=compact_exploration,
+    )
 
 
 @click.command(help=__doc__)
@@ -190,23 +1219,138 @@ def transform_dataframe_training(waiting_time_df: pd.DataFrame) -> pd.DataFrame:
     type=click.Path(),
     help="where to store the data in exploration format",
 )
-def main(input_path: str, output_path: str, exploration: Optional[str]):
+@click.option(
+    "--incremental",
+    is_flag=True,
+    help="only process days that are new or changed since the last run",
+)
+@click.option(
+    "-w",
+    "--workers",
+    default=None,
+    type=click.IntRange(min=1),
+    help="process the shards of the data on this many processes",
+)
+@click.option(
+    "--shard-by",
+    default="attraction",
+    type=click.Choice(["attraction", "attraction-year"]),
+    help="how to shard the data for --workers",
+)
+@click.option(
+    "--validation-sample",
+    default=None,
+    type=click.IntRange(min=1),
+    help="only validate this many random datapoints (per chunk or shard)",
+)
+@click.option(
+    "--chunk-size",
+    default=None,
+    type=click.IntRange(min=1),
+    help="stream the input in chunks of this many datapoints",
+)
+@click.option(
+    "--max-memory",
+    default=None,
+    type=click.FloatRange(min=0),
+    help="memory cap in MB, shrinks the chunk size when exceeded (implies chunking)",
+)
+@click.option(
+    "--compact-exploration",
+    is_flag=True,
+    help="store EXPLORATION in the compact encoding (integer times, categories)",
+)
+@click.option(
+    "--backend",
+    default="pandas",
+    type=click.Choice(BACKENDS),
+    help="library that runs the transformations",
+)
+def main(
+    input_path: str,
+    output_path: str,
+    exploration: Optional[str],
+    incremental: bool,
+    workers: Optional[int],
+    shard_by: str,
+    validation_sample: Optional[int],
+    chunk_size: Optional[int],
+    max_memory: Optional[float],
+    compact_exploration: bool,
+    backend: str,
+):
     logging.basicConfig(format=LOGGING_FORMAT_STR, level=logging.INFO)
 
+    chunked = chunk_size is not None or max_memory is not None
+    if sum([incremental or chunked, workers is not None, backend == "polars"]) > 1:
+        raise click.UsageError(
+            "--incremental or --chunk-size/--max-memory, --workers and --backend "
+            "polars are exclusive"
+        )
+
+    if backend == "polars":
+        from src.data import polars_backend
+
+        polars_backend.process_waiting_times(
+            input_path, output_path, exploration, compact_exploration
+        )
+        logging.info("done")
+        return
+
+    if incremental:
+        process_incrementally(
+            input_path,
+            output_path,
+            exploration,
+            validation_sample,
+            compact_exploration,
+            chunk_size or DEFAULT_CHUNK_SIZE,
+            max_memory,
+        )
+        logging.info("done")
+        return
+
+    if chunked:
+        process_in_chunks(
+            input_path,
+            output_path,
+            exploration,
+            chunk_size or DEFAULT_CHUNK_SIZE,
+            max_memory,
+            validation_sample,
+            compact_exploration,
+        )
+        logging.info("done")
+        return
+
+    to_exploration, exploration_schema = _exploration_dataset(compact_exploration)
+
     df = pd.read_csv(input_path, index_col="id")
 
-    assert_waiting_time_state_consistency(df)
+    if workers is not None:
+        exploration_df, training_df = process_in_parallel(
+            df, workers, shard_by, validation_sample, compact_exploration
+        )
+        if exploration:
+            write_dataset(exploration_df, exploration, exploration_schema)
+        write_dataset(training_df, output_path, "waiting_times_training")
+        logging.info("done")
+        return
+
+    assert_waiting_time_state_consistency(df, validation_sample)
 
-    logging.info("Transforming dataframe for exploration...")
-    df = transform_dataframe_exploration(df)
+    logging.info("Parsing timestamps...")
+    parsed_df = parse_waiting_times(df)
+    del df
 
     if exploration:
-        df.to_csv(exploration)
+        logging.info("Transforming dataframe for exploration...")
+        write_dataset(to_exploration(parsed_df), exploration, exploration_schema)
 
     logging.info("Transforming dataframe for training...")
-    df = transform_dataframe_training(df)
-
-    df.to_csv(output_path)
+    write_dataset(
+        training_from_parsed(parsed_df), output_path, "waiting_times_training"
+    )
 
     logging.info("done")
 
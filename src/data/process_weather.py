@@ -11,28 +11,65 @@ provided by the DWD. The current daily weather data zip files is called
 The resulting CSV file contains one row for each date between 2019-01-01 and the newest
 date in the data. It contains all columns from the original data (except for station
 id), but with a more readable name.
+
+Only the columns in DWD_COLUMN_NAMES2DESCRIPTION and the datapoints since DWD_MIN_DATE
+are parsed. With `--cache-dir`, the parsed archives are cached as parquet files, so
+unchanged archives are not decompressed and parsed again. If OUTPUT_PATH ends with
+".parquet", the data is stored as typed parquet file (see `src/data/storage.py`).
 """
 
 from zipfile import ZipFile
-from typing import Tuple, Union, IO
+from typing import Callable, Iterable, Optional, Tuple, Union, IO
 from os import PathLike
+from pathlib import Path
+import functools
+import hashlib
+import json
+import logging
+import os
 
 import pandas as pd
 import numpy as np
 import click
 
-from src.data.constants import DWD_COLUMN_NAMES2DESCRIPTION
+from src.data.constants import (
+    DWD_COLUMN_NAMES2DESCRIPTION,
+    DWD_MIN_DATE,
+    LOGGING_FORMAT_STR,
+)
+from src.data.storage import write_dataset
+from src.data.validation import validate
+
+
+def _column_filter(columns: Optional[Iterable[str]]) -> Optional[Callable[[str], bool]]:
+    # `usecols` of `pd.read_csv` for `columns` and the date, None for all columns
+    if columns is None:
+        return None
+
+    wanted_columns = {"MESS_DATUM", *columns}
+    # the column names in the DWD files are padded with whitespace
+    return lambda name: name.strip() in wanted_columns
 
 
-def extract_dwd_archive(zip_file: Union[str, PathLike, IO]) -> pd.DataFrame:
+def extract_dwd_archive(
+    zip_file: Union[str, PathLike, IO],
+    columns: Optional[Iterable[str]] = None,
+    min_date: Optional[str] = None,
+) -> pd.DataFrame:
     """Extract the weather data from one DWD OpenData zip file.
 
     This function extracts the actual weather data from the zip file and transforms it
     to a DataFrame. The zip archive is expected to contain exactly one file starting
     with "produkt_klima", which is the CSV file to be parsed.
 
+    Only `columns` are parsed and datapoints before `min_date` are dropped while the
+    dates are still integers (YYYYMMDD), before anything else is converted.
+
     Args:
         zip_file (str | PathLike | IO): zip file to process.
+        columns (Iterable[str]): original DWD names of the columns to parse, e.g.
+            "MESS_DATUM". Defaults to all columns.
+        min_date (str): drop all datapoints before this date (YYYY-MM-DD). Optional.
 
     Raises:
         ValueError: the archive contains multiple files starting with "produkt_klima"
@@ -40,6 +77,8 @@ def extract_dwd_archive(zip_file: Union[str, PathLike, IO]) -> pd.DataFrame:
     Returns: pd.DataFrame: weather data as DataFrame
     """
 
+    usecols = _column_filter(columns)
+
     with ZipFile(zip_file, mode="r") as archive:
 
         data_file_names = [
@@ -53,7 +92,15 @@ def extract_dwd_archive(zip_file: Union[str, PathLike, IO]) -> pd.DataFrame:
             )
 
         with archive.open(data_file_names[0]) as fp:
-            df = pd.read_csv(fp, sep=";", parse_dates=["MESS_DATUM"])
+            df = pd.read_csv(fp, sep=";", usecols=usecols)
+
+    df.columns = [col.strip() for col in df.columns]
+
+    if min_date is not None:
+        df = df[df.MESS_DATUM.to_numpy() >= int(min_date.replace("-", ""))]
+        df.reset_index(drop=True, inplace=True)
+
+    df["MESS_DATUM"] = pd.to_datetime(df.MESS_DATUM.astype(str), format="%Y%m%d")
 
     return df
 
@@ -72,7 +119,8 @@ def clean_dwd_data(df: pd.DataFrame) -> pd.DataFrame:
     """
 
     df.replace(-999, np.nan, inplace=True)
-    df.drop(columns=["eor"], inplace=True)  # drop end of record marker
+    # drop end of record marker, unless it was not extracted in the first place
+    df.drop(columns=["eor"], inplace=True, errors="ignore")
     # remove whitespace in column headers
     df.columns = [col.strip() for col in df.columns]
     # make column names human-readable
@@ -81,10 +129,72 @@ def clean_dwd_data(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+def _file_sha256(path: Union[str, PathLike]) -> str:
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as fp:
+        for block in iter(functools.partial(fp.read, 1 << 16), b""):
+            sha256.update(block)
+    return sha256.hexdigest()
+
+
+def load_dwd_archive(
+    zip_path: Union[str, PathLike],
+    cache_dir: Optional[Union[str, PathLike]] = None,
+    columns: Optional[Iterable[str]] = DWD_COLUMN_NAMES2DESCRIPTION,
+    min_date: Optional[str] = DWD_MIN_DATE,
+) -> pd.DataFrame:
+    """extract (see `extract_dwd_archive`) and clean (see `clean_dwd_data`) the weather
+    data of one DWD OpenData zip file.
+
+    With `cache_dir`, the cleaned data is cached as parquet file. The cache is keyed by
+    the sha256 of the archive, `columns` and `min_date`, so a changed archive is parsed
+    again, and older cache files of the same archive are removed.
+
+    Args:
+        zip_path (str | PathLike): zip file to process
+        cache_dir (str | PathLike): directory of the parsed archive cache. Optional.
+        columns (Iterable[str]): original DWD names of the columns to parse. Defaults
+            to the columns in DWD_COLUMN_NAMES2DESCRIPTION.
+        min_date (str): drop all datapoints before this date (YYYY-MM-DD). Defaults to
+            DWD_MIN_DATE.
+
+    Returns:
+        pd.DataFrame: cleaned weather data
+    """
+
+    if cache_dir is None:
+        return clean_dwd_data(extract_dwd_archive(zip_path, columns, min_date))
+
+    columns = None if columns is None else sorted(columns)
+    key = hashlib.sha256(
+        json.dumps([_file_sha256(zip_path), columns, min_date]).encode()
+    ).hexdigest()[:16]
+
+    name = Path(zip_path).stem
+    cache_path = Path(cache_dir) / f"{name}.{key}.parquet"
+
+    if cache_path.exists():
+        logging.info(f"Loading {zip_path} from {cache_path}")
+        return pd.read_parquet(cache_path)
+
+    df = clean_dwd_data(extract_dwd_archive(zip_path, columns, min_date))
+
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_suffix(".tmp")
+    df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, cache_path)
+
+    for stale_path in cache_path.parent.glob(f"{name}.*.parquet"):
+        if stale_path != cache_path:
+            stale_path.unlink()
+
+    return df
+
+
 def merge_historical_current(
     df_current: pd.DataFrame, df_historical: pd.DataFrame
 ) -> Tuple[pd.DataFrame, int]:
-    """Merge current and historical data ranging from 2019-01-01 to the newest date.
+    """Merge current and historical data ranging from DWD_MIN_DATE to the newest date.
 
     This function als sets the data as index (after making sure all dates are unique)
     and drops the weather station id after checking that all datapoints stem from the
@@ -97,9 +207,8 @@ def merge_historical_current(
             `process_dwd_archive` and `clean_dwd_data`.
 
     Raises:
-        ValueError: either `df_current` or `df_historical` contain multiple entries for
-            the same date
-        ValueError: the merged entries do not all stem from the same weather station
+        ValueError: the merged entries contain multiple entries for the same date, or
+            do not all stem from the same weather station (see `validate`)
 
     Returns:
         pd.DataFrame: merged dataframe
@@ -108,31 +217,20 @@ def merge_historical_current(
 
     # there is a certain overlap between current and historical, therefore we only use
     # historical data that is not present in the current dataset. We also drop all
-    # datapoints older than 2019 because we do not need weather data from 1937.
+    # datapoints older than DWD_MIN_DATE because we do not need weather data from 1937
+    # (they are usually not even extracted, see `load_dwd_archive`).
     df_historical_relevant = df_historical[
-        (df_historical.date >= pd.to_datetime("2019-01-01"))
+        (df_historical.date >= pd.to_datetime(DWD_MIN_DATE))
         & (df_historical.date < df_current.date.min())
     ]
 
     df_merge = df_current.append(df_historical_relevant)
 
-    if not df_merge.date.is_unique:
-        value_counts = df_merge.date.value_counts()
-        raise ValueError(
-            f"daily weather data contains duplicates: {value_counts[value_counts > 1]}"
-        )
+    validate(df_merge, "daily_weather").raise_if_failed()
 
     df_merge.set_index("date", inplace=True)
 
-    unique_station_ids = df_merge.station_id.unique()
-
-    if len(unique_station_ids) > 1:
-        raise ValueError(
-            f"Cannot merge data from multiple weather stations. "
-            f"station ids {unique_station_ids}"
-        )
-
-    (station_id,) = unique_station_ids
+    station_id = df_merge.station_id.iloc[0]
 
     df_merge.drop(columns=["station_id"], inplace=True)
     df_merge.sort_index(ascending=False, inplace=True)
@@ -140,21 +238,78 @@ def merge_historical_current(
     return df_merge, station_id
 
 
+def load_station(
+    current_path: Union[str, PathLike],
+    historical_path: Union[str, PathLike],
+    cache_dir: Optional[Union[str, PathLike]] = None,
+    columns: Iterable[str] = DWD_COLUMN_NAMES2DESCRIPTION,
+) -> Tuple[pd.DataFrame, int]:
+    """load and merge the current and historical archive of one weather station.
+
+    Args:
+        current_path (str | PathLike): zip file with the current data
+        historical_path (str | PathLike): zip file with the historical data
+        cache_dir (str | PathLike): directory of the parsed archive cache (see
+            `load_dwd_archive`). Optional.
+        columns (Iterable[str]): original DWD names of the columns to parse, must
+            include "STATIONS_ID". Defaults to the columns in
+            DWD_COLUMN_NAMES2DESCRIPTION.
+
+    Returns:
+        pd.DataFrame: merged data, see `merge_historical_current`
+        int: id of the weather station
+    """
+
+    current_df = load_dwd_archive(current_path, cache_dir, columns)
+    historical_df = load_dwd_archive(historical_path, cache_dir, columns)
+
+    return merge_historical_current(current_df, historical_df)
+
+
+def process_station(
+    current_path: Union[str, PathLike],
+    historical_path: Union[str, PathLike],
+    output_path: Union[str, PathLike],
+    cache_dir: Optional[Union[str, PathLike]] = None,
+) -> int:
+    """process the current and historical archive of one weather station and store the
+    merged data as csv or parquet file (see `src/data/storage.py`).
+
+    Args:
+        current_path (str | PathLike): zip file with the current data
+        historical_path (str | PathLike): zip file with the historical data
+        output_path (str | PathLike): where to store the merged data
+        cache_dir (str | PathLike): directory of the parsed archive cache (see
+            `load_dwd_archive`). Optional.
+
+    Returns:
+        int: id of the weather station
+    """
+
+    df, station_id = load_station(current_path, historical_path, cache_dir)
+
+    write_dataset(df, output_path, "weather")
+
+    return station_id
+
+
 @click.command(help=__doc__)
 @click.argument("current_path", type=click.Path(exists=True))
 @click.argument("historical_path", type=click.Path(exists=True))
 @click.argument("output_path", type=click.Path())
-def main(current_path, historical_path, output_path):
-
-    current_df = clean_dwd_data(extract_dwd_archive(current_path))
-    historical_df = clean_dwd_data(extract_dwd_archive(historical_path))
+@click.option(
+    "--cache-dir",
+    default=None,
+    type=click.Path(file_okay=False),
+    help="cache the parsed archives as parquet files in this directory",
+)
+def main(current_path, historical_path, output_path, cache_dir):
+    logging.basicConfig(format=LOGGING_FORMAT_STR, level=logging.INFO)
 
-    df, station_id = merge_historical_current(current_df, historical_df)
+    station_id = process_station(current_path, historical_path, output_path, cache_dir)
 
     print("Station ID: ", station_id)
 
-    df.to_csv(output_path)
-
 
 if __name__ == "__main__":
 
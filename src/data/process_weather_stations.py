@@ -0,0 +1,205 @@
+"""
+Project: Phantasialand
+State: 10/2026
+
+Process the current and historical daily weather data of any number of weather stations
+of the Deutscher Wetterdienst and join them into one wide table at OUTPUT_PATH.
+
+Each station is given as `-s PREFIX CURRENT_PATH HISTORICAL_PATH`, where CURRENT_PATH
+and HISTORICAL_PATH are the zip archives of the station (see `process_weather.py`). The
+stations are processed in parallel, one process per station.
+
+OUTPUT_PATH is indexed by date and contains the columns of all stations, prefixed with
+the PREFIX of the station (e.g. `lommersum_mean_temperature`). Only the columns used by
+the featurization (see `src/features/columns.py`) are parsed from the archives, unless
+`--all-columns` is given. Columns without any value are dropped (see
+`prepare_weather`). The table contains each date for which any
+of the stations has data. It is written as parquet file if its suffix is ".parquet".
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from os import PathLike
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+import logging
+
+import pandas as pd
+import click
+
+from src.data.constants import (
+    DWD_COLUMN_NAMES2DESCRIPTION,
+    LOGGING_FORMAT_STR,
+    WEATHER_TABLE_PATH,
+)
+from src.data.process_weather import load_station
+from src.data.registry import get_dataset
+from src.data.storage import find_dataset, write_dataset
+from src.features.columns import SELECTED_WEATHER_COLUMNS
+
+
+def prepare_weather(weather_df: pd.DataFrame, prefix: str) -> pd.DataFrame:
+    """remove columns where all values are NaN and add a prefix to each column name
+
+    Args:
+        weather_df (pd.DataFrame): DataFrame to modify
+        prefix (str): prefix string
+
+    Returns:
+        pd.DataFrame: modified DataFrame
+    """
+    return weather_df.dropna(axis="columns", how="all").add_prefix(prefix)
+
+
+def station_columns(prefix: str, weather_columns: Iterable[str]) -> List[str]:
+    """original DWD names of the columns to parse from the archives of a station: its
+    id, the date and each column whose prefixed name is in `weather_columns`.
+
+    Args:
+        prefix (str): prefix of the station, e.g. "lommersum_"
+        weather_columns (Iterable[str]): prefixed names of the weather columns needed,
+            e.g. SELECTED_WEATHER_COLUMNS
+
+    Returns:
+        List[str]: DWD column names, e.g. ["STATIONS_ID", "MESS_DATUM", "RSK"]
+    """
+
+    weather_columns = set(weather_columns)
+
+    return [
+        "STATIONS_ID",
+        "MESS_DATUM",
+        *(
+            name
+            for name, description in DWD_COLUMN_NAMES2DESCRIPTION.items()
+            if prefix + description in weather_columns
+        ),
+    ]
+
+
+def _load_prepared_station(
+    prefix: str,
+    current_path: Union[str, PathLike],
+    historical_path: Union[str, PathLike],
+    cache_dir: Optional[Union[str, PathLike]],
+    weather_columns: Optional[Iterable[str]],
+) -> pd.DataFrame:
+    columns = (
+        DWD_COLUMN_NAMES2DESCRIPTION
+        if weather_columns is None
+        else station_columns(prefix, weather_columns)
+    )
+    df, station_id = load_station(current_path, historical_path, cache_dir, columns)
+    logging.info(f"Processed station {station_id} ({prefix})")
+    return prepare_weather(df, prefix)
+
+
+def process_stations(
+    stations: Sequence[Tuple[str, Union[str, PathLike], Union[str, PathLike]]],
+    cache_dir: Optional[Union[str, PathLike]] = None,
+    workers: Optional[int] = None,
+    weather_columns: Optional[Iterable[str]] = None,
+) -> pd.DataFrame:
+    """process the archives of several weather stations in parallel and join them into
+    one wide table.
+
+    Args:
+        stations (Sequence[Tuple[str, str | PathLike, str | PathLike]]): prefix, current
+            archive and historical archive of each station
+        cache_dir (str | PathLike): directory of the parsed archive cache (see
+            `load_dwd_archive`). Optional.
+        workers (int): number of worker processes. Defaults to one per station.
+        weather_columns (Iterable[str]): only parse the columns needed for these
+            prefixed weather columns (see `station_columns`), e.g.
+            SELECTED_WEATHER_COLUMNS. Defaults to all columns.
+
+    Raises:
+        ValueError: no stations or the same prefix is used for several stations
+
+    Returns:
+        pd.DataFrame: weather data of all stations, indexed by date (ascending)
+    """
+
+    prefixes = [prefix for prefix, _, _ in stations]
+    if not prefixes or len(set(prefixes)) != len(prefixes):
+        raise ValueError(f"need at least one station and unique prefixes, {prefixes=}")
+
+    with ProcessPoolExecutor(max_workers=workers or len(stations)) as executor:
+        futures = [
+            executor.submit(
+                _load_prepared_station, *station, cache_dir, weather_columns
+            )
+            for station in stations
+        ]
+        station_dfs = [future.result() for future in futures]
+
+    return pd.concat(station_dfs, axis="columns", join="outer").sort_index()
+
+
+def load_weather_table(
+    path: Union[str, PathLike] = WEATHER_TABLE_PATH,
+    columns: Optional[List[str]] = None,
+) -> pd.DataFrame:
+    """load the wide weather table written by this script.
+
+    Args:
+        path (str | PathLike): path of the table, csv, parquet or feather. If it does
+            not exist, the table is loaded in another format (see `find_dataset`).
+            Defaults to WEATHER_TABLE_PATH.
+        columns (List[str]): only load these columns. Optional.
+
+    Returns:
+        pd.DataFrame: weather data of all stations, indexed by date. A shallow copy of
+            the table loaded once per process (see `src/data/registry.py`).
+    """
+    return get_dataset(find_dataset(path), "weather", columns)
+
+
+@click.command(help=__doc__)
+@click.argument("output_path", type=click.Path())
+@click.option(
+    "-s",
+    "--station",
+    "stations",
+    multiple=True,
+    required=True,
+    type=(str, click.Path(exists=True), click.Path(exists=True)),
+    help="PREFIX CURRENT_PATH HISTORICAL_PATH of a station, can be given repeatedly",
+)
+@click.option(
+    "--cache-dir",
+    default=None,
+    type=click.Path(file_okay=False),
+    help="cache the parsed archives as parquet files in this directory",
+)
+@click.option(
+    "-w",
+    "--workers",
+    default=None,
+    type=click.IntRange(min=1),
+    help="number of worker processes, defaults to one per station",
+)
+@click.option(
+    "--all-columns",
+    is_flag=True,
+    help="parse all weather columns instead of only those used by the featurization",
+)
+def main(
+    output_path: str,
+    stations: Sequence[Tuple[str, str, str]],
+    cache_dir: Optional[str],
+    workers: Optional[int],
+    all_columns: bool,
+):
+    logging.basicConfig(format=LOGGING_FORMAT_STR, level=logging.INFO)
+
+    weather_df = process_stations(
+        stations,
+        cache_dir,
+        workers,
+        weather_columns=None if all_columns else SELECTED_WEATHER_COLUMNS,
+    )
+    write_dataset(weather_df, output_path, "weather")
+
+
+if __name__ == "__main__":
+
+    main()
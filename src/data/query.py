@@ -0,0 +1,179 @@
+"""
+Project: Phantasialand
+State: 10/2026
+
+Query the interim and processed datasets with DuckDB, an embedded analytical database.
+
+`connect` registers every dataset of TABLES that exists as a view of its file, in
+whichever storage format it was written (see `src/data/storage.py`). Queries on these
+views only read the needed columns (and, for parquet, row groups) and aggregate
+out-of-core, so filtering one attraction or aggregating by weekday does not load the
+whole dataset into a DataFrame first:
+
+    >>> con = connect()
+    >>> attraction_days(con, "Taron")
+    >>> con.execute("SELECT count(*) FROM exploration").fetchall()
+
+DuckDB is an optional dependency (see `requirements_dev.txt`).
+"""
+
+from os import PathLike
+from pathlib import Path
+from typing import Dict, Optional
+
+import duckdb
+import pandas as pd
+import pyarrow.dataset as ds
+
+from src.data.constants import DATA_PATH
+from src.data.storage import dataset_format, find_dataset
+
+# view name -> dataset path relative to DATA_PATH, in any storage format
+TABLES: Dict[str, str] = {
+    "waiting_times": "interim/waiting_times_training.csv",
+    "exploration": "interim/waiting_times_exploration.parquet",
+    "weather": "interim/weather.csv",
+    "public_holidays": "processed/public_holidays.csv",
+    "school_holidays": "processed/school_holidays.csv",
+    "datapoints": "processed/all_datapoints.csv",
+}
+
+
+def _sql_string(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def connect(
+    data_path: PathLike = DATA_PATH, database: str = ":memory:"
+) -> duckdb.DuckDBPyConnection:
+    """open a DuckDB connection with a view for each dataset of TABLES that exists.
+
+    Args:
+        data_path (PathLike): data directory. Defaults to DATA_PATH.
+        database (str): DuckDB database file. Defaults to an in-memory database.
+
+    Returns:
+        duckdb.DuckDBPyConnection: connection with the registered views
+    """
+
+    con = duckdb.connect(database)
+
+    for name, relative_path in TABLES.items():
+        path = find_dataset(Path(data_path) / relative_path)
+
+        if not path.exists():
+            continue
+
+        fmt = dataset_format(path)
+
+        if fmt == "feather":
+            # DuckDB scans arrow datasets lazily, batch by batch
+            con.register(name, ds.dataset(path, format="feather"))
+        else:
+            reader = "read_parquet" if fmt == "parquet" else "read_csv_auto"
+            con.execute(
+                f"CREATE OR REPLACE VIEW {name} AS "
+                f"SELECT * FROM {reader}({_sql_string(str(path))})"
+            )
+
+    return con
+
+
+def attraction_days(
+    con: duckdb.DuckDBPyConnection, attraction: Optional[str] = None
+) -> pd.DataFrame:
+    """aggregate the half-hour waiting times of each attraction and day.
+
+    Args:
+        con (duckdb.DuckDBPyConnection): connection returned by `connect`
+        attraction (str): only aggregate this attraction. Optional.
+
+    Returns:
+        pd.DataFrame: columns attraction, date, mean_waiting_time, max_waiting_time
+            and half_hours (number of half hours with waiting time), ordered by
+            attraction and date
+    """
+
+    return con.execute(
+        """
+        SELECT
+            attraction,
+            date,
+            avg(waiting_time) AS mean_waiting_time,
+            max(waiting_time) AS max_waiting_time,
+            count(*) AS half_hours
+        FROM waiting_times
+        WHERE ? IS NULL OR attraction = ?
+        GROUP BY attraction, date
+        ORDER BY attraction, date
+        """,
+        [attraction, attraction],
+    ).df()
+
+
+def weekday_means(
+    con: duckdb.DuckDBPyConnection, attraction: Optional[str] = None
+) -> pd.DataFrame:
+    """mean waiting time of each attraction on each weekday.
+
+    Each day is weighted equally, i.e. this is the mean of the daily means.
+
+    Args:
+        con (duckdb.DuckDBPyConnection): connection returned by `connect`
+        attraction (str): only aggregate this attraction. Optional.
+
+    Returns:
+        pd.DataFrame: columns attraction, day_of_week (0 is Monday), mean_waiting_time
+            and days, ordered by attraction and day_of_week
+    """
+
+    return con.execute(
+        """
+        SELECT
+            attraction,
+            isodow(date) - 1 AS day_of_week,
+            avg(mean_waiting_time) AS mean_waiting_time,
+            count(*) AS days
+        FROM (
+            SELECT attraction, date, avg(waiting_time) AS mean_waiting_time
+            FROM waiting_times
+            WHERE ? IS NULL OR attraction = ?
+            GROUP BY attraction, date
+        )
+        GROUP BY attraction, day_of_week
+        ORDER BY attraction, day_of_week
+        """,
+        [attraction, attraction],
+    ).df()
+
+
+def slot_means(
+    con: duckdb.DuckDBPyConnection, attraction: Optional[str] = None
+) -> pd.DataFrame:
+    """aggregate the waiting times of each attraction per half hour of the day.
+
+    Args:
+        con (duckdb.DuckDBPyConnection): connection returned by `connect`
+        attraction (str): only aggregate this attraction. Optional.
+
+    Returns:
+        pd.DataFrame: columns attraction, half_hour_slot (see `src/data/slots.py`),
+            mean_waiting_time, median_waiting_time and days, ordered by attraction and
+            half_hour_slot
+    """
+
+    return con.execute(
+        """
+        SELECT
+            attraction,
+            half_hour_slot,
+            avg(waiting_time) AS mean_waiting_time,
+            median(waiting_time) AS median_waiting_time,
+            count(*) AS days
+        FROM waiting_times
+        WHERE ? IS NULL OR attraction = ?
+        GROUP BY attraction, half_hour_slot
+        ORDER BY attraction, half_hour_slot
+        """,
+        [attraction, attraction],
+    ).df()
@@ -0,0 +1,77 @@
+"""
+Project: Phantasialand
+State: 10/2026
+
+Process-wide registry of loaded datasets.
+
+Each dataset (path, schema and selected columns) is read once per process with
+`read_dataset` and kept in memory, later requests get a shallow copy of the loaded
+DataFrame. Adding, replacing or dropping columns of such a copy does not affect the
+registry or other copies (this needs pandas 1.5 or newer, older versions write an
+assigned column into the shared data), but the column data is shared and must not be
+modified in place. For feather files, the column data is memory-mapped, so worker processes reading
+the same file share its pages instead of holding a private copy each. Numeric columns
+without missing values are read-only views of the file.
+
+A dataset is read again when its file was modified since it was loaded.
+"""
+
+from os import PathLike
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+import logging
+import threading
+import time
+
+import pandas as pd
+
+from src.data.storage import read_dataset
+
+
+class _Entry(NamedTuple):
+    # modification time and size of the file when it was loaded
+    stamp: Tuple[int, int]
+    df: pd.DataFrame
+
+
+_ENTRIES: Dict[Tuple[str, str, Optional[Tuple[str, ...]]], _Entry] = {}
+_LOCK = threading.Lock()
+
+
+def get_dataset(
+    path: Union[str, PathLike], schema_name: str, columns: Optional[List[str]] = None
+) -> pd.DataFrame:
+    """return the dataset at `path`, reading it only if it is not loaded yet or if the
+    file changed since.
+
+    Args:
+        path (str | PathLike): csv, parquet or feather file
+        schema_name (str): one of SCHEMAS of `src/data/storage.py`
+        columns (List[str]): only read these columns (and the index). Optional.
+
+    Returns:
+        pd.DataFrame: shallow copy of the loaded dataset
+    """
+
+    path = Path(path).resolve()
+    stat = path.stat()
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    key = (str(path), schema_name, tuple(columns) if columns is not None else None)
+
+    with _LOCK:
+        entry = _ENTRIES.get(key)
+
+        if entry is None or entry.stamp != stamp:
+            start = time.perf_counter()
+            entry = _Entry(stamp, read_dataset(path, schema_name, columns))
+            _ENTRIES[key] = entry
+            logging.debug(f"Loaded {path} in {time.perf_counter() - start:.2f}s")
+
+    return entry.df.copy(deep=False)
+
+
+def clear_registry():
+    """forget all loaded datasets."""
+
+    with _LOCK:
+        _ENTRIES.clear()
@@ -0,0 +1,89 @@
+"""
+Project: Phantasialand
+State: 10/2026
+
+Half-hour slots, the representation of the time of day in the training data and
+everything built on it.
+
+The waiting times are aggregated per half hour. Each half hour is stored as its slot
+index, the minutes since midnight divided by 30 (0 for 00:00 to 47 for 23:30), in the
+int8 column `half_hour_slot`. All group-bys, joins and features work on these one-byte
+integers, the slots are only converted to "HH:MM:00" strings for display (see
+`format_slots`).
+"""
+
+from typing import Iterable, Union
+import functools
+
+import numpy as np
+
+SLOT_SECONDS = 30 * 60
+
+SLOTS_PER_DAY = 24 * 60 * 60 // SLOT_SECONDS
+
+SLOT_DTYPE = np.int8
+
+
+def slots_from_seconds(seconds: np.ndarray) -> np.ndarray:
+    """slot of each time given as seconds since midnight, i.e. the time rounded down to
+    the half hour.
+
+    Args:
+        seconds (np.ndarray): integer seconds since midnight
+
+    Returns:
+        np.ndarray: slot indices (int8)
+    """
+    return (np.asarray(seconds) // SLOT_SECONDS).astype(SLOT_DTYPE)
+
+
+def slots_from_times(times: Iterable[str]) -> np.ndarray:
+    """slot of each time given as "HH:MM" or "HH:MM:SS" string.
+
+    Args:
+        times (Iterable[str]): time strings, e.g. "08:30:00"
+
+    Returns:
+        np.ndarray: slot indices (int8)
+    """
+    minutes = [int(time[:2]) * 60 + int(time[3:5]) for time in times]
+    return slots_from_seconds(np.array(minutes, dtype=np.int32) * 60)
+
+
+def slot_hours(slots: np.ndarray) -> np.ndarray:
+    """start of each slot in hours since midnight, e.g. 8.5 for 08:30.
+
+    Args:
+        slots (np.ndarray): slot indices
+
+    Returns:
+        np.ndarray: hours (float64)
+    """
+    return np.asarray(slots, dtype=np.float64) * (SLOT_SECONDS / 3600)
+
+
+@functools.lru_cache(maxsize=None)
+def _slot_strings(seconds: bool) -> np.ndarray:
+    """lookup table mapping slot indices to HH:MM(:SS) strings."""
+    return np.array(
+        [
+            f"{slot // 2:02d}:{slot % 2 * 30:02d}" + (":00" if seconds else "")
+            for slot in range(SLOTS_PER_DAY)
+        ],
+        dtype=object,
+    )
+
+
+def format_slots(
+    slots: Union[int, np.ndarray], seconds: bool = True
+) -> Union[str, np.ndarray]:
+    """format the start of each slot as "HH:MM:00" (or "HH:MM") string.
+
+    Args:
+        slots (int | np.ndarray): slot index or indices
+        seconds (bool): append the seconds. Defaults to True.
+
+    Returns:
+        str | np.ndarray: time string, or object array of time strings
+    """
+    return _slot_strings(seconds)[np.asarray(slots, dtype=np.intp)]
@@ -0,0 +1,360 @@
+"""
+Project: Phantasialand
+State: 10/2026
+
+Typed storage of the interim and processed datasets.
+
+Every dataset has a schema in SCHEMAS, which defines its index and the type of each
+column:
+- "category": pandas categorical (dictionary encoded in parquet)
+- "date": datetime64 in pandas, date32 in parquet and YYYY-MM-DD in csv
+- "str": strings, kept as they are (missing values stay missing)
+- any numpy dtype, e.g. "int16" or "float64"
+
+Datasets are stored as csv, parquet or feather files, the format is selected by the
+file suffix (".csv", ".parquet" or ".feather"). Whatever the format, `read_dataset`
+returns the same types. Parquet files are decoded with multiple threads and only the
+requested columns are read. Feather files are written uncompressed and memory-mapped
+when read, so numeric columns without missing values are read-only views of the file
+that all processes reading it share (see `src/data/registry.py`).
+"""
+
+from os import PathLike
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+
+FORMATS = ["csv", "parquet", "feather"]
+
+
+class Schema(NamedTuple):
+    # name of the index column, None if the index is not stored
+    index: Optional[str]
+    # type of each column, see module docstring
+    dtypes: Dict[str, str]
+    # type of all columns not in `dtypes`, None to keep them as they are
+    default: Optional[str] = None
+
+
+SCHEMAS: Dict[str, Schema] = {
+    "waiting_times_training": Schema(
+        index="id",
+        dtypes={
+            "attraction": "category",
+            "date": "date",
+            "half_hour_slot": "int8",
+            "waiting_time": "float64",
+        },
+    ),
+    "waiting_times_exploration": Schema(
+        index="id",
+        dtypes={
+            "attraction": "category",
+            "waiting_time": "int16",
+            "date": "date",
+            "time": "str",
+            "rounded_time": "str",
+        },
+    ),
+    # see `compact_exploration_from_parsed` in `process_waiting_times.py`
+    "waiting_times_exploration_compact": Schema(
+        index="id",
+        dtypes={
+            "attraction": "category",
+            "waiting_time": "int16",
+            "date": "date",
+            "minute": "int16",
+            "second": "int8",
+            "rounded_minute": "int16",
+        },
+    ),
+    # weather data of one or several stations
+    "weather": Schema(
+        index="date", dtypes={"date": "date", "station_id": "int32"}, default="float64"
+    ),
+    "public_holidays": Schema(
+        index="date",
+        dtypes={
+            "date": "date",
+            "name": "str",
+            "is_public_holiday": "bool",
+            "state_mask": "int32",
+        },
+        default="bool",
+    ),
+    # holiday type per state, missing if there is no school holiday
+    "school_holidays": Schema(index="date", dtypes={"date": "date"}, default="str"),
+    "school_holidays_long": Schema(
+        index="id",
+        dtypes={"date": "date", "state": "category", "type": "category"},
+    ),
+    # waiting time datapoints joined with the weather data (all_datapoints, X_*)
+    "datapoints": Schema(
+        index=None,
+        dtypes={
+            "attraction": "category",
+            "date": "date",
+            "half_hour_slot": "int8",
+            "waiting_time": "float64",
+        },
+        default="float64",
+    ),
+    # y_*
+    "target": Schema(index=None, dtypes={"waiting_time": "float64"}),
+}
+
+
+def dataset_format(path: Union[str, PathLike]) -> str:
+    """storage format of `path` by its suffix.
+
+    Raises:
+        ValueError: unknown suffix
+
+    Returns:
+        str: one of FORMATS
+    """
+
+    fmt = Path(path).suffix.lstrip(".")
+
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown dataset format {fmt!r} of {path}, use {FORMATS}")
+
+    return fmt
+
+
+def find_dataset(path: Union[str, PathLike]) -> Path:
+    """return `path` if it exists, otherwise the same dataset in another format if that
+    exists (e.g. "weather.parquet" for "weather.csv").
+    """
+
+    path = Path(path)
+
+    if path.exists():
+        return path
+
+    for fmt in FORMATS:
+        other_path = path.with_suffix(f".{fmt}")
+        if other_path.exists():
+            return other_path
+
+    return path
+
+
+def _dtype(schema: Schema, column: str) -> Optional[str]:
+    return schema.dtypes.get(column, schema.default)
+
+
+def apply_schema(df: pd.DataFrame, schema_name: str) -> pd.DataFrame:
+    """convert the index and the columns of `df` to the types of the schema.
+
+    Args:
+        df (pd.DataFrame): dataset, with the index as index or as column
+        schema_name (str): one of SCHEMAS
+
+    Returns:
+        pd.DataFrame: converted dataset
+    """
+
+    schema = SCHEMAS[schema_name]
+
+    if schema.index is not None and schema.index in df.columns:
+        df = df.set_index(schema.index)
+
+    conversions = {}
+    for column in df.columns:
+        dtype = _dtype(schema, column)
+
+        if dtype is None or dtype == "str":
+            continue
+        if dtype == "date":
+            if not pd.api.types.is_datetime64_dtype(df[column]):
+                conversions[column] = pd.to_datetime(df[column])
+        # numpy < 1.21 cannot compare its dtypes with "category"
+        elif not pd.api.types.is_dtype_equal(df[column].dtype, dtype):
+            conversions[column] = df[column].astype(dtype)
+
+    if conversions:
+        # a shallow copy, unlike `assign`, keeps the other columns (e.g. memory-mapped)
+        df = df.copy(deep=False)
+        for column, values in conversions.items():
+            df[column] = values
+
+    if _dtype(schema, df.index.name) == "date" and not isinstance(
+        df.index, pd.DatetimeIndex
+    ):
+        df.index = pd.DatetimeIndex(pd.to_datetime(df.index), name=df.index.name)
+
+    return df
+
+
+def _read_columns(schema: Schema, columns: Optional[List[str]]) -> Optional[List[str]]:
+    if columns is None or schema.index is None:
+        return columns
+    return [schema.index, *(column for column in columns if column != schema.index)]
+
+
+def read_dataset(
+    path: Union[str, PathLike], schema_name: str, columns: Optional[List[str]] = None
+) -> pd.DataFrame:
+    """read a dataset in any of FORMATS.
+
+    Args:
+        path (str | PathLike): csv or parquet file
+        schema_name (str): one of SCHEMAS
+        columns (List[str]): only read these columns (and the index). Optional.
+
+    Returns:
+        pd.DataFrame: dataset with the types of the schema
+    """
+
+    schema = SCHEMAS[schema_name]
+    read_columns = _read_columns(schema, columns)
+
+    fmt = dataset_format(path)
+
+    if fmt == "parquet":
+        df = pd.read_parquet(path, columns=read_columns, use_threads=True)
+    elif fmt == "feather":
+        # split_blocks avoids copying the columns into consolidated blocks
+        df = feather.read_table(
+            path, columns=read_columns, memory_map=True
+        ).to_pandas(split_blocks=True)
+    else:
+        df = pd.read_csv(
+            path,
+            usecols=read_columns,
+            dtype={
+                column: dtype
+                for column, dtype in schema.dtypes.items()
+                if dtype not in ("date", "str")
+            },
+        )
+
+    return apply_schema(df, schema_name)
+
+
+def _to_table(
+    df: pd.DataFrame, schema_name: str, decode_dictionaries: bool = False
+) -> pa.Table:
+    schema = SCHEMAS[schema_name]
+    df = apply_schema(df, schema_name)
+
+    table = pa.Table.from_pandas(df, preserve_index=schema.index is not None)
+
+    for i, field in enumerate(table.schema):
+        # pandas has no date type, store dates without time
+        if _dtype(schema, field.name) == "date":
+            table = table.set_column(
+                i, field.name, table.column(i).cast(pa.timestamp("s")).cast(pa.date32())
+            )
+        # feather files only allow a single dictionary per column for all chunks
+        elif decode_dictionaries and pa.types.is_dictionary(field.type):
+            table = table.set_column(
+                i, field.name, table.column(i).cast(field.type.value_type)
+            )
+
+    return table
+
+
+def write_dataset(df: pd.DataFrame, path: Union[str, PathLike], schema_name: str):
+    """write a dataset in the format selected by the suffix of `path`.
+
+    Csv files are written as they are, parquet and feather files with the types of the
+    schema.
+
+    Args:
+        df (pd.DataFrame): dataset, with the index of the schema as index
+        path (str | PathLike): csv or parquet file
+        schema_name (str): one of SCHEMAS
+    """
+
+    with DatasetWriter(path, schema_name) as writer:
+        writer.write(df)
+
+
+class DatasetWriter:
+    """write a dataset chunk by chunk, see `write_dataset`.
+
+    Example:
+        with DatasetWriter("exploration.parquet", "waiting_times_exploration") as w:
+            for chunk in chunks:
+                w.write(chunk)
+    """
+
+    def __init__(self, path: Union[str, PathLike], schema_name: str):
+        self.path = path
+        self.schema_name = schema_name
+        self.format = dataset_format(path)
+        self._table_writer: Optional[
+            Union[pq.ParquetWriter, pa.ipc.RecordBatchFileWriter]
+        ] = None
+        self._table_schema: Optional[pa.Schema] = None
+        self._n_chunks = 0
+
+    def write(self, df: pd.DataFrame):
+        if self.format != "csv":
+            table = _to_table(
+                df, self.schema_name, decode_dictionaries=self.format == "feather"
+            )
+            if self._table_writer is None:
+                self._table_schema = table.schema
+                if self.format == "parquet":
+                    self._table_writer = pq.ParquetWriter(self.path, table.schema)
+                else:
+                    # uncompressed, so the file can be memory-mapped
+                    self._table_writer = pa.ipc.new_file(self.path, table.schema)
+            self._table_writer.write_table(table.cast(self._table_schema))
+        else:
+            df.to_csv(
+                self.path,
+                mode="a" if self._n_chunks else "w",
+                header=not self._n_chunks,
+                index=SCHEMAS[self.schema_name].index is not None,
+            )
+
+        self._n_chunks += 1
+
+    def close(self):
+        if self._table_writer is not None:
+            self._table_writer.close()
+            self._table_writer = None
+
+    def __enter__(self) -> "DatasetWriter":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def iter_dataset(
+    path: Union[str, PathLike],
+    schema_name: str,
+    chunk_size: int,
+    columns: Optional[List[str]] = None,
+) -> Iterator[pd.DataFrame]:
+    """read a dataset in chunks of at most `chunk_size` rows, see `read_dataset`."""
+
+    schema = SCHEMAS[schema_name]
+    read_columns = _read_columns(schema, columns)
+
+    fmt = dataset_format(path)
+
+    if fmt == "parquet":
+        parquet_file = pq.ParquetFile(path)
+        for batch in parquet_file.iter_batches(chunk_size, columns=read_columns):
+            yield apply_schema(batch.to_pandas(), schema_name)
+        return
+
+    if fmt == "feather":
+        table = feather.read_table(path, columns=read_columns, memory_map=True)
+        for batch in table.to_batches(max_chunksize=chunk_size):
+            yield apply_schema(batch.to_pandas(), schema_name)
+        return
+
+    with pd.read_csv(path, usecols=read_columns, chunksize=chunk_size) as reader:
+        for chunk in reader:
+            yield apply_schema(chunk, schema_name)
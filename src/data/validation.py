@@ -0,0 +1,159 @@
+"""
+Project: Phantasialand
+State: 10/2026
+
+Validation rules for the data processed in `src/data`.
+
+The rules of each stage are evaluated on the whole frame at once with vectorized column
+operations that are shared between the rules, so every column is read a single time.
+The result is a `ValidationReport` listing the number of violating rows and a few
+examples for each rule.
+
+There are two kinds of rules:
+- row rules only look at one row at a time (e.g. a negative waiting time while the
+  attraction is opened). With `sample=N`, they are only evaluated on N random rows,
+  which keeps the validation of very large inputs affordable.
+- frame rules compare rows with each other (e.g. duplicate dates). They are always
+  evaluated on all rows, as a sample would miss most violations.
+"""
+
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+Rules = Callable[[pd.DataFrame], Dict[str, np.ndarray]]
+
+
+def _raw_waiting_time_row_rules(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    nonnegative = df.wartezeit.to_numpy() >= 0
+    status = df.status.to_numpy()
+    opened = status == "opened"
+    closed = status == "closed"
+
+    return {
+        "nonnegative waiting time while the attraction is not opened": (
+            nonnegative & ~opened
+        ),
+        "negative waiting time while the attraction is not closed": (
+            ~nonnegative & ~closed
+        ),
+    }
+
+
+def _daily_weather_row_rules(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    return {"missing date": df.date.isna().to_numpy()}
+
+
+def _daily_weather_frame_rules(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    station_ids = df.station_id.to_numpy()
+
+    return {
+        "duplicate date": df.date.duplicated(keep=False).to_numpy(),
+        "station id differs from the first row": (
+            station_ids != station_ids[0] if len(df) else np.zeros(0, dtype=bool)
+        ),
+    }
+
+
+# stage name -> (row rules, frame rules)
+STAGES: Dict[str, Tuple[Optional[Rules], Optional[Rules]]] = {
+    "raw_waiting_times": (_raw_waiting_time_row_rules, None),
+    "daily_weather": (_daily_weather_row_rules, _daily_weather_frame_rules),
+}
+
+
+class ValidationReport:
+    """violations of the rules of one stage.
+
+    Attributes:
+        stage (str): name of the validated stage
+        n_rows (int): number of rows of the validated frame
+        n_sampled (int): number of rows the row rules were evaluated on
+        violations (Dict[str, int]): number of violating rows for each rule
+        examples (Dict[str, pd.DataFrame]): some violating rows for each violated rule
+    """
+
+    def __init__(self, stage: str, n_rows: int, n_sampled: int):
+        self.stage = stage
+        self.n_rows = n_rows
+        self.n_sampled = n_sampled
+        self.violations: Dict[str, int] = {}
+        self.examples: Dict[str, pd.DataFrame] = {}
+
+    @property
+    def ok(self) -> bool:
+        return not any(self.violations.values())
+
+    def __str__(self) -> str:
+        lines = [f"{self.stage}: {self.n_rows} rows"]
+        if self.n_sampled < self.n_rows:
+            lines[0] += f", row rules checked on a sample of {self.n_sampled}"
+
+        for rule, count in self.violations.items():
+            if not count:
+                continue
+            lines.append(f"- {rule}: {count} rows, e.g.")
+            lines.append(self.examples[rule].to_string())
+
+        if self.ok:
+            lines.append("no violations")
+
+        return "\n".join(lines)
+
+    def raise_if_failed(self):
+        """raise a ValueError containing this report if any rule is violated.
+
+        Raises:
+            ValueError: any rule is violated
+        """
+        if not self.ok:
+            raise ValueError(str(self))
+
+
+def validate(
+    df: pd.DataFrame,
+    stage: str,
+    sample: Optional[int] = None,
+    max_examples: int = 5,
+    random_state: int = 0,
+) -> ValidationReport:
+    """check `df` against all rules of `stage`.
+
+    Args:
+        df (pd.DataFrame): data to check
+        stage (str): one of STAGES
+        sample (int): evaluate the row rules only on this many random rows. Optional.
+        max_examples (int): maximum number of violating rows to keep per rule.
+            Defaults to 5.
+        random_state (int): seed of the sample. Defaults to 0.
+
+    Raises:
+        ValueError: unknown `stage`
+
+    Returns:
+        ValidationReport: violations of each rule
+    """
+
+    if stage not in STAGES:
+        raise ValueError(f"unknown validation stage {stage!r}")
+
+    row_rules, frame_rules = STAGES[stage]
+
+    sampled_df = df
+    if sample is not None and sample < len(df):
+        sampled_df = df.sample(n=sample, random_state=random_state).sort_index()
+
+    report = ValidationReport(stage, len(df), len(sampled_df))
+
+    for rules, rules_df in [(row_rules, sampled_df), (frame_rules, df)]:
+        if rules is None:
+            continue
+
+        for rule, mask in rules(rules_df).items():
+            count = int(np.count_nonzero(mask))
+            report.violations[rule] = count
+            if count:
+                report.examples[rule] = rules_df[mask].head(max_examples)
+
+    return report
@@ -33,7 +33,7 @@ def main(output_path: PathLike, model_uri: Optional[str]):
 
     # The end user waiting time prediction works based on day and attraction only, so we
     # only need one row per day 
-    days_df = data.X_test.drop(columns="half_hour_time").drop_duplicates()
+    days_df = data.X_test.drop(columns="half_hour_slot").drop_duplicates()
     days_df["weather_bin"] = get_bin_for_weather_data(days_df)
 
     if model_uri:
@@ -54,7 +54,7 @@ def main(output_path: PathLike, model_uri: Optional[str]):
                 {
                     "date": row.date,
                     "attraction": row.attraction,
-                    "half_hour_time": time_by_weather_df.index,
+                    "half_hour_slot": time_by_weather_df.index,
                     "y_pred": time_by_weather_df[row.weather_bin],
                 }
             )
@@ -65,10 +65,10 @@ def main(output_path: PathLike, model_uri: Optional[str]):
     true_df = data.X_test.copy()
     true_df["y_true"] = data.y_test
 
-    pred_df.set_index(["attraction", "date", "half_hour_time"], inplace=True)
-    true_df.set_index(["attraction", "date", "half_hour_time"], inplace=True)
+    pred_df.set_index(["attraction", "date", "half_hour_slot"], inplace=True)
+    true_df.set_index(["attraction", "date", "half_hour_slot"], inplace=True)
 
-    # merge predictions and actual values. The half_hour_time's present in both 
+    # merge predictions and actual values. The half_hour_slot's present in both 
     # dataframes might slightly differ, because the prediction works with fixed opening 
     # hours, therefore an outer join is used.
     merge_df = pd.merge(
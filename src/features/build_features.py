@@ -30,53 +30,24 @@ from src.data.constants import (
     STATE_FULL2ISO,
     WARTEZEITEN_APP_ATTRACTIONS,
 )
+from src.data.slots import slot_hours
+from src.data.storage import find_dataset, read_dataset
+from src.features.columns import SELECTED_WEATHER_COLUMNS
+from src.training.utils import load_data
 
 # Some parameters describing how build_features currently works. These values are logged
 # to mlflow to make it easier to see which training run used which featurization
 FEATURIZATION_PARAMS = {
     "date_cols": "day_of_week,week_of_year",
-    "weather_cols": "lommersum_precipitation_height,lommersum_sunshine_duration,lommersum_mean_temperature",
+    "weather_cols": ",".join(SELECTED_WEATHER_COLUMNS),
     "StandardScaler_with_mean": False
 }
 
-# This is a list of all weather columns in the input data. Names are commented out to
-# indicate that they are (currently) not used and why.
-SELECTED_WEATHER_COLUMNS = [
-    # "lommersum_quality_other",         data quality attribute
-    "lommersum_precipitation_height",
-    # "lommersum_precipitation_form",    redundant to precipitation_height
-    "lommersum_sunshine_duration",
-    # "lommersum_snow_depth",            predictions are better without this feature
-    # "lommersum_mean_vapor_pressure",   correlated with mean_temperature
-    "lommersum_mean_temperature",
-    # "lommersum_mean_relative_humidity",predictions are better without this feature
-    # "lommersum_max_temperature_2m",    correlated with mean_temperature
-    # "lommersum_min_temperature_2m",    correlated with mean_temperature
-    # "lommersum_min_temperature_5cm",   correlated with mean_temperature
-    # "koelnbonn_quality_wind",          quality attribute
-    # "koelnbonn_max_wind_gust",         correlated with mean_wind_speed
-    # "koelnbonn_mean_wind_speed",       predictions are better without this feature
-    # "koelnbonn_quality_other", #       data quality attribute
-    # "koelnbonn_precipitation_height",  also present at Lommersum
-    # "koelnbonn_precipitation_form",    same
-    # "koelnbonn_sunshine_duration",     same
-    # "koelnbonn_snow_depth",            same
-    # "koelnbonn_mean_cloud_cover",      predictions are better without this feature
-    # "koelnbonn_mean_vapor_pressure",   also present at Lommersum
-    # "koelnbonn_mean_pressure",         predictions are better without this feature
-    # "koelnbonn_mean_temperature",      also present at Lommersum
-    # "koelnbonn_mean_relative_humidity",same
-    # "koelnbonn_max_temperature_2m",    same
-    # "koelnbonn_min_temperature_2m",    same
-    # "koelnbonn_min_temperature_5cm",   same
-]
-
-
-_PUBLIC_HOLIDAYS = pd.read_csv(
-    DATA_PATH / "processed/public_holidays.csv", index_col="date", parse_dates=["date"]
+_PUBLIC_HOLIDAYS = read_dataset(
+    find_dataset(DATA_PATH / "processed/public_holidays.csv"), "public_holidays"
 )
-_SCHOOL_HOLIDAYS = pd.read_csv(
-    DATA_PATH / "processed/school_holidays.csv", index_col="date", parse_dates=["date"]
+_SCHOOL_HOLIDAYS = read_dataset(
+    find_dataset(DATA_PATH / "processed/school_holidays.csv"), "school_holidays"
 ).fillna("")
 
 # TODO move this to data preprocessing scripts
@@ -101,28 +72,20 @@ OTHER_STATE_CODES = list(
 
 
 
-def transform_time(times: Iterable[str]) -> pd.DataFrame:
-    """convert a time in HH:MM:00 format to a float.
+def transform_time(slots: Iterable[int]) -> pd.DataFrame:
+    """convert half-hour slots (see `src/data/slots.py`) to floats.
 
     Example:
-        08:30 is converted into 8.5.
+        17 (08:30) is converted into 8.5.
 
     Args:
-        times (Iterable[str]): list of time strings in HH:MM:00 format.
+        slots (Iterable[int]): slot indices.
 
     Returns:
         pd.DataFrame: one-column dataframe containing float representations.
     """
 
-    output = []
-
-    for time in times:
-
-        hours, minutes, _ = time.split(":", maxsplit=2)
-
-        output.append(float(hours) + float(minutes) / 60)
-
-    return pd.DataFrame(output)
+    return pd.DataFrame(slot_hours(np.fromiter(slots, dtype=np.int64)))
 
 
 def transform_date(dates: Iterable[str]) -> pd.DataFrame:
@@ -263,7 +226,7 @@ def build_pipeline(model: BaseEstimator = None):
         [
             ("weather", weather_transformer, SELECTED_WEATHER_COLUMNS),
             ("date", date_holiday_transformer, "date"),
-            ("time", time_transformer, "half_hour_time"),
+            ("time", time_transformer, "half_hour_slot"),
             ("attraction", attraction_transformer, ["attraction"]),
         ]
     )
@@ -310,15 +273,13 @@ def featurize_test_train(input_dir, output_file_path, model_path):
     logging.info("Building pipeline...")
     pipeline = build_pipeline()
 
-    logging.info("Reading X_train...")
-    X_train = pd.read_csv(f"{input_dir}/X_train.csv")
+    logging.info("Reading X_train and X_test...")
+    data = load_data(input_dir)
+    X_train, X_test = data.X_train, data.X_test
 
     logging.info("Fitting and transforming X_train...")
     X_train_p = pipeline.fit_transform(X_train)
 
-    logging.info("Reading X_test")
-    X_test = pd.read_csv(f"{input_dir}/X_test.csv")
-
     logging.info("Transforming X_test")
     X_test_p = pipeline.transform(X_test)
 
@@ -0,0 +1,44 @@
+"""
+Project: Phantasialand
+State: 10/2026
+
+Columns of the datapoints used by the featurization pipeline in `build_features.py`.
+
+This module has no dependencies, so the data scripts can read and write only these
+columns without loading the holiday data that `build_features.py` needs.
+"""
+
+# This is a list of all weather columns in the input data. Names are commented out to
+# indicate that they are (currently) not used and why.
+SELECTED_WEATHER_COLUMNS = [
+    # "lommersum_quality_other",         data quality attribute
+    "lommersum_precipitation_height",
+    # "lommersum_precipitation_form",    redundant to precipitation_height
+    "lommersum_sunshine_duration",
+    # "lommersum_snow_depth",            predictions are better without this feature
+    # "lommersum_mean_vapor_pressure",   correlated with mean_temperature
+    "lommersum_mean_temperature",
+    # "lommersum_mean_relative_humidity",predictions are better without this feature
+    # "lommersum_max_temperature_2m",    correlated with mean_temperature
+    # "lommersum_min_temperature_2m",    correlated with mean_temperature
+    # "lommersum_min_temperature_5cm",   correlated with mean_temperature
+    # "koelnbonn_quality_wind",          quality attribute
+    # "koelnbonn_max_wind_gust",         correlated with mean_wind_speed
+    # "koelnbonn_mean_wind_speed",       predictions are better without this feature
+    # "koelnbonn_quality_other", #       data quality attribute
+    # "koelnbonn_precipitation_height",  also present at Lommersum
+    # "koelnbonn_precipitation_form",    same
+    # "koelnbonn_sunshine_duration",     same
+    # "koelnbonn_snow_depth",            same
+    # "koelnbonn_mean_cloud_cover",      predictions are better without this feature
+    # "koelnbonn_mean_vapor_pressure",   also present at Lommersum
+    # "koelnbonn_mean_pressure",         predictions are better without this feature
+    # "koelnbonn_mean_temperature",      also present at Lommersum
+    # "koelnbonn_mean_relative_humidity",same
+    # "koelnbonn_max_temperature_2m",    same
+    # "koelnbonn_min_temperature_2m",    same
+    # "koelnbonn_min_temperature_5cm",   same
+]
+
+# Columns of the datapoints (X_train, X_test) used by the featurization pipeline
+DATAPOINT_COLUMNS = ["attraction", "date", "half_hour_slot"] + SELECTED_WEATHER_COLUMNS
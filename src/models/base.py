@@ -26,7 +26,7 @@ class WeatherBinEstimator(ABC):
 
         Returns:
             pd.DataFrame: median waiting time. columns: weather bins including ALL;
-                rows: `TIMES`
+                rows: `SLOTS`
             pd.DataFrame: daily summary. columns: "mean_waiting_time", "support", 
                 "best_time"; rows: weather bins including ALL
         """
@@ -18,10 +18,11 @@ class MeanEstimator(WeatherBinEstimator):
 
         data = load_data()
 
-        data.X_train["waiting_time"] = data.y_train
-        data.X_train["date"] = pd.to_datetime(data.X_train.date)
-
-        self.data_df = data.X_train
+        # the loaded data is shared, so assign new columns instead of modifying it
+        self.data_df = data.X_train.assign(
+            waiting_time=data.y_train.waiting_time.to_numpy(),
+            date=pd.to_datetime(data.X_train.date),
+        )
 
     def predict(self, date: datetime.date, attraction: str) -> pd.DataFrame:
         """Predict expected waiting times for `date` and `attraction`.
@@ -40,7 +41,7 @@ class MeanEstimator(WeatherBinEstimator):
 
         Returns:
             pd.DataFrame: median waiting time. columns: weather bins including ALL;
-                rows: `TIMES`
+                rows: `SLOTS`
             pd.DataFrame: daily summary. columns: "mean_waiting_time", "support", 
                 "best_time"; rows: weather bins including ALL
         """
@@ -64,8 +65,8 @@ class MeanEstimator(WeatherBinEstimator):
             )
 
             waiting_time_by_weather[bin] = (
-                support_rows[["half_hour_time", "waiting_time"]]
-                .groupby(by="half_hour_time")
+                support_rows[["half_hour_slot", "waiting_time"]]
+                .groupby(by="half_hour_slot")
                 .mean()["waiting_time"]
             )
 
@@ -1,12 +1,12 @@
 
 import datetime
-import itertools
 from typing import Any, Tuple
 import numpy as np
 from pathlib import Path
 
 import pandas as pd
 import mlflow
+from src.data.slots import SLOT_DTYPE
 from src.models.base import WeatherBinEstimator
 
 from src.training.utils import MLFLOW_TRACKING_URI
@@ -16,11 +16,8 @@ mlflow.set_tracking_uri(MLFLOW_TRACKING_URI)
 
 BEST_MODEL_PATH = (Path(__file__).parent.parent.parent / "models" / "best").resolve()
 
-TIMES = pd.Series(
-    itertools.chain.from_iterable(
-        [f"{hour}:00:00", f"{hour}:30:00"] for hour in range(10, 20)
-    )
-)
+# half-hour slots from 10:00 to 19:30 (see `src/data/slots.py`)
+SLOTS = pd.Series(np.arange(20, 40, dtype=SLOT_DTYPE))
 
 
 def generate_X(
@@ -28,7 +25,7 @@ def generate_X(
 ) -> Tuple[pd.DataFrame, pd.DataFrame]:
     """Generate all datapoints for which we need to request the model.
 
-    This is the cartesian product of TIMES and `get_weather_data_for_bin`, with data and
+    This is the cartesian product of SLOTS and `get_weather_data_for_bin`, with data and
     attraction always being fixed.
 
     Args:
@@ -37,21 +34,21 @@ def generate_X(
 
     Returns:
         X (pd.DataFrame): feature matrix for prediction (columns: "attraction", "date",
-            "half_hour_time" and all weather columns).
+            "half_hour_slot" and all weather columns).
         bins_time (pd.DataFrame): information needed for correct summarization of the
-            prediction, same number of rows as `X` (columns: "half_hour_time",
+            prediction, same number of rows as `X` (columns: "half_hour_slot",
             DRY_SUNNY, DRY_OVERCAST, SLIGHT_RAIN, HEAVY_RAIN).
     """
 
     weather_bins_df = get_weather_data_for_bin(date.month)
 
     df = pd.DataFrame(
-        {"attraction": attraction, "date": date.isoformat(), "half_hour_time": TIMES}
+        {"attraction": attraction, "date": date.isoformat(), "half_hour_slot": SLOTS}
     )
 
     X_with_bins = pd.merge(df, weather_bins_df, how="cross")
 
-    bins_time = X_with_bins[[*ALL_WEATHER_BINS, "half_hour_time"]]
+    bins_time = X_with_bins[[*ALL_WEATHER_BINS, "half_hour_slot"]]
     X = X_with_bins.drop(columns=ALL_WEATHER_BINS)
 
     return X, bins_time
@@ -76,7 +73,7 @@ def summarize_waiting_times(
 
     Returns:
         pd.DataFrame: median waiting time. columns: weather bins including ALL, rows:
-            `TIMES`
+            `SLOTS`
         pd.DataFrame: daily summary. rows: weather bins including ALL, columns:
             "mean_waiting_time", "support", "best_time"
     """
@@ -91,17 +88,17 @@ def summarize_waiting_times(
 
     for bin in ALL_WEATHER_BINS:
         waiting_time_by_weather[bin] = (
-            bins_time[bins_time[bin]][["half_hour_time", "y"]]
-            .groupby(by="half_hour_time")
+            bins_time[bins_time[bin]][["half_hour_slot", "y"]]
+            .groupby(by="half_hour_slot")
             .median()["y"]
         )
-        # We divide by len(TIMES) to "undo" the cross-product
-        support_by_weather[bin] = bins_time[bin].value_counts()[True] / len(TIMES)
+        # We divide by len(SLOTS) to "undo" the cross-product
+        support_by_weather[bin] = bins_time[bin].value_counts()[True] / len(SLOTS)
 
     waiting_time_by_weather[Bin.ALL] = (
-        bins_time[["half_hour_time", "y"]].groupby(by="half_hour_time").median()["y"]
+        bins_time[["half_hour_slot", "y"]].groupby(by="half_hour_slot").median()["y"]
     )
-    support_by_weather[Bin.ALL] = len(bins_time) / len(TIMES)
+    support_by_weather[Bin.ALL] = len(bins_time) / len(SLOTS)
 
     waiting_time_by_weather_df = pd.DataFrame(waiting_time_by_weather)
 
@@ -149,7 +146,7 @@ class ModelEstimator(WeatherBinEstimator):
 
         Returns:
             pd.DataFrame: median waiting time. columns: weather bins including ALL;
-                rows: `TIMES`
+                rows: `SLOTS`
             pd.DataFrame: daily summary. columns: "mean_waiting_time", "support", 
                 "best_time"; rows: weather bins including ALL
         """
@@ -1,36 +1,22 @@
 import pandas as pd
 import numpy as np
 
-from src.data.create_training_data import prepare_weather
-from src.data.constants import DATA_PATH
+from src.data.process_weather_stations import load_weather_table
 from src.training.utils import load_data
 
 
 def _load_weather_df():
-    """Load a merged version of all weather data from Lommersum and Koeln-Bonn.
+    """Load the weather data of all weather stations, except for the test dates.
 
     Returns:
         pd.DataFrame: DataFrame containing merged weather data as in the training data
     """
 
-    lommersum_df = pd.read_csv(
-        DATA_PATH / "interim/weather_station01327_Lommersum.csv",
-        index_col="date",
-        parse_dates=["date"],
-    )
-    koelnbonn_df = pd.read_csv(
-        DATA_PATH / "interim/weather_station02667_Koeln-Bonn.csv",
-        index_col="date",
-        parse_dates=["date"],
-    )
+    ext_datapoints_df = load_weather_table()
 
     training_data = load_data()
     test_dates = pd.to_datetime(training_data.X_test.date.unique())
 
-    lommersum_df = prepare_weather(lommersum_df, "lommersum_")
-    koelnbonn_df = prepare_weather(koelnbonn_df, "koelnbonn_")
-
-    ext_datapoints_df = lommersum_df.join(other=koelnbonn_df, on="date")
     ext_datapoints_df.drop(index=test_dates, inplace=True, errors="ignore")
 
     return ext_datapoints_df
@@ -0,0 +1,234 @@
+"""
+Project: Phantasialand
+State: 10/2026
+
+Rolling-origin backtest folds over the dates of the training data.
+
+The unique dates are sorted and the last `n_folds * test_days` of them are cut into
+`n_folds` consecutive test blocks. Each fold is tested on one block and trained on the
+dates before it: all of them for "expanding" folds, the last `train_days` of them for
+"sliding" folds. So a model is never trained on data from after the day it is tested
+on, and all datapoints of one day are part of the same set.
+
+The row indices of the folds are cached in a npz file next to the training data and
+computed again when the dates or the fold parameters change.
+"""
+
+from os import PathLike
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+import hashlib
+import json
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.base import BaseEstimator, clone
+
+from src.data.constants import DATA_PATH
+from src.training.utils import load_data, regression_metrics
+
+FOLD_MODES = ["expanding", "sliding"]
+
+Fold = Tuple[np.ndarray, np.ndarray]
+
+
+def date_folds(
+    dates: Iterable,
+    n_folds: int = 3,
+    mode: str = "expanding",
+    test_days: Optional[int] = None,
+    train_days: Optional[int] = None,
+) -> List[Fold]:
+    """build rolling-origin folds over the given dates.
+
+    Args:
+        dates (Iterable): date of each datapoint
+        n_folds (int): number of folds. Defaults to 3.
+        mode (str): "expanding" or "sliding". Defaults to "expanding".
+        test_days (int): number of dates in each test block. Defaults to an equal share
+            of the dates for each test block and for the first training window.
+        train_days (int): number of dates in each training window of sliding folds.
+            Defaults to `test_days`.
+
+    Returns:
+        List[Fold]: row positions of the train and test datapoints of each fold
+    """
+
+    if mode not in FOLD_MODES:
+        raise ValueError(f"Unknown fold mode {mode}, expected one of {FOLD_MODES}")
+
+    day_numbers = _day_numbers(dates)
+    unique_days = np.unique(day_numbers)
+
+    if test_days is None:
+        test_days = len(unique_days) // (n_folds + 1)
+    if train_days is None:
+        train_days = test_days
+
+    first_test = len(unique_days) - n_folds * test_days
+
+    if test_days < 1 or first_test < 1:
+        raise ValueError(
+            f"Cannot build {n_folds} folds of {test_days} test days from "
+            f"{len(unique_days)} dates"
+        )
+
+    # position of the date of each datapoint among the unique dates
+    positions = np.searchsorted(unique_days, day_numbers)
+
+    folds = []
+
+    for fold in range(n_folds):
+        test_start = first_test + fold * test_days
+        train_start = 0 if mode == "expanding" else max(0, test_start - train_days)
+
+        train_rows = np.flatnonzero(
+            (positions >= train_start) & (positions < test_start)
+        )
+        test_rows = np.flatnonzero(
+            (positions >= test_start) & (positions < test_start + test_days)
+        )
+
+        folds.append((train_rows, test_rows))
+
+    return folds
+
+
+def cached_date_folds(
+    dates: Iterable, cache_path: PathLike, n_folds: int = 3, **kwargs
+) -> List[Fold]:
+    """return `date_folds(dates, n_folds, **kwargs)`, read from `cache_path` if it was
+    built for the same dates and parameters, otherwise built and written to it.
+
+    Args:
+        dates (Iterable): date of each datapoint
+        cache_path (PathLike): npz file with the fold row indices
+        n_folds (int): number of folds. Defaults to 3.
+        kwargs: further arguments of `date_folds`
+
+    Returns:
+        List[Fold]: row positions of the train and test datapoints of each fold
+    """
+
+    dates = pd.Series(dates)
+    day_numbers = _day_numbers(dates)
+    params = json.dumps({"n_folds": n_folds, **kwargs}, sort_keys=True)
+    fingerprint = hashlib.sha1(day_numbers.tobytes()).hexdigest()
+
+    cache_path = Path(cache_path)
+
+    if cache_path.exists():
+        with np.load(cache_path) as cache:
+            if cache["params"] == params and cache["fingerprint"] == fingerprint:
+                return [
+                    (cache[f"train_{fold}"], cache[f"test_{fold}"])
+                    for fold in range(n_folds)
+                ]
+
+    folds = date_folds(dates, n_folds, **kwargs)
+
+    arrays = {}
+    for fold, (train_rows, test_rows) in enumerate(folds):
+        arrays[f"train_{fold}"] = train_rows
+        arrays[f"test_{fold}"] = test_rows
+
+    # write to a temporary file first, so readers never see a partial cache
+    tmp_path = cache_path.with_name(f"{cache_path.stem}.tmp.npz")
+    np.savez(tmp_path, params=params, fingerprint=fingerprint, **arrays)
+    tmp_path.replace(cache_path)
+
+    return folds
+
+
+def load_folds(
+    path: PathLike = None, n_folds: int = 3, mode: str = "expanding", **kwargs
+) -> List[Fold]:
+    """return the folds over the dates of X_train of the training data at `path`.
+
+    The folds are cached in "folds_<mode>.npz" next to the training data.
+
+    Args:
+        path (PathLike): where to find the training data, see `load_data`
+        n_folds (int): number of folds. Defaults to 3.
+        mode (str): "expanding" or "sliding". Defaults to "expanding".
+        kwargs: further arguments of `date_folds`
+
+    Returns:
+        List[Fold]: row positions in X_train of the train and test datapoints of each
+        fold
+    """
+    if path is None:
+        path = DATA_PATH / "processed"
+
+    dates = load_data(path, columns=["date"]).X_train.date
+
+    return cached_date_folds(
+        dates, Path(path) / f"folds_{mode}.npz", n_folds, mode=mode, **kwargs
+    )
+
+
+def evaluate_on_folds(
+    models: Dict[str, BaseEstimator],
+    X: pd.DataFrame,
+    y: pd.DataFrame,
+    folds: List[Fold],
+    n_jobs: int = -1,
+) -> pd.DataFrame:
+    """fit and evaluate each model on each fold, all in parallel.
+
+    Args:
+        models (Dict[str, BaseEstimator]): models by name, these are not modified
+        X (pd.DataFrame): datapoints
+        y (pd.DataFrame): target values
+        folds (List[Fold]): row positions of the train and test datapoints of each fold
+        n_jobs (int): number of parallel jobs, see `joblib.Parallel`. Defaults to -1,
+            i.e. one job per CPU.
+
+    Returns:
+        pd.DataFrame: `regression_metrics` of the test and (suffixed by "_train") train
+        datapoints. rows: models and folds
+    """
+
+    results = Parallel(n_jobs=n_jobs)(
+        delayed(_evaluate_fold)(model, X, y, train_rows, test_rows)
+        for model in models.values()
+        for train_rows, test_rows in folds
+    )
+
+    index = pd.MultiIndex.from_product(
+        [list(models.keys()), range(len(folds))], names=["model", "fold"]
+    )
+
+    return pd.DataFrame(results, index=index)
+
+
+def _evaluate_fold(
+    model: BaseEstimator,
+    X: pd.DataFrame,
+    y: pd.DataFrame,
+    train_rows: np.ndarray,
+    test_rows: np.ndarray,
+) -> Dict[str, float]:
+
+    model = clone(model)
+
+    X_train, y_train = X.iloc[train_rows], y.iloc[train_rows]
+    X_test, y_test = X.iloc[test_rows], y.iloc[test_rows]
+
+    model.fit(X_train, y_train)
+
+    metrics = regression_metrics(y_test, model.predict(X_test))
+    metrics.update(
+        regression_metrics(y_train, model.predict(X_train), suffix="_train")
+    )
+
+    return metrics
+
+
+def _day_numbers(dates: Iterable) -> np.ndarray:
+    """convert dates to the number of days since the epoch."""
+
+    dates = pd.to_datetime(pd.Series(dates)).to_numpy()
+
+    return dates.astype("datetime64[D]").view("int64")
@@ -1,13 +1,12 @@
 from typing import Dict, Union
-import numpy as np
 import optuna
 from xgboost import XGBRegressor
 from mlflow.tracking import MlflowClient
 from mlflow.utils.mlflow_tags import MLFLOW_PARENT_RUN_ID
-from sklearn.model_selection import cross_validate, KFold
 
 import src.training.utils as U
 from src.features.build_features import build_pipeline, FEATURIZATION_PARAMS
+from src.training.folds import evaluate_on_folds, load_folds
 
 
 def _log_params(client, id, dict_, prefix=""):
@@ -78,23 +77,14 @@ def get_objective(parent_run_id):
 
         model = build_pipeline(XGBRegressor(**param, random_state=42))
 
-        cv_results = cross_validate(
-            model,
+        fold_results = evaluate_on_folds(
+            {"XGBRegressor": model},
             data.X_train,
             data.y_train,
-            scoring=("neg_root_mean_squared_error", "r2", "neg_mean_absolute_error"),
-            cv=KFold(3, shuffle=False),
-            return_train_score=True,
+            load_folds(n_folds=3, mode="expanding"),
         )
 
-        metrics = {
-            "r2": np.mean(cv_results["test_r2"]),
-            "rmse": -np.mean(cv_results["test_neg_root_mean_squared_error"]),
-            "mae": -np.mean(cv_results["test_neg_mean_absolute_error"]),
-            "r2_train": np.mean(cv_results["train_r2"]),
-            "rmse_train": -np.mean(cv_results["train_neg_root_mean_squared_error"]),
-            "mae_train": -np.mean(cv_results["train_neg_mean_absolute_error"]),
-        }
+        metrics = fold_results.mean().to_dict()
 
         _log_params(client, trial_run.info.run_id, param)
         _log_params(
@@ -103,7 +93,7 @@ def get_objective(parent_run_id):
             {
                 "random_state": 42,
                 "cv_splits": 3,
-                "cv_shuffle": False,
+                "cv_folds": "expanding",
                 "git_commit_id": U.get_git_commit_id(),
             },
         )
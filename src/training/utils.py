@@ -1,27 +1,53 @@
 import subprocess
 from types import SimpleNamespace
-from typing import Dict, Iterable
+from typing import Dict, Iterable, List, Optional
 from os import PathLike
 from pathlib import Path
+import json
+import os
 
 import pandas as pd
 from sklearn import metrics
 
-from src.data.constants import DATA_PATH
+from src.data.constants import DATA_PATH, SPLIT_MANIFEST
+from src.data.registry import get_dataset
+from src.features.columns import DATAPOINT_COLUMNS
 
 
 _MLFLOW_DB_PATH = (Path(__file__).parent.parent.parent / "mlflow.db").resolve()
 
-MLFLOW_TRACKING_URI = f"sqlite:///{_MLFLOW_DB_PATH}"
+# like the data directory (see `src/data/constants.py`), the tracking database can be
+# moved with an environment variable, e.g. to train on synthetic data
+MLFLOW_TRACKING_URI = os.environ.get(
+    "MLFLOW_TRACKING_URI", f"sqlite:///{_MLFLOW_DB_PATH}"
+)
 
 
-def load_data(path: PathLike = None) -> SimpleNamespace:
+def load_data(
+    path: PathLike = None,
+    fmt: Optional[str] = None,
+    columns: Optional[List[str]] = DATAPOINT_COLUMNS,
+) -> SimpleNamespace:
     """load training and test data from the given path.
 
-    `path` must contain the files "(X|y)_(train|test).csv".
+    If `path` contains a split manifest (see `src/data/create_training_data.py`), the
+    datapoints file it names is loaded and the train and test sets are views of its
+    row ranges, i.e. no data is copied. Otherwise, `path` must contain the files
+    "(X|y)_(train|test).(csv|parquet|feather)". The data is typed by the "datapoints"
+    and "target" schemas of `src/data/storage.py`, independent of the format.
+
+    The files are read only once per process (see `src/data/registry.py`), each call
+    returns shallow copies that share the column data. Do not modify columns in place,
+    assign new columns instead.
 
     Args:
         path (PathLike): where to find the training data
+        fmt (str): "csv", "parquet" or "feather", only used without a split manifest.
+            Defaults to the first of feather and parquet for which "X_train" exists,
+            otherwise csv.
+        columns (List[str]): only load these columns of X_train and X_test. Defaults to
+            the columns used by the featurization pipeline (see
+            `src/features/columns.py`), None loads all columns.
 
     Returns:
         SimpleNamespace: plain objects with the attributes (X|y)_(train|test).
@@ -29,14 +55,69 @@ def load_data(path: PathLike = None) -> SimpleNamespace:
     if path is None:
         path = DATA_PATH / "processed"
 
+    manifest_path = Path(path) / SPLIT_MANIFEST
+
+    if manifest_path.exists():
+        return _load_split(manifest_path, columns)
+
+    if fmt is None:
+        fmt = next(
+            (
+                fmt
+                for fmt in ["feather", "parquet"]
+                if Path(f"{path}/X_train.{fmt}").exists()
+            ),
+            "csv",
+        )
+
     data = SimpleNamespace()
 
-    for matrix in ["X_train", "X_test", "y_train", "y_test"]:
-        setattr(data, matrix, pd.read_csv(f"{path}/{matrix}.csv"))
+    for matrix in ["X_train", "X_test"]:
+        setattr(
+            data, matrix, get_dataset(f"{path}/{matrix}.{fmt}", "datapoints", columns)
+        )
+    for matrix in ["y_train", "y_test"]:
+        setattr(data, matrix, get_dataset(f"{path}/{matrix}.{fmt}", "target"))
 
     return data
 
 
+def _load_split(
+    manifest_path: Path, columns: Optional[List[str]] = None
+) -> SimpleNamespace:
+    """load training and test data as described by a split manifest."""
+
+    with open(manifest_path) as manifest_file:
+        manifest = json.load(manifest_file)
+
+    datapoints_path = manifest_path.parent / manifest["datapoints"]
+
+    X = get_dataset(
+        datapoints_path,
+        "datapoints",
+        columns if columns is not None else manifest["columns"],
+    )
+    y = get_dataset(datapoints_path, "target", [manifest["target"]])
+
+    data = SimpleNamespace()
+
+    for split in ["train", "test"]:
+        start, stop = manifest[split]
+        setattr(data, f"X_{split}", _row_range(X, start, stop))
+        setattr(data, f"y_{split}", _row_range(y, start, stop))
+
+    return data
+
+
+def _row_range(df: pd.DataFrame, start: int, stop: int) -> pd.DataFrame:
+    """return the rows `start` to `stop` of `df` as a view with a new RangeIndex."""
+
+    view = df.iloc[start:stop]
+    view.index = pd.RangeIndex(stop - start)
+
+    return view
+
+
 def get_git_commit_id() -> str:
     """return the git commit hash of HEAD.
 
@@ -0,0 +1,126 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+try:
+    from src.data import polars_backend
+except ImportError:
+    polars_backend = None
+
+from src.data.constants import SPLIT_MANIFEST
+from src.data.create_training_data import order_by_split, train_test_split_date_based
+from src.data.registry import clear_registry
+from src.data.storage import write_dataset
+from src.features.columns import DATAPOINT_COLUMNS
+from src.training.utils import load_data
+
+
+def make_datapoints_df() -> pd.DataFrame:
+
+    dates = pd.date_range("2021-08-01", periods=10).repeat(3)
+
+    return pd.DataFrame(
+        {
+            "attraction": pd.Categorical(["Taron", "Raik", "Taron"] * 10),
+            "date": dates,
+            "half_hour_slot": np.array([18, 19, 20] * 10, dtype="int8"),
+            "waiting_time": np.arange(30, dtype="float64"),
+            "lommersum_precipitation_height": np.linspace(0, 3, 30),
+            "lommersum_sunshine_duration": np.linspace(0, 10, 30),
+            "lommersum_mean_temperature": np.linspace(10, 20, 30),
+            "koelnbonn_mean_pressure": np.linspace(990, 1020, 30),
+        }
+    )
+
+
+class TestCreateTrainingData(unittest.TestCase):
+    def setUp(self):
+
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp_dir.name)
+        clear_registry()
+
+    def tearDown(self):
+
+        clear_registry()
+        self.tmp_dir.cleanup()
+
+    def test_manifest_matches_split(self):
+
+        df = make_datapoints_df()
+        split_dfs = train_test_split_date_based(df, 0.2)
+
+        ordered_df, manifest = order_by_split(df, 0.2, "all_datapoints.feather")
+
+        n_train = len(split_dfs["X_train"])
+        self.assertEqual(manifest["train"], [0, n_train])
+        self.assertEqual(manifest["test"], [n_train, len(df)])
+        self.assertEqual(len(manifest["test_dates"]), 2)
+        self.assertNotIn("waiting_time", manifest["columns"])
+        pd.testing.assert_frame_equal(
+            ordered_df.iloc[n_train:].drop(columns="waiting_time"), split_dfs["X_test"]
+        )
+
+    def test_load_data_from_manifest(self):
+
+        df = make_datapoints_df()
+        split_dfs = train_test_split_date_based(df, 0.2)
+
+        ordered_df, manifest = order_by_split(df, 0.2, "all_datapoints.feather")
+        write_dataset(ordered_df, self.path / "all_datapoints.feather", "datapoints")
+        with open(self.path / SPLIT_MANIFEST, "w") as manifest_file:
+            json.dump(manifest, manifest_file)
+
+        data = load_data(self.path, columns=None)
+
+        for name in ["X_train", "X_test"]:
+            pd.testing.assert_frame_equal(
+                data_frame_values(getattr(data, name)),
+                data_frame_values(split_dfs[name]),
+            )
+        for name in ["y_train", "y_test"]:
+            self.assertEqual(
+                getattr(data, name).waiting_time.tolist(), split_dfs[name].tolist()
+            )
+
+        # both sets are views of the same loaded datapoints
+        self.assertTrue(
+            np.shares_memory(
+                load_data(self.path, columns=None).y_train.waiting_time.to_numpy(),
+                data.y_train.waiting_time.to_numpy(),
+            )
+        )
+
+        # by default, only the columns used by the featurization are loaded
+        self.assertEqual(
+            load_data(self.path).X_train.columns.tolist(), DATAPOINT_COLUMNS
+        )
+
+    @unittest.skipIf(polars_backend is None, "polars is not installed")
+    def test_polars_join(self):
+
+        df = make_datapoints_df()
+        waiting_time_df = df[["attraction", "date", "half_hour_slot", "waiting_time"]]
+        waiting_time_df.index = pd.RangeIndex(100, 130, name="id")
+        # the first day has no weather data
+        weather_df = df.drop(columns=waiting_time_df.columns).set_index(df.date)
+        weather_df = weather_df[~weather_df.index.duplicated()].iloc[1:]
+
+        pd.testing.assert_frame_equal(
+            waiting_time_df.join(other=weather_df, on="date"),
+            polars_backend.join_weather(waiting_time_df, weather_df),
+        )
+
+
+def data_frame_values(df: pd.DataFrame) -> pd.DataFrame:
+
+    return df.reset_index(drop=True).astype({"attraction": str})
+
+
+if __name__ == "__main__":
+
+    unittest.main()
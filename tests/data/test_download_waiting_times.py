@@ -0,0 +1,175 @@
+import asyncio
+import datetime
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+from src.benchmarks.benchmark_download import serve_stub
+from src.data.download_waiting_times import (
+    download_all_waiting_times,
+    download_all_waiting_times_async,
+    convert_to_dataframe,
+    read_cached_document,
+    write_cached_document,
+    write_flat_csv,
+)
+
+DOCUMENTS = [
+    {
+        "attraction": "Taron",
+        "month": "August",
+        "year": "2021",
+        "data": [
+            {"datum": "2021-08-01 09:00:12", "wartezeit": "-3", "status": "closed"},
+            {"datum": "2021-08-01 10:00:12", "wartezeit": "15", "status": "opened"},
+        ],
+    },
+    {
+        "attraction": "Raik",
+        "month": "May",
+        "year": "2019",
+        "data": [
+            {"datum": "2019-05-01 11:05:12", "wartezeit": "5", "status": "opened"},
+        ],
+    },
+    {
+        "attraction": "Taron",
+        "month": "May",
+        "year": "2019",
+        "data": [
+            {"datum": "2019-05-02 12:00:12", "wartezeit": "40", "status": "opened"},
+        ],
+    },
+]
+
+
+class TestDownloadWaitingTimes(unittest.TestCase):
+    def test_async_download_matches_sequential(self):
+
+        server, url = serve_stub(datapoints=3)
+
+        try:
+            expected = download_all_waiting_times(url)
+            actual = asyncio.run(download_all_waiting_times_async(8, url))
+        finally:
+            server.shutdown()
+
+        self.assertEqual(expected, actual)
+
+    def test_async_download_retries(self):
+
+        server, url = serve_stub(datapoints=1, failures=2)
+
+        try:
+            documents = asyncio.run(
+                download_all_waiting_times_async(8, url, retries=2, backoff=0.001)
+            )
+        finally:
+            server.shutdown()
+
+        self.assertEqual(len(documents), server.request_count // 3)
+
+    def test_cache_serves_closed_months(self):
+
+        server, url = serve_stub(datapoints=2)
+
+        try:
+            with tempfile.TemporaryDirectory() as cache_dir:
+                expected = download_all_waiting_times(url, cache_dir=cache_dir)
+                requests_first_run = server.request_count
+
+                # simulate an interrupted write, only this document is downloaded again
+                cache_file = sorted(Path(cache_dir).glob("*.json"))[0]
+                cache_file.write_text(cache_file.read_text()[:-10])
+
+                # all months were over when they were downloaded, so their documents
+                # are used regardless of their age
+                actual = asyncio.run(
+                    download_all_waiting_times_async(
+                        8, url, cache_dir=cache_dir, max_age=datetime.timedelta(0)
+                    )
+                )
+        finally:
+            server.shutdown()
+
+        self.assertEqual(expected, actual)
+        self.assertEqual(server.request_count, requests_first_run + 1)
+
+    def test_cache_refreshes_open_months(self):
+
+        server, url = serve_stub(datapoints=2)
+
+        try:
+            with tempfile.TemporaryDirectory() as cache_dir:
+                download_all_waiting_times(url, cache_dir=cache_dir)
+
+                # pretend that this document was downloaded before its month was over
+                cache_file = sorted(Path(cache_dir).glob("*.json"))[0]
+                fetched_at = datetime.datetime(2019, 1, 1)
+                write_cached_document(
+                    cache_file, read_cached_document(cache_file)["data"], fetched_at
+                )
+                requests_first_run = server.request_count
+
+                # still young enough
+                download_all_waiting_times(
+                    url, cache_dir=cache_dir, max_age=datetime.timedelta(days=100 * 365)
+                )
+                self.assertEqual(server.request_count, requests_first_run)
+
+                # too old, only this document is downloaded again
+                download_all_waiting_times(url, cache_dir=cache_dir)
+                self.assertEqual(server.request_count, requests_first_run + 1)
+                self.assertGreater(
+                    datetime.datetime.fromisoformat(
+                        read_cached_document(cache_file)["fetched_at"]
+                    ),
+                    fetched_at,
+                )
+        finally:
+            server.shutdown()
+
+    def test_convert_to_dataframe(self):
+
+        expected_df = pd.DataFrame(
+            [
+                {
+                    "attraction": document["attraction"],
+                    "month": document["month"],
+                    "year": document["year"],
+                    **entry,
+                }
+                for document in DOCUMENTS
+                for entry in document["data"]
+            ]
+        )
+        expected_df.wartezeit = expected_df.wartezeit.astype("int16")
+
+        actual_df = convert_to_dataframe(DOCUMENTS)
+
+        # attraction, month, year and status are categorical
+        categorical_columns = ["attraction", "month", "year", "status"]
+        actual_df[categorical_columns] = actual_df[categorical_columns].astype("object")
+
+        self.assertTrue(
+            expected_df.equals(actual_df), f"{expected_df=}\n {actual_df=}"
+        )
+        self.assertEqual(actual_df.index.name, "id")
+
+    def test_write_flat_csv_in_chunks(self):
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            write_flat_csv(DOCUMENTS, f"{tmp_dir}/single.csv", chunk_size=100)
+            write_flat_csv(iter(DOCUMENTS), f"{tmp_dir}/chunked.csv", chunk_size=1)
+
+            self.assertEqual(
+                Path(f"{tmp_dir}/single.csv").read_text(),
+                Path(f"{tmp_dir}/chunked.csv").read_text(),
+            )
+
+
+if __name__ == "__main__":
+
+    unittest.main()
@@ -0,0 +1,143 @@
+import functools
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.data.download_weather import fetch_station_archives
+from src.data.generate_synthetic_data import daily_weather, write_weather
+from src.data.pipeline import ROOT_PATH
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class TestDownloadWeather(unittest.TestCase):
+    def setUp(self):
+
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        root = Path(self.tmp_dir.name)
+
+        # stand-in for opendata.dwd.de
+        self.served_dir = root / "served"
+        (self.served_dir / "recent").mkdir(parents=True)
+        (self.served_dir / "historical").mkdir()
+        self.cache_dir = root / "cache"
+
+        self.current = self.served_dir / "recent/tageswerte_KL_01327_akt.zip"
+        self.current.write_bytes(b"current")
+        for end_date in ["20191231", "20201231"]:
+            hist_name = f"tageswerte_KL_01327_19370101_{end_date}_hist.zip"
+            (self.served_dir / "historical" / hist_name).write_bytes(b"historical")
+
+        self.server = ThreadingHTTPServer(
+            ("127.0.0.1", 0),
+            functools.partial(QuietHandler, directory=str(self.served_dir)),
+        )
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.urls = {
+            "recent_url": f"{base_url}/recent/",
+            "historical_url": f"{base_url}/historical/",
+        }
+
+    def tearDown(self):
+
+        self.server.shutdown()
+        self.server.server_close()
+        self.tmp_dir.cleanup()
+
+    def test_fetch_station_archives(self):
+
+        current_path, historical_path, changed = fetch_station_archives(
+            "01327", self.cache_dir, **self.urls
+        )
+
+        self.assertTrue(changed)
+        self.assertEqual(current_path.read_bytes(), b"current")
+        self.assertEqual(
+            historical_path.name, "tageswerte_KL_01327_19370101_20201231_hist.zip"
+        )
+
+        # nothing changed on the server, the cached copies are revalidated
+        mtime = current_path.stat().st_mtime_ns
+        *_, changed = fetch_station_archives("01327", self.cache_dir, **self.urls)
+
+        self.assertFalse(changed)
+        self.assertEqual(current_path.stat().st_mtime_ns, mtime)
+
+        # the server publishes a new current archive
+        self.current.write_bytes(b"current, updated")
+        mtime = self.current.stat().st_mtime
+        os.utime(self.current, (mtime + 10, mtime + 10))
+
+        *_, changed = fetch_station_archives("01327", self.cache_dir, **self.urls)
+
+        self.assertTrue(changed)
+        self.assertEqual(current_path.read_bytes(), b"current, updated")
+
+    def test_make_weather(self):
+
+        # archives of all stations on the server
+        dwd_dir = Path(self.tmp_dir.name) / "dwd"
+        dates = pd.date_range("2019-01-01", "2020-12-31")
+        write_weather(dwd_dir, daily_weather(dates, np.random.default_rng(0)), seed=0)
+        for path in dwd_dir.glob("*_akt.zip"):
+            path.rename(self.served_dir / "recent" / path.name)
+        for path in dwd_dir.glob("*_hist.zip"):
+            path.rename(self.served_dir / "historical" / path.name)
+
+        data_dir = Path(self.tmp_dir.name) / "data"
+        env = dict(
+            os.environ,
+            PYTHONPATH=str(ROOT_PATH),
+            PHANTASIALAND_DATA_PATH=str(data_dir),
+            DWD_RECENT_URL=self.urls["recent_url"],
+            DWD_HISTORICAL_URL=self.urls["historical_url"],
+        )
+
+        def run(*args: str) -> str:
+            return subprocess.run(
+                args, cwd=ROOT_PATH, env=env, check=True, capture_output=True, text=True
+            ).stdout
+
+        run("make", "weather", f"PYTHON_INTERPRETER={sys.executable}")
+
+        weather_path = data_dir / "interim/weather.csv"
+        weather_df = pd.read_csv(weather_path, index_col="date")
+        self.assertEqual(weather_df.index[-1], "2020-12-31")
+        self.assertIn("lommersum_mean_temperature", weather_df.columns)
+        self.assertIn(
+            "up to date",
+            run(sys.executable, "src/data/pipeline.py", "--dry-run", "weather"),
+        )
+
+        # the DWD publishes a new historical archive of Lommersum, the old one is
+        # replaced and the weather table is processed again
+        old_name = "tageswerte_KL_01327_19370101_20201231_hist.zip"
+        new_name = "tageswerte_KL_01327_19370101_20211231_hist.zip"
+        (self.served_dir / "historical" / old_name).rename(
+            self.served_dir / "historical" / new_name
+        )
+        mtime = weather_path.stat().st_mtime_ns
+
+        run("make", "weather", f"PYTHON_INTERPRETER={sys.executable}")
+
+        archives = {path.name for path in (data_dir / "raw/dwd_weather").glob("*.zip")}
+        self.assertIn(new_name, archives)
+        self.assertNotIn(old_name, archives)
+        self.assertNotEqual(weather_path.stat().st_mtime_ns, mtime)
+
+
+if __name__ == "__main__":
+
+    unittest.main()
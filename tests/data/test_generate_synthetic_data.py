@@ -0,0 +1,81 @@
+import tempfile
+import unittest
+
+import pandas as pd
+from icalendar import Calendar
+
+from src.data.constants import STATE_FULL2ISO
+from src.data.generate_synthetic_data import generate_raw_data
+from src.data.process_public_holidays import ical_to_dataframe, transform_dataframe
+from src.data.process_school_holidays import process_sections
+from src.data.process_waiting_times import (
+    assert_waiting_time_state_consistency,
+    parse_waiting_times,
+    training_from_parsed,
+)
+from src.data.process_weather import load_station
+
+
+class TestGenerateSyntheticData(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+
+        cls.tmp_dir = tempfile.TemporaryDirectory()
+        cls.paths = generate_raw_data(
+            cls.tmp_dir.name, n_attractions=2, n_years=2, interval=1800, seed=1
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+
+        cls.tmp_dir.cleanup()
+
+    def test_waiting_times(self):
+
+        df = pd.read_csv(self.paths["waiting_times"], index_col="id")
+
+        assert_waiting_time_state_consistency(df)
+        self.assertEqual(df.attraction.unique().tolist(), ["Taron", "Black Mamba"])
+        self.assertEqual(df.year.unique().tolist(), [2019, 2020])
+        self.assertTrue(df.index.is_unique)
+
+        training_df = training_from_parsed(parse_waiting_times(df))
+        self.assertTrue((training_df.waiting_time >= 0).all())
+        # 09:00 to 17:30
+        self.assertEqual(training_df.half_hour_slot.min(), 18)
+        self.assertEqual(training_df.half_hour_slot.max(), 35)
+
+    def test_weather(self):
+
+        dwd_dir = self.paths["weather"]
+        df, station_id = load_station(
+            dwd_dir / "tageswerte_KL_02667_akt.zip",
+            dwd_dir / "tageswerte_KL_02667_19570701_20201231_hist.zip",
+        )
+
+        self.assertEqual(station_id, 2667)
+        self.assertEqual(len(df), 366 + 365)
+        self.assertFalse(df.mean_temperature.isna().any())
+
+    def test_holidays(self):
+
+        cal = Calendar.from_ical(self.paths["public_holidays"].read_text())
+        holidays_df = transform_dataframe(ical_to_dataframe(cal, 2019, 2020))
+        self.assertIn("2020-04-13", holidays_df.index)
+        self.assertTrue(holidays_df.loc["2019-06-20", "NW"])
+        self.assertFalse(holidays_df.loc["2019-06-20", "BE"])
+
+        line_list = [
+            stripped_line
+            for line in self.paths["school_holidays"].read_text().splitlines()
+            if (stripped_line := line.strip())
+        ]
+        school_df = process_sections(line_list[7:], line_list[1:7])
+        self.assertEqual(set(school_df.state), set(STATE_FULL2ISO))
+        # the holidays of one state never overlap
+        self.assertFalse(school_df.duplicated(["date", "state"]).any())
+
+
+if __name__ == "__main__":
+
+    unittest.main()
@@ -0,0 +1,142 @@
+import subprocess
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from src.data.pipeline import Node, run_pipeline, sort_nodes, upstream_nodes
+
+# copies its first argument to its second argument, upper-cased
+UPPER_SCRIPT = """
+import sys
+from pathlib import Path
+
+Path(sys.argv[2]).write_text(Path(sys.argv[1]).read_text().upper())
+"""
+
+NODES = [
+    Node("join", "upper.py", ["b.txt", "c.txt"], ["b.txt"], ["c.txt"]),
+    Node("upper", "upper.py", ["a.txt", "b.txt"], ["a.txt"], ["b.txt"]),
+]
+
+
+class TestPipeline(unittest.TestCase):
+    def setUp(self):
+
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp_dir.name)
+        (self.root / "upper.py").write_text(UPPER_SCRIPT)
+        (self.root / "a.txt").write_text("a")
+
+    def tearDown(self):
+
+        self.tmp_dir.cleanup()
+
+    def run_pipeline(self, **kwargs):
+
+        summary = run_pipeline(
+            NODES, state_path=self.root / "state.json", root=self.root, **kwargs
+        )
+        return {name: status for name, status, _ in summary}
+
+    def test_incremental_runs(self):
+
+        self.assertEqual(self.run_pipeline(), {"upper": "ran", "join": "ran"})
+        self.assertEqual((self.root / "c.txt").read_text(), "A")
+
+        self.assertEqual(
+            self.run_pipeline(), {"upper": "up to date", "join": "up to date"}
+        )
+
+        # same output of "upper", so "join" stays up to date
+        (self.root / "a.txt").write_text("A")
+        self.assertEqual(self.run_pipeline(), {"upper": "ran", "join": "up to date"})
+
+        # changed code
+        (self.root / "upper.py").write_text(UPPER_SCRIPT + "\n")
+        self.assertEqual(self.run_pipeline(), {"upper": "ran", "join": "ran"})
+
+        # missing output
+        (self.root / "c.txt").unlink()
+        self.assertEqual(self.run_pipeline(), {"upper": "up to date", "join": "ran"})
+
+    def test_dry_run_and_force(self):
+
+        self.assertEqual(
+            self.run_pipeline(dry_run=True), {"upper": "stale", "join": "stale"}
+        )
+        self.assertFalse((self.root / "b.txt").exists())
+
+        self.run_pipeline()
+        self.assertEqual(
+            self.run_pipeline(targets=["upper"], force=True), {"upper": "ran"}
+        )
+
+    def test_parallel_nodes(self):
+
+        # two independent chains: a -> b and x -> y
+        nodes = [
+            Node("upper", "upper.py", [], ["a.txt"], ["b.txt"], memory=100),
+            Node("other", "upper.py", [], ["x.txt"], ["y.txt"], memory=100),
+            Node("join", "upper.py", [], ["b.txt", "y.txt"], ["c.txt"], memory=100),
+        ]
+        (self.root / "x.txt").write_text("x")
+
+        def run_concurrently(**kwargs):
+
+            running, max_running = set(), [0]
+            lock = threading.Lock()
+
+            def run_script(node, root):
+                with lock:
+                    running.add(node.name)
+                    max_running[0] = max(max_running[0], len(running))
+                time.sleep(0.05)
+                for output in node.outputs:
+                    (root / output).write_text(node.name)
+                with lock:
+                    running.remove(node.name)
+
+            run_pipeline(
+                nodes,
+                force=True,
+                state_path=self.root / "state.json",
+                root=self.root,
+                run_script=run_script,
+                **kwargs,
+            )
+            return max_running[0]
+
+        self.assertEqual(run_concurrently(jobs=4, max_memory=1000), 2)
+        self.assertEqual(run_concurrently(jobs=1, max_memory=1000), 1)
+        # too little memory for two nodes, but a single node still runs
+        self.assertEqual(run_concurrently(jobs=4, max_memory=150), 1)
+        self.assertEqual(run_concurrently(jobs=4, max_memory=50), 1)
+
+    def test_failing_node(self):
+
+        (self.root / "upper.py").write_text("raise SystemExit(1)")
+
+        with self.assertRaises(subprocess.CalledProcessError):
+            self.run_pipeline()
+
+        self.assertFalse((self.root / "c.txt").exists())
+
+    def test_node_order(self):
+
+        self.assertEqual(
+            [node.name for node in sort_nodes(NODES)], ["upper", "join"]
+        )
+        self.assertEqual(
+            [node.name for node in upstream_nodes(NODES, ["join"])], ["join", "upper"]
+        )
+
+        cyclic_nodes = [*NODES, Node("cycle", "upper.py", [], ["c.txt"], ["a.txt"])]
+        with self.assertRaises(ValueError):
+            sort_nodes(cyclic_nodes)
+
+
+if __name__ == "__main__":
+
+    unittest.main()
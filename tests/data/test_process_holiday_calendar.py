@@ -1,8 +1,13 @@
 import unittest
 
-from src.data.process_public_holidays import transform_dataframe
+from src.data.process_public_holidays import (
+    transform_dataframe,
+    ical_to_dataframe,
+    unpack_state_mask,
+)
 import pandas as pd
 from datetime import date
+from icalendar import Calendar, Event
 
 class TestProcessPublicHolidays(unittest.TestCase):
 
@@ -26,6 +31,61 @@ class TestProcessPublicHolidays(unittest.TestCase):
         with self.assertRaises(ValueError):
             transform_dataframe(duplicate_day_df)
 
+    def test_state_flags(self):
+
+        df = transform_dataframe(pd.DataFrame([
+            {
+                "uid": "1",
+                "name": "Fronleichnam (§)",
+                "begin": date(2021, 6, 3),
+                "location": "BW,BY,HE,NW,RP,SL",
+            },
+            {
+                "uid": "2",
+                "name": "Neujahr (§)",
+                "begin": date(2021, 1, 1),
+                "location": "Alle Bundesländer",
+            },
+            {
+                "uid": "3",
+                "name": "Rosenmontag",
+                "begin": date(2021, 2, 15),
+                "location": "NW",
+            },
+        ]))
+
+        self.assertEqual(df.is_public_holiday.tolist(), [True, True, False])
+        self.assertEqual(df.NW.tolist(), [True, True, True])
+        self.assertEqual(df.BE.tolist(), [False, True, False])
+        self.assertEqual(df.state_mask.tolist()[1], 2**16 - 1)
+
+        for state, flags in unpack_state_mask(df.state_mask.to_numpy()).items():
+            self.assertEqual(df[state].tolist(), flags.tolist())
+
+    def test_ical_to_dataframe_years(self):
+
+        cal = Calendar()
+        for uid, summary, start, rrule in [
+            ("1", "Neujahr (§)", date(2000, 1, 1), {"FREQ": "YEARLY"}),
+            ("2", "Tag der Deutschen Einheit (§)", date(2030, 10, 3), None),
+        ]:
+            event = Event()
+            event.add("uid", uid)
+            event.add("summary", summary)
+            event.add("dtstart", start)
+            event.add("location", "Alle Bundesländer")
+            if rrule:
+                event.add("rrule", rrule)
+            cal.add_component(event)
+
+        self.assertEqual(len(ical_to_dataframe(cal)), 31)
+
+        df = ical_to_dataframe(cal, first_year=2019, last_year=2020)
+
+        self.assertEqual(
+            sorted(df.begin.tolist()), [date(2019, 1, 1), date(2020, 1, 1)]
+        )
+
 if __name__ == "__main__":
 
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,59 @@
+import unittest
+
+from src.data.process_school_holidays import parse_date_string, process_sections
+
+
+class TestProcessSchoolHolidays(unittest.TestCase):
+    def test_parse_date_string(self):
+
+        self.assertEqual(parse_date_string("-", 2019), [])
+        self.assertEqual(
+            parse_date_string("31.05.+11.06.", 2019), ["2019-05-31", "2019-06-11"]
+        )
+        self.assertEqual(
+            parse_date_string("04.10.+07.10. - 09.10.", 2019),
+            ["2019-10-04", "2019-10-07", "2019-10-08", "2019-10-09"],
+        )
+        self.assertEqual(
+            parse_date_string("30.12. - 02.01.", 2019),
+            ["2019-12-30", "2019-12-31", "2020-01-01", "2020-01-02"],
+        )
+
+    def test_process_sections(self):
+
+        line_list = [
+            "# 2019",
+            "Bayern",
+            "01.03.",
+            "30.12. - 01.01.",
+            "Berlin",
+            "-",
+            "02.03. - 03.03.+05.03.",
+            "# 2020",
+            "Bayern",
+            "-",
+            "-",
+        ]
+
+        df = process_sections(line_list, ["Winterferien", "Weihnachtsferien"])
+
+        self.assertEqual(
+            df.values.tolist(),
+            [
+                ["2019-03-01", "Bayern", "Winterferien"],
+                ["2019-12-30", "Bayern", "Weihnachtsferien"],
+                ["2019-12-31", "Bayern", "Weihnachtsferien"],
+                ["2020-01-01", "Bayern", "Weihnachtsferien"],
+                ["2019-03-02", "Berlin", "Weihnachtsferien"],
+                ["2019-03-03", "Berlin", "Weihnachtsferien"],
+                ["2019-03-05", "Berlin", "Weihnachtsferien"],
+            ],
+        )
+
+        with self.assertRaises(ValueError):
+            process_sections(line_list[:-1], ["Winterferien", "Weihnachtsferien"])
+
+
+if __name__ == "__main__":
+
+    unittest.main()
@@ -0,0 +1,279 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    from src.data import polars_backend
+except ImportError:
+    polars_backend = None
+
+from src.benchmarks.benchmark_process_waiting_times import (
+    legacy_transform_dataframe_exploration,
+    legacy_transform_dataframe_training,
+)
+from src.data.process_waiting_times import (
+    parse_waiting_times,
+    compact_exploration_from_parsed,
+    expand_exploration,
+    exploration_from_parsed,
+    load_exploration,
+    training_from_parsed,
+    process_in_chunks,
+    process_in_parallel,
+    process_incrementally,
+    transform_dataframe_exploration,
+    transform_dataframe_training,
+)
+from src.data.storage import read_dataset
+
+
+def make_raw_df() -> pd.DataFrame:
+
+    datapoints = [
+        # (attraction, datum, wartezeit)
+        ("Taron", "2021-08-01 00:05:12", -3),  # after midnight
+        ("Taron", "2021-08-01 09:02:30", -3),  # tie, rounded down to even
+        ("Taron", "2021-08-01 09:07:30", 10),  # tie, rounded up to even
+        ("Taron", "2021-08-01 09:29:59", 20),
+        ("Taron", "2021-08-01 09:30:00", 25),
+        ("Taron", "2021-08-01 09:44:10", -1),
+        ("Raik", "2021-08-01 12:12:12", 5),
+        ("Raik", "2021-07-31 23:55:00", -3),
+        ("Taron", "2021-08-02 10:01:00", 15),
+        ("Raik", "2021-08-01 12:17:48", 8),
+    ]
+
+    df = pd.DataFrame(
+        {
+            "attraction": [attraction for attraction, _, _ in datapoints],
+            "month": "August",
+            "year": "2021",
+            "datum": [datum for _, datum, _ in datapoints],
+            "wartezeit": [wartezeit for _, _, wartezeit in datapoints],
+        }
+    )
+    df["status"] = df.wartezeit.map(lambda x: "opened" if x >= 0 else "closed")
+    df.index.name = "id"
+
+    return df
+
+
+class TestProcessWaitingTimes(unittest.TestCase):
+    def test_transform_dataframe_exploration(self):
+
+        expected_df = legacy_transform_dataframe_exploration(make_raw_df())
+        actual_df = transform_dataframe_exploration(make_raw_df())
+
+        pd.testing.assert_frame_equal(expected_df, actual_df)
+
+    def test_transform_dataframe_training(self):
+
+        exploration_df = legacy_transform_dataframe_exploration(make_raw_df())
+
+        expected_df = legacy_transform_dataframe_training(exploration_df)
+        actual_df = transform_dataframe_training(exploration_df)
+
+        pd.testing.assert_frame_equal(expected_df, actual_df)
+
+    def test_rounding_into_next_hour(self):
+
+        raw_df = make_raw_df().iloc[:1].copy()
+        raw_df.datum = "2021-08-01 09:58:00"
+
+        actual_df = transform_dataframe_exploration(raw_df)
+
+        self.assertEqual(actual_df.rounded_time.tolist(), ["10:00:00"])
+
+    def test_process_in_chunks(self):
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_dir = Path(tmp_dir)
+            make_raw_df().to_csv(tmp_dir / "raw.csv")
+
+            raw_df = pd.read_csv(tmp_dir / "raw.csv", index_col="id")
+            parsed_df = parse_waiting_times(raw_df)
+            exploration_from_parsed(parsed_df).to_csv(tmp_dir / "exploration.csv")
+            training_from_parsed(parsed_df).to_csv(tmp_dir / "training.csv")
+
+            # half hours of Taron and Raik span several chunks
+            process_in_chunks(
+                tmp_dir / "raw.csv",
+                tmp_dir / "training_chunked.csv",
+                tmp_dir / "exploration_chunked.csv",
+                chunk_size=3,
+            )
+
+            for name in ["exploration", "training"]:
+                self.assertEqual(
+                    (tmp_dir / f"{name}.csv").read_text(),
+                    (tmp_dir / f"{name}_chunked.csv").read_text(),
+                )
+
+    def test_compact_exploration(self):
+
+        parsed_df = parse_waiting_times(make_raw_df())
+        expected_df = exploration_from_parsed(parsed_df)
+
+        pd.testing.assert_frame_equal(
+            expected_df, expand_exploration(compact_exploration_from_parsed(parsed_df))
+        )
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_dir = Path(tmp_dir)
+            make_raw_df().to_csv(tmp_dir / "raw.csv")
+
+            process_in_chunks(
+                tmp_dir / "raw.csv",
+                tmp_dir / "training.csv",
+                tmp_dir / "exploration.parquet",
+                chunk_size=3,
+                compact_exploration=True,
+            )
+            compact_df = load_exploration(tmp_dir / "exploration.parquet")
+
+        self.assertEqual(compact_df.minute.dtype, "int16")
+        pd.testing.assert_frame_equal(expected_df, expand_exploration(compact_df))
+
+    def test_process_in_parallel(self):
+
+        parsed_df = parse_waiting_times(make_raw_df())
+        expected_exploration_df = exploration_from_parsed(parsed_df)
+        expected_training_df = training_from_parsed(parsed_df)
+
+        for shard_by in ["attraction", "attraction-year"]:
+            exploration_df, training_df = process_in_parallel(
+                make_raw_df(), workers=2, shard_by=shard_by
+            )
+
+            pd.testing.assert_frame_equal(expected_exploration_df, exploration_df)
+            pd.testing.assert_frame_equal(expected_training_df, training_df)
+
+    @unittest.skipIf(polars_backend is None, "polars is not installed")
+    def test_polars_backend(self):
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_dir = Path(tmp_dir)
+            make_raw_df().to_csv(tmp_dir / "raw.csv")
+
+            for fmt in ["csv", "parquet"]:
+                process_in_chunks(
+                    tmp_dir / "raw.csv",
+                    tmp_dir / f"training.{fmt}",
+                    tmp_dir / f"exploration.{fmt}",
+                    chunk_size=3,
+                    compact_exploration=fmt == "parquet",
+                )
+                polars_backend.process_waiting_times(
+                    tmp_dir / "raw.csv",
+                    tmp_dir / f"training_polars.{fmt}",
+                    tmp_dir / f"exploration_polars.{fmt}",
+                    compact_exploration=fmt == "parquet",
+                )
+
+            for name in ["exploration", "training"]:
+                self.assertEqual(
+                    (tmp_dir / f"{name}.csv").read_text(),
+                    (tmp_dir / f"{name}_polars.csv").read_text(),
+                )
+
+            # the order of the categories depends on the chunks
+            pd.testing.assert_frame_equal(
+                load_exploration(tmp_dir / "exploration.parquet").astype(
+                    {"attraction": str}
+                ),
+                load_exploration(tmp_dir / "exploration_polars.parquet").astype(
+                    {"attraction": str}
+                ),
+            )
+            pd.testing.assert_frame_equal(
+                read_dataset(tmp_dir / "training.parquet", "waiting_times_training"),
+                read_dataset(
+                    tmp_dir / "training_polars.parquet", "waiting_times_training"
+                ),
+            )
+
+            raw_df = make_raw_df()
+            raw_df.loc[0, "status"] = "opened"
+            raw_df.to_csv(tmp_dir / "invalid.csv")
+
+            with self.assertRaises(ValueError):
+                polars_backend.process_waiting_times(
+                    tmp_dir / "invalid.csv", tmp_dir / "training_invalid.csv"
+                )
+
+    def test_process_incrementally(self):
+
+        raw_df = make_raw_df()
+        changed_df = raw_df.copy()
+        changed_df.loc[len(changed_df)] = [
+            "Raik", "August", "2021", "2021-08-03 11:00:00", 30, "opened"
+        ]
+        # only adds the partition of Raik on 2021-08-03
+        appended_df = changed_df.copy()
+        changed_df.loc[3, "wartezeit"] = 40
+        # removes the partition of Taron on 2021-08-02
+        changed_df = changed_df.drop(index=8)
+
+        parsed_df = parse_waiting_times(changed_df)
+        expected_training_df = training_from_parsed(parsed_df)
+        expected_exploration_df = exploration_from_parsed(parsed_df)
+
+        # partitions span chunks of 3 datapoints
+        for fmt, chunk_size in [("csv", 3), ("parquet", 3), ("csv", 100)]:
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                tmp_dir = Path(tmp_dir)
+                raw_df.to_csv(tmp_dir / "raw.csv")
+                appended_df.to_csv(tmp_dir / "appended.csv")
+                changed_df.to_csv(tmp_dir / "changed.csv")
+
+                for input_name in [
+                    "raw.csv", "appended.csv", "changed.csv", "changed.csv"
+                ]:
+                    process_incrementally(
+                        tmp_dir / input_name,
+                        tmp_dir / f"training.{fmt}",
+                        tmp_dir / f"exploration.{fmt}",
+                        chunk_size=chunk_size,
+                    )
+
+                # the outputs of the last run are consistent with its state
+                self.assertTrue((tmp_dir / f"training.{fmt}.state.json").exists())
+                self.assertEqual(
+                    sorted(path.name for path in tmp_dir.iterdir()),
+                    sorted(
+                        [
+                            "raw.csv",
+                            "appended.csv",
+                            "changed.csv",
+                            f"training.{fmt}",
+                            f"training.{fmt}.state.json",
+                            f"exploration.{fmt}",
+                        ]
+                    ),
+                )
+
+                training_df = read_dataset(
+                    tmp_dir / f"training.{fmt}", "waiting_times_training"
+                )
+                exploration_df = read_dataset(
+                    tmp_dir / f"exploration.{fmt}", "waiting_times_exploration"
+                )
+
+            # only the ids of reprocessed datapoints differ
+            self.assertTrue(training_df.index.is_unique)
+            self.assertEqual(
+                training_df.astype({"date": str}).values.tolist(),
+                expected_training_df.values.tolist(),
+            )
+            self.assertTrue(exploration_df.index.is_unique)
+            self.assertCountEqual(
+                exploration_df.astype({"date": str}).values.tolist(),
+                expected_exploration_df.values.tolist(),
+            )
+
+
+if __name__ == "__main__":
+
+    unittest.main()
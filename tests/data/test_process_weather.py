@@ -0,0 +1,150 @@
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+
+import pandas as pd
+
+from src.data.constants import DWD_COLUMN_NAMES2DESCRIPTION
+from src.data.process_weather import (
+    extract_dwd_archive,
+    clean_dwd_data,
+    load_dwd_archive,
+    load_station,
+)
+from src.data.process_weather_stations import (
+    prepare_weather,
+    process_stations,
+    station_columns,
+)
+
+
+def write_dwd_archive(path: Path, dates: pd.DatetimeIndex, station_id: int = 1327):
+    """write a zip archive in the format of the DWD daily climate data"""
+
+    # measurements, padded with whitespace like in the original files
+    columns = list(DWD_COLUMN_NAMES2DESCRIPTION)[2:]
+    header = ["STATIONS_ID", "MESS_DATUM", *(f"{name:>5}" for name in columns), "eor"]
+    lines = [";".join(header)]
+
+    for i, date in enumerate(dates):
+        values = [f"{(i * j) % 17 if j % 5 else -999:>5}" for j in range(len(columns))]
+        lines.append(";".join([f"{station_id:>11}", f"{date:%Y%m%d}", *values, "eor"]))
+
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("Metadaten_Geographie_01327.txt", "")
+        archive.writestr("produkt_klima_tag_01327.txt", "\n".join(lines) + "\n")
+
+
+class TestProcessWeather(unittest.TestCase):
+    def setUp(self):
+
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.zip_path = Path(self.tmp_dir.name) / "tageswerte_KL_01327_akt.zip"
+        write_dwd_archive(
+            self.zip_path, pd.date_range("2018-12-01", "2019-02-01", freq="D")
+        )
+
+    def tearDown(self):
+
+        self.tmp_dir.cleanup()
+
+    def test_extract_with_projection_and_date_filter(self):
+
+        expected_df = clean_dwd_data(extract_dwd_archive(self.zip_path))
+        expected_df = expected_df[expected_df.date >= "2019-01-01"]
+        expected_df = expected_df[["station_id", "date", "sunshine_duration"]]
+
+        actual_df = clean_dwd_data(
+            extract_dwd_archive(
+                self.zip_path, columns=["STATIONS_ID", "SDK"], min_date="2019-01-01"
+            )
+        )
+
+        pd.testing.assert_frame_equal(expected_df.reset_index(drop=True), actual_df)
+
+    def test_load_dwd_archive_cache(self):
+
+        cache_dir = Path(self.tmp_dir.name) / "parsed"
+
+        expected_df = load_dwd_archive(self.zip_path)
+        first_df = load_dwd_archive(self.zip_path, cache_dir)
+        (cache_path,) = cache_dir.glob("*.parquet")
+        second_df = load_dwd_archive(self.zip_path, cache_dir)
+
+        pd.testing.assert_frame_equal(expected_df, first_df)
+        pd.testing.assert_frame_equal(expected_df, second_df)
+
+        # a changed archive is parsed again and replaces the outdated cache file
+        write_dwd_archive(
+            self.zip_path, pd.date_range("2019-01-01", "2019-03-01", freq="D")
+        )
+        df = load_dwd_archive(self.zip_path, cache_dir)
+
+        self.assertEqual(df.date.max(), pd.Timestamp("2019-03-01"))
+        self.assertNotIn(cache_path, list(cache_dir.glob("*.parquet")))
+        self.assertEqual(len(list(cache_dir.glob("*.parquet"))), 1)
+
+    def test_process_stations(self):
+
+        tmp_dir = Path(self.tmp_dir.name)
+        stations = []
+        for prefix, station_id, end_date in [
+            ("lommersum_", 1327, "2019-03-01"),
+            ("koelnbonn_", 2667, "2019-02-15"),
+        ]:
+            current_path = tmp_dir / f"tageswerte_KL_{station_id:05}_akt.zip"
+            historical_path = tmp_dir / f"tageswerte_KL_{station_id:05}_hist.zip"
+            write_dwd_archive(
+                current_path,
+                pd.date_range("2019-02-01", end_date, freq="D"),
+                station_id,
+            )
+            write_dwd_archive(
+                historical_path,
+                pd.date_range("2018-01-01", "2019-01-31", freq="D"),
+                station_id,
+            )
+            stations.append((prefix, current_path, historical_path))
+
+        expected_dfs = [
+            prepare_weather(load_station(current_path, historical_path)[0], prefix)
+            for prefix, current_path, historical_path in stations
+        ]
+
+        weather_df = process_stations(stations)
+
+        self.assertEqual(weather_df.index.min(), pd.Timestamp("2019-01-01"))
+        self.assertTrue(weather_df.index.is_monotonic_increasing)
+        for expected_df in expected_dfs:
+            pd.testing.assert_frame_equal(
+                expected_df.sort_index(),
+                weather_df[expected_df.columns].loc[expected_df.index].sort_index(),
+                check_dtype=False,
+            )
+        self.assertTrue(
+            weather_df.filter(like="koelnbonn_").loc["2019-02-16":].isna().all().all()
+        )
+
+        # only the selected columns are parsed
+        selected_df = process_stations(
+            stations,
+            weather_columns=["lommersum_sunshine_duration", "koelnbonn_snow_depth"],
+        )
+
+        self.assertEqual(
+            station_columns("lommersum_", ["lommersum_sunshine_duration"]),
+            ["STATIONS_ID", "MESS_DATUM", "SDK"],
+        )
+        self.assertEqual(
+            selected_df.columns.tolist(),
+            ["lommersum_sunshine_duration", "koelnbonn_snow_depth"],
+        )
+        pd.testing.assert_frame_equal(
+            selected_df, weather_df[selected_df.columns], check_dtype=False
+        )
+
+
+if __name__ == "__main__":
+
+    unittest.main()
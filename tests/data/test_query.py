@@ -0,0 +1,73 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    from src.data import query
+except ImportError:
+    query = None
+
+from src.data.storage import write_dataset
+
+
+def make_training_df() -> pd.DataFrame:
+
+    df = pd.DataFrame(
+        {
+            "attraction": ["Raik", "Taron", "Taron", "Taron", "Taron"],
+            # a Sunday and a Monday
+            "date": [
+                "2021-08-01",
+                "2021-08-01",
+                "2021-08-01",
+                "2021-08-02",
+                "2021-08-02",
+            ],
+            # 12:00, 09:00, 09:30, 09:00, 09:30
+            "half_hour_slot": [24, 18, 19, 18, 19],
+            "waiting_time": [6.5, 10.0, 20.0, 30.0, 50.0],
+        }
+    )
+    df.index.name = "id"
+
+    return df
+
+
+@unittest.skipIf(query is None, "duckdb is not installed")
+class TestQuery(unittest.TestCase):
+    def test_aggregates_in_all_formats(self):
+
+        for fmt in ["csv", "parquet", "feather"]:
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                tmp_dir = Path(tmp_dir)
+                (tmp_dir / "interim").mkdir()
+                write_dataset(
+                    make_training_df(),
+                    tmp_dir / f"interim/waiting_times_training.{fmt}",
+                    "waiting_times_training",
+                )
+
+                con = query.connect(tmp_dir)
+
+                days_df = query.attraction_days(con, "Taron")
+                self.assertEqual(days_df.mean_waiting_time.tolist(), [15.0, 40.0])
+                self.assertEqual(days_df.half_hours.tolist(), [2, 2])
+
+                weekday_df = query.weekday_means(con)
+                self.assertEqual(
+                    weekday_df.attraction.tolist(), ["Raik", "Taron", "Taron"]
+                )
+                self.assertEqual(weekday_df.day_of_week.tolist(), [6, 0, 6])
+
+                slot_df = query.slot_means(con, "Taron")
+                self.assertEqual(slot_df.half_hour_slot.tolist(), [18, 19])
+                self.assertEqual(slot_df.mean_waiting_time.tolist(), [20.0, 35.0])
+
+                con.close()
+
+
+if __name__ == "__main__":
+
+    unittest.main()
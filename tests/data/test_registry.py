@@ -0,0 +1,84 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.data.registry import clear_registry, get_dataset
+from src.data.storage import write_dataset
+
+
+def make_training_df() -> pd.DataFrame:
+
+    df = pd.DataFrame(
+        {
+            "attraction": ["Taron", "Taron", "Raik"],
+            "date": ["2021-08-01", "2021-08-01", "2021-08-02"],
+            "half_hour_slot": [18, 19, 24],
+            "waiting_time": [10.0, 25.0, 6.5],
+        }
+    )
+    df.index.name = "id"
+
+    return df
+
+
+class TestRegistry(unittest.TestCase):
+    def setUp(self):
+
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp_dir.name) / "training.feather"
+        write_dataset(make_training_df(), self.path, "waiting_times_training")
+
+    def tearDown(self):
+
+        clear_registry()
+        self.tmp_dir.cleanup()
+
+    def test_loaded_once(self):
+
+        first_df = get_dataset(self.path, "waiting_times_training")
+        second_df = get_dataset(self.path, "waiting_times_training")
+
+        self.assertIsNot(first_df, second_df)
+        self.assertTrue(
+            np.shares_memory(
+                first_df.waiting_time.to_numpy(), second_df.waiting_time.to_numpy()
+            )
+        )
+
+    def test_copies_are_independent(self):
+
+        df = get_dataset(self.path, "waiting_times_training")
+        df["waiting_time"] = 0.0
+        df["weekday"] = df.date.dt.weekday
+
+        cached_df = get_dataset(self.path, "waiting_times_training")
+
+        self.assertNotIn("weekday", cached_df.columns)
+        self.assertEqual(
+            cached_df.waiting_time.tolist(), make_training_df().waiting_time.tolist()
+        )
+
+    def test_memory_mapped_columns_are_read_only(self):
+
+        df = get_dataset(self.path, "waiting_times_training")
+
+        self.assertFalse(df.waiting_time.to_numpy().flags.writeable)
+
+    def test_reload_on_change(self):
+
+        get_dataset(self.path, "waiting_times_training")
+
+        write_dataset(make_training_df().iloc[:2], self.path, "waiting_times_training")
+        stat = self.path.stat()
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+
+        self.assertEqual(len(get_dataset(self.path, "waiting_times_training")), 2)
+
+
+if __name__ == "__main__":
+
+    unittest.main()
@@ -0,0 +1,135 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.data.storage import (
+    DatasetWriter,
+    find_dataset,
+    iter_dataset,
+    read_dataset,
+    write_dataset,
+)
+
+
+def make_training_df() -> pd.DataFrame:
+
+    df = pd.DataFrame(
+        {
+            "attraction": ["Raik", "Taron", "Taron", "Taron"],
+            "date": ["2021-08-01", "2021-08-01", "2021-08-01", "2021-08-02"],
+            "half_hour_slot": [24, 18, 19, 20],
+            "waiting_time": [6.5, 10.0, 25.0, 15.0],
+        }
+    )
+    df.index.name = "id"
+
+    return df
+
+
+class TestStorage(unittest.TestCase):
+    def setUp(self):
+
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp_dir.name)
+
+    def tearDown(self):
+
+        self.tmp_dir.cleanup()
+
+    def test_same_types_in_all_formats(self):
+
+        for fmt in ["csv", "parquet", "feather"]:
+            write_dataset(
+                make_training_df(),
+                self.path / f"training.{fmt}",
+                "waiting_times_training",
+            )
+
+        csv_df = read_dataset(self.path / "training.csv", "waiting_times_training")
+
+        for fmt in ["parquet", "feather"]:
+            df = read_dataset(self.path / f"training.{fmt}", "waiting_times_training")
+
+            pd.testing.assert_frame_equal(csv_df, df)
+            self.assertEqual(df.attraction.dtype, "category")
+            self.assertEqual(df.date.dtype, "datetime64[ns]")
+            self.assertEqual(df.half_hour_slot.dtype, "int8")
+            self.assertEqual(df.index.name, "id")
+
+    def test_missing_values_and_date_index(self):
+
+        df = pd.DataFrame(
+            {"BW": ["Sommerferien", np.nan], "NW": [np.nan, "Herbstferien"]},
+            index=pd.Index(["2021-08-01", "2021-10-11"], name="date"),
+        )
+
+        write_dataset(df, self.path / "school_holidays.parquet", "school_holidays")
+        actual_df = read_dataset(
+            self.path / "school_holidays.parquet", "school_holidays"
+        )
+
+        self.assertEqual(actual_df.index.tolist(), pd.to_datetime(df.index).tolist())
+        self.assertEqual(actual_df.BW.tolist()[0], "Sommerferien")
+        self.assertTrue(actual_df.BW.isna().tolist()[1])
+
+    def test_column_projection(self):
+
+        for fmt in ["csv", "parquet", "feather"]:
+            path = self.path / f"training.{fmt}"
+            write_dataset(make_training_df(), path, "waiting_times_training")
+
+            df = read_dataset(path, "waiting_times_training", columns=["waiting_time"])
+
+            self.assertEqual(df.columns.tolist(), ["waiting_time"])
+            self.assertEqual(df.index.name, "id")
+
+    def test_chunked_writing_and_reading(self):
+
+        df = make_training_df()
+
+        for fmt in ["csv", "parquet", "feather"]:
+            path = self.path / f"training.{fmt}"
+            with DatasetWriter(path, "waiting_times_training") as writer:
+                writer.write(df.iloc[:3])
+                writer.write(df.iloc[3:])
+
+            chunks = list(iter_dataset(path, "waiting_times_training", chunk_size=2))
+
+            self.assertEqual(sum(len(chunk) for chunk in chunks), len(df))
+            self.assertLessEqual(max(len(chunk) for chunk in chunks), 2)
+            pd.testing.assert_frame_equal(
+                pd.concat(chunks).astype({"attraction": str}),
+                read_dataset(path, "waiting_times_training").astype(
+                    {"attraction": str}
+                ),
+            )
+
+    def test_find_dataset(self):
+
+        write_dataset(
+            make_training_df(), self.path / "training.parquet", "waiting_times_training"
+        )
+
+        self.assertEqual(
+            find_dataset(self.path / "training.csv"), self.path / "training.parquet"
+        )
+        self.assertEqual(
+            find_dataset(self.path / "missing.csv"), self.path / "missing.csv"
+        )
+
+    def test_unknown_format(self):
+
+        with self.assertRaises(ValueError):
+            write_dataset(
+                make_training_df(),
+                self.path / "training.json",
+                "waiting_times_training",
+            )
+
+
+if __name__ == "__main__":
+
+    unittest.main()
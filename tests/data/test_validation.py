@@ -0,0 +1,60 @@
+import unittest
+
+import pandas as pd
+
+from src.data.validation import validate
+
+
+class TestValidation(unittest.TestCase):
+    def test_raw_waiting_times(self):
+
+        df = pd.DataFrame(
+            {
+                "wartezeit": [10, -3, -3, 5, 0],
+                "status": ["opened", "closed", "opened", "closed", "opened"],
+            }
+        )
+
+        report = validate(df, "raw_waiting_times")
+
+        self.assertFalse(report.ok)
+        self.assertEqual(
+            report.violations,
+            {
+                "nonnegative waiting time while the attraction is not opened": 1,
+                "negative waiting time while the attraction is not closed": 1,
+            },
+        )
+        self.assertEqual(
+            report.examples[
+                "negative waiting time while the attraction is not closed"
+            ].index.tolist(),
+            [2],
+        )
+        with self.assertRaises(ValueError):
+            report.raise_if_failed()
+
+        report = validate(df.iloc[[0, 1, 4]], "raw_waiting_times")
+
+        self.assertTrue(report.ok)
+        report.raise_if_failed()
+
+    def test_sampled_validation(self):
+
+        df = pd.DataFrame(
+            {
+                "date": pd.to_datetime(["2021-08-01", "2021-08-02", "2021-08-01"]),
+                "station_id": 1327,
+            }
+        )
+
+        report = validate(df, "daily_weather", sample=1)
+
+        # the duplicate date is found although only one row is sampled
+        self.assertEqual(report.n_sampled, 1)
+        self.assertEqual(report.violations["duplicate date"], 2)
+
+
+if __name__ == "__main__":
+
+    unittest.main()
@@ -8,10 +8,11 @@ import numpy as np
 class TestProcessPublicHolidays(unittest.TestCase):
     def test_transform_time(self):
 
+        # half-hour slots of 08:00, 08:30 and 10:00
         time2feature = {
-            "08:00:00": 8.0,
-            "08:30:00": 8.5,
-            "10:00:00": 10.0,
+            16: 8.0,
+            17: 8.5,
+            20: 10.0,
         }
 
         expected_df = pd.DataFrame(time2feature.values())
@@ -0,0 +1,92 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.dummy import DummyRegressor
+from sklearn.linear_model import LinearRegression
+
+from src.training.folds import cached_date_folds, date_folds, evaluate_on_folds
+
+
+def make_dates() -> pd.Series:
+
+    # 10 days with 2 datapoints each, not sorted by date
+    return pd.Series(pd.date_range("2021-08-01", periods=10).repeat(2)[::-1])
+
+
+class TestFolds(unittest.TestCase):
+    def test_expanding_folds(self):
+
+        dates = make_dates()
+        folds = date_folds(dates, n_folds=3, mode="expanding", test_days=2)
+
+        self.assertEqual(len(folds), 3)
+
+        for fold, (train_rows, test_rows) in enumerate(folds):
+            self.assertEqual(len(test_rows), 4)
+            self.assertEqual(len(train_rows), 8 + 4 * fold)
+            self.assertLess(dates[train_rows].max(), dates[test_rows].min())
+
+        self.assertEqual(dates[folds[-1][1]].max(), dates.max())
+
+    def test_sliding_folds(self):
+
+        dates = make_dates()
+        folds = date_folds(dates, n_folds=3, mode="sliding", test_days=2, train_days=3)
+
+        for train_rows, test_rows in folds:
+            self.assertEqual(dates[train_rows].nunique(), 3)
+            self.assertEqual(
+                dates[test_rows].min() - dates[train_rows].max(), pd.Timedelta("1D")
+            )
+
+    def test_too_many_folds(self):
+
+        with self.assertRaises(ValueError):
+            date_folds(make_dates(), n_folds=5, test_days=2)
+
+    def test_cached_folds(self):
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache_path = Path(tmp_dir) / "folds.npz"
+
+            folds = cached_date_folds(make_dates(), cache_path, n_folds=2)
+            mtime = cache_path.stat().st_mtime_ns
+            cached_folds = cached_date_folds(make_dates(), cache_path, n_folds=2)
+
+            self.assertEqual(cache_path.stat().st_mtime_ns, mtime)
+            for (train, test), (cached_train, cached_test) in zip(folds, cached_folds):
+                np.testing.assert_array_equal(train, cached_train)
+                np.testing.assert_array_equal(test, cached_test)
+
+            # other parameters invalidate the cache
+            self.assertEqual(
+                len(cached_date_folds(make_dates(), cache_path, n_folds=3)), 3
+            )
+
+    def test_evaluate_on_folds(self):
+
+        dates = make_dates()
+        X = pd.DataFrame({"x": np.arange(len(dates), dtype="float64")})
+        y = pd.DataFrame({"waiting_time": 2 * X.x + 1})
+        folds = date_folds(dates, n_folds=2)
+
+        results = evaluate_on_folds(
+            {"linreg": LinearRegression(), "dummy": DummyRegressor()},
+            X,
+            y,
+            folds,
+            n_jobs=1,
+        )
+
+        self.assertEqual(len(results), 4)
+        self.assertIn("rmse_train", results.columns)
+        self.assertTrue(np.allclose(results.loc["linreg", "rmse"], 0))
+        self.assertTrue((results.loc["dummy", "rmse"] > 0).all())
+
+
+if __name__ == "__main__":
+
+    unittest.main()